@@ -0,0 +1,179 @@
+# Async versions of the archive LLM and search helpers
+#
+# These take async clients (AsyncAzureOpenAI, AsyncTavilyClient, a LangChain
+# chat model) so many sessions can wait on the network from one event loop;
+# archive.clients has async_openai_client() and async_tavily_client(). Every
+# outbound request goes through a per-provider semaphore, and the cache
+# lookup/store and spans are the ones the sync helpers use.
+import asyncio
+import os
+import threading
+import time
+import weakref
+
+import numpy as np
+
+from archive.flashcards import (
+    format_flashcards, parse_flashcards, record_reply, structured_chain, structured_messages,
+)
+from archive.quiz import quiz_request
+from archive.response_cache import lookup_response, store_response
+from archive.search import books_query, internet_query
+from archive.search_cache import lookup_search, search_span, store_search
+from archive.summary import summary_request
+from archive.tracing import span
+from archive.usage import count_prompt_tokens, plan_max_tokens
+
+DEFAULT_LIMITS = {
+    "openai": int(os.getenv("STUDY_ASSISTANT_OPENAI_CONCURRENCY", "16")),
+    "tavily": int(os.getenv("STUDY_ASSISTANT_TAVILY_CONCURRENCY", "4")),
+}
+
+
+class ProviderLimiter:
+    """Caps the number of in-flight requests per provider.
+
+    asyncio semaphores belong to one event loop, so one set is kept per
+    loop. Code that goes through run_sync shares a single loop and
+    therefore a single, process-wide set of limits.
+    """
+
+    def __init__(self, limits):
+        self.limits = dict(limits)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def configure(self, **limits):
+        """Change limits; takes effect for semaphores created afterwards."""
+        self.limits.update(limits)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def __call__(self, provider):
+        loop = asyncio.get_running_loop()
+        per_loop = self._semaphores.setdefault(loop, {})
+        if provider not in per_loop:
+            per_loop[provider] = asyncio.Semaphore(self.limits[provider])
+        return per_loop[provider]
+
+
+limiter = ProviderLimiter(DEFAULT_LIMITS)
+
+
+def configure_limits(**limits):
+    """Set the in-flight request limit per provider, e.g. openai=8."""
+    limiter.configure(**limits)
+
+
+async def _cached_chat_completion(
+    client, cache, model, messages, max_tokens, temperature, meter=None, feature="chat"
+):
+    key, content = lookup_response(
+        cache, model, messages, max_tokens, temperature, meter, feature, "openai.chat"
+    )
+    if content is not None:
+        return content
+
+    async with limiter("openai"):
+        start = time.perf_counter()
+        with span("openai.chat", feature=feature, max_tokens=max_tokens, cache_hit=False):
+            response = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+    content = response.choices[0].message.content
+    if meter is not None:
+        meter.record_response(
+            feature, getattr(response, "usage", None), messages, content,
+            time.perf_counter() - start,
+        )
+    store_response(cache, key, content)
+    return content
+
+
+async def summarize_text_async(text, client, deployment_name, cache=None, meter=None):
+    """Async summarize_text; client is an AsyncAzureOpenAI."""
+    return await _cached_chat_completion(
+        client, cache, **summary_request(text, deployment_name), meter=meter, feature="summary"
+    )
+
+
+async def generate_quiz_async(text, client, deployment_name, cache=None, meter=None):
+    """Async generate_quiz; client is an AsyncAzureOpenAI."""
+    return await _cached_chat_completion(
+        client, cache, **quiz_request(text, deployment_name), meter=meter, feature="quiz"
+    )
+
+
+async def generate_flashcards_async(text, llmClient, meter=None):
+    """Async generate_flashcards using the chain's ainvoke."""
+    messages = structured_messages(text)
+    max_tokens = plan_max_tokens("flashcards", count_prompt_tokens(messages))
+    async with limiter("openai"):
+        start = time.perf_counter()
+        reply = await structured_chain(llmClient, max_tokens).ainvoke({"topic": text})
+    record_reply(meter, messages, reply, time.perf_counter() - start)
+    try:
+        return format_flashcards(parse_flashcards(reply.content))
+    except ValueError:
+        return reply.content
+
+
+async def generate_embedding_async(text, client, deployment_name):
+    """Async generate_embedding; client is an AsyncAzureOpenAI."""
+    async with limiter("openai"):
+        response = await client.embeddings.create(input=text, model=deployment_name)
+    return np.array(response.data[0].embedding, dtype=np.float32)
+
+
+async def _cached_search(cache, kind, query, top_k, search_query, client):
+    with search_span(kind, query, top_k) as trace_span:
+        results = lookup_search(cache, kind, query, top_k, trace_span)
+        if results is None:
+            async with limiter("tavily"):
+                results = await client.search(search_query, max_results=top_k)
+            store_search(cache, kind, query, top_k, results)
+        return results
+
+
+async def search_internet_async(query, client, top_k=3, cache=None):
+    """Async search_internet; client is an AsyncTavilyClient."""
+    return await _cached_search(cache, "internet", query, top_k, internet_query(query), client)
+
+
+async def search_books_async(topic, client, top_k=2, cache=None):
+    """Async search_books; client is an AsyncTavilyClient."""
+    return await _cached_search(cache, "books", topic, top_k, books_query(topic), client)
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop():
+    """Event loop on a daemon thread, shared by every run_sync caller."""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="study-assistant-loop", daemon=True
+                ).start()
+                _loop = loop
+    return _loop
+
+
+def run_sync(coro, timeout=None):
+    """Run a coroutine on the shared background loop and wait for its result.
+
+    Lets synchronous callers (Streamlit scripts, thread pool workers) use
+    the async helpers while all requests share one loop and one set of
+    provider limits.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _background_loop())
+    try:
+        return future.result(timeout)
+    except TimeoutError:
+        future.cancel()
+        raise
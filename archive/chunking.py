@@ -0,0 +1,88 @@
+# Token-aware splitting of long documents into overlapping chunks
+import re
+
+from archive.tokens import count_tokens
+
+DEFAULT_CHUNK_TOKENS = 2000
+DEFAULT_OVERLAP_TOKENS = 200
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _units(text, max_tokens):
+    """Break text into paragraphs, or sentences/words where those are too long."""
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if count_tokens(paragraph) <= max_tokens:
+            yield paragraph
+            continue
+        for sentence in _SENTENCE_END.split(paragraph):
+            if count_tokens(sentence) <= max_tokens:
+                yield sentence
+                continue
+            # A run-on "sentence" (tables, code, no punctuation): cut on words
+            words, piece = sentence.split(), []
+            for word in words:
+                if piece and count_tokens(" ".join(piece + [word])) > max_tokens:
+                    yield " ".join(piece)
+                    piece = []
+                piece.append(word)
+            if piece:
+                yield " ".join(piece)
+
+
+def _tail(unit, max_tokens):
+    """The end of unit within max_tokens: whole trailing sentences, else words."""
+    for pieces in (_SENTENCE_END.split(unit), unit.split()):
+        kept = []
+        for piece in reversed(pieces):
+            if count_tokens(" ".join([piece] + kept)) > max_tokens:
+                break
+            kept.insert(0, piece)
+        if kept:
+            return " ".join(kept)
+    return ""
+
+
+def split_text(text, max_tokens=DEFAULT_CHUNK_TOKENS, overlap_tokens=DEFAULT_OVERLAP_TOKENS):
+    """Split text into chunks of at most max_tokens, on natural boundaries.
+
+    Chunks are packed from whole paragraphs where possible, falling back to
+    sentences and then words. Each chunk after the first starts with up to
+    overlap_tokens of the end of the previous one (whole units, then the
+    trailing sentences or words of the next unit back), so a point made
+    across a boundary is seen whole by at least one chunk.
+
+    Returns:
+        List of chunk strings, empty for blank text
+    """
+    if overlap_tokens >= max_tokens:
+        raise ValueError("overlap_tokens must be smaller than max_tokens")
+
+    chunks, current, current_tokens = [], [], 0
+    for unit in _units(text, max_tokens - overlap_tokens):
+        tokens = count_tokens(unit)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            # Carry whole units from the end of the chunk as the overlap, then
+            # as much of the end of the first unit that doesn't fit as does
+            carried, carried_tokens = [], 0
+            for previous in reversed(current):
+                previous_tokens = count_tokens(previous)
+                if carried_tokens + previous_tokens > overlap_tokens:
+                    tail = _tail(previous, overlap_tokens - carried_tokens)
+                    if tail:
+                        carried.insert(0, tail)
+                        carried_tokens += count_tokens(tail)
+                    break
+                carried.insert(0, previous)
+                carried_tokens += previous_tokens
+            current, current_tokens = carried, carried_tokens
+        current.append(unit)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
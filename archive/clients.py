@@ -0,0 +1,145 @@
+# Process-wide API clients, created on first use
+#
+# Nothing here touches the network, the .env file or the OpenAI/LangChain
+# packages until a client is asked for, so importing the app stays cheap
+# and a missing credential only fails the feature that needs it.
+import functools
+import os
+import threading
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("STUDY_ASSISTANT_HTTP_MAX_CONNECTIONS", "64"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("STUDY_ASSISTANT_HTTP_MAX_KEEPALIVE", "16"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("STUDY_ASSISTANT_HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("STUDY_ASSISTANT_HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("STUDY_ASSISTANT_HTTP_READ_TIMEOUT", "60"))
+
+
+def singleton(factory):
+    """Call factory once, on first use, and return that result from then on.
+
+    Thread-safe: Streamlit runs every session's script on its own thread.
+    A factory that raises is retried on the next call.
+    """
+    lock = threading.Lock()
+    instance = []
+
+    @functools.wraps(factory)
+    def get():
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+
+    # peek() returns the instance without creating it, or None
+    get.peek = lambda: instance[0] if instance else None
+    get.reset = instance.clear
+    return get
+
+
+@singleton
+def settings():
+    """Credentials and deployment names from the environment and .env."""
+    from dotenv import load_dotenv
+
+    load_dotenv(".env")
+    return {
+        "api_key": os.getenv('AZURE_OPENAI_API_KEY'),
+        "api_endpoint": os.getenv('AZURE_ENDPOINT'),
+        "deployment_name": os.getenv('DEPLOYMENT_NAME'),
+        "embedding_deployment_name": os.getenv('EMBEDDING_DEPLOYMENT_NAME'),
+        "api_version": os.getenv('AZURE_OPENAI_API_VERSION'),
+        "tavily_key": os.getenv('TAVILY_KEY'),
+    }
+
+
+def _http_options():
+    import httpx
+
+    return dict(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+    )
+
+
+@singleton
+def http_client():
+    """One keep-alive connection pool shared by the OpenAI and LangChain clients."""
+    import httpx
+
+    return httpx.Client(**_http_options())
+
+
+@singleton
+def async_http_client():
+    """The keep-alive pool of the async clients.
+
+    Its connections belong to the event loop that opened them, so the async
+    clients are meant to be used through archive.async_api.run_sync, which
+    runs every request on one shared loop.
+    """
+    import httpx
+
+    return httpx.AsyncClient(**_http_options())
+
+
+@singleton
+def openai_client():
+    from openai import AzureOpenAI
+
+    config = settings()
+    return AzureOpenAI(
+        azure_endpoint=config["api_endpoint"],
+        api_key=config["api_key"],
+        api_version=config["api_version"],
+        http_client=http_client(),
+    )
+
+
+@singleton
+def async_openai_client():
+    """AsyncAzureOpenAI for the helpers in archive.async_api."""
+    from openai import AsyncAzureOpenAI
+
+    config = settings()
+    return AsyncAzureOpenAI(
+        azure_endpoint=config["api_endpoint"],
+        api_key=config["api_key"],
+        api_version=config["api_version"],
+        http_client=async_http_client(),
+    )
+
+
+@singleton
+def tavily_client():
+    # TavilyClient manages its own requests session
+    from tavily import TavilyClient
+
+    return TavilyClient(api_key=settings()["tavily_key"])
+
+
+@singleton
+def async_tavily_client():
+    """AsyncTavilyClient for the helpers in archive.async_api."""
+    from tavily import AsyncTavilyClient
+
+    return AsyncTavilyClient(api_key=settings()["tavily_key"])
+
+
+@singleton
+def llm_client():
+    from langchain.chat_models import AzureChatOpenAI
+
+    config = settings()
+    return AzureChatOpenAI(
+        openai_api_key=config["api_key"],
+        azure_endpoint=config["api_endpoint"],
+        openai_api_version=config["api_version"],
+        deployment_name=config["deployment_name"],
+        temperature=0.7,
+        http_client=http_client(),
+    )
@@ -0,0 +1,94 @@
+# Batched embedding generation
+import time
+
+import numpy as np
+
+from archive.tokens import count_tokens
+from archive.tracing import span, traced
+
+# Provider limits for one embeddings request
+MAX_INPUTS_PER_REQUEST = 2048
+MAX_TOKENS_PER_REQUEST = 300_000
+MAX_TOKENS_PER_INPUT = 8191
+
+
+def _batches(texts, max_inputs, max_tokens):
+    """Split texts into (start, batch) runs that respect both request limits."""
+    start, batch, batch_tokens = 0, [], 0
+    for i, text in enumerate(texts):
+        tokens = count_tokens(text)
+        if tokens > MAX_TOKENS_PER_INPUT:
+            raise ValueError(
+                f"Text {i} has about {tokens} tokens, the limit per input is {MAX_TOKENS_PER_INPUT}"
+            )
+        if batch and (len(batch) == max_inputs or batch_tokens + tokens > max_tokens):
+            yield start, batch
+            start, batch, batch_tokens = i, [], 0
+        batch.append(text)
+        batch_tokens += tokens
+    if batch:
+        yield start, batch
+
+
+def _embed_batch(batch, client, deployment_name, max_retries, backoff):
+    """Embed one batch, re-requesting only the inputs that came back missing."""
+    vectors = [None] * len(batch)
+    pending = list(range(len(batch)))
+    for attempt in range(max_retries + 1):
+        try:
+            with span("openai.embeddings", inputs=len(pending), attempt=attempt):
+                response = client.embeddings.create(
+                    input=[batch[i] for i in pending], model=deployment_name
+                )
+            for item in response.data:
+                vectors[pending[item.index]] = item.embedding
+        except Exception:
+            if attempt == max_retries:
+                raise
+        pending = [i for i in pending if vectors[i] is None]
+        if not pending:
+            return vectors
+        if attempt < max_retries:
+            time.sleep(backoff * 2 ** attempt)
+    raise RuntimeError(f"{len(pending)} embeddings still missing after {max_retries} retries")
+
+
+@traced()
+def generate_embeddings(
+    texts,
+    client,
+    deployment_name,
+    normalize=False,
+    max_inputs=MAX_INPUTS_PER_REQUEST,
+    max_tokens=MAX_TOKENS_PER_REQUEST,
+    max_retries=3,
+    backoff=1.0,
+):
+    """Embed many texts with as few requests as the provider limits allow.
+
+    Args:
+        texts: Iterable of strings
+        client: OpenAI or AzureOpenAI client
+        deployment_name: Embedding model deployment
+        normalize: L2-normalize every row (cosine similarity becomes a dot product)
+        max_inputs: Inputs per request
+        max_tokens: Tokens per request, counted locally before sending
+        max_retries: Retries per batch, with exponential backoff from backoff seconds
+
+    Returns:
+        C-contiguous float32 matrix with one row per text, in input order
+    """
+    texts = list(texts)
+    matrix = None
+    for start, batch in _batches(texts, max_inputs, max_tokens):
+        vectors = _embed_batch(batch, client, deployment_name, max_retries, backoff)
+        if matrix is None:
+            matrix = np.empty((len(texts), len(vectors[0])), dtype=np.float32)
+        matrix[start:start + len(batch)] = vectors
+
+    if matrix is None:
+        return np.empty((0, 0), dtype=np.float32)
+    if normalize:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
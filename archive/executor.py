@@ -0,0 +1,67 @@
+# Shared bounded thread pool for running independent backend calls concurrently
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+MAX_WORKERS = int(os.getenv("STUDY_ASSISTANT_MAX_WORKERS", "8"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the process-wide executor, created on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_WORKERS, thread_name_prefix="study-assistant"
+                )
+    return _executor
+
+
+def run_concurrently(calls, timeout=None):
+    """Start every call now and return an iterator of results in completion order.
+
+    The calls are submitted before this returns, so the caller can do other
+    work on its own thread (e.g. stream a reply) before collecting them.
+
+    Args:
+        calls: Dict of name -> (function, *args)
+        timeout: Seconds to wait for all calls, None to wait forever
+
+    Returns:
+        Iterator of (name, result, error) tuples; error is the raised exception (or a
+        TimeoutError for calls still running at the deadline, counted from
+        the first result asked for), else None.
+
+    Calls that haven't started yet are cancelled on timeout or when the
+    caller stops iterating. Calls already running can't be interrupted;
+    their results are discarded.
+    """
+    executor = get_executor()
+    # Each call runs in a copy of the caller's context, so tracing spans
+    # started in a worker are children of the caller's span
+    futures = {
+        executor.submit(contextvars.copy_context().run, fn, *args): name
+        for name, (fn, *args) in calls.items()
+    }
+    return _results(futures, timeout)
+
+
+def _results(futures, timeout):
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            error = future.exception()
+            yield futures[future], None if error else future.result(), error
+    except FuturesTimeoutError:
+        for future, name in futures.items():
+            if not future.done():
+                future.cancel()
+                yield name, None, TimeoutError(f"{name} timed out after {timeout}s")
+    finally:
+        for future in futures:
+            future.cancel()
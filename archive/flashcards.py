@@ -1,21 +1,26 @@
-import numpy as np
-from langchain_core.prompts import PromptTemplate
-from langchain.chains import LLMChain, SequentialChain
+import json
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import NamedTuple
 
-subtopics_prompt = PromptTemplate(
-    input_variables=["topic"],
-    template="""
+from archive.embeddings import generate_embeddings
+from archive.tracing import span, start_span, traced
+from archive.usage import count_prompt_tokens, plan_max_tokens
+
+# LangChain is imported on first use, and the prompts and chains below are
+# built once and reused; building them is slow and they hold no per-call state.
+
+SUBTOPICS_TEMPLATE = """
 You are an expert educator. Break down the following topic into 5 important
 subtopics. Output only the subtopics as a simple numbered list.
 
 Topic: {topic}
 """
-)
 
 # Prompt 2 - Generate Flashcards
-flashcards_prompt = PromptTemplate(
-    input_variables=["subtopics"],
-    template="""
+FLASHCARDS_TEMPLATE = """
                 You are an expert flashcard generator.
                 For each subtopic below, generate one flashcard in
                 the following format, all on one line:
@@ -34,67 +39,285 @@ flashcards_prompt = PromptTemplate(
 
                 Flashcards:
                 """
-)
 
-# Generate flashcards using OpenAI
+# Subtopics and flashcards in one request, as JSON matching FLASHCARDS_SCHEMA
+STRUCTURED_TEMPLATE = """
+You are an expert educator and flashcard generator. Break down the topic
+below into 5 important subtopics and write one flashcard per subtopic.
+Keep questions clear and answers concise and informative.
 
+Respond with JSON only, matching this schema:
+{schema}
 
-def generate_flashcards(text, llmClient):
-    """Generate flashcards (Q&A pairs) from input text."""
-    # Chain 1 - Subtopics Generation
-    subtopics_chain = LLMChain(
-        llm=llmClient,
-        prompt=subtopics_prompt,
-        output_key="subtopics",
-    )
+Topic: {topic}
+"""
+
+FLASHCARDS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "flashcards": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "subtopic": {"type": "string"},
+                    "question": {"type": "string"},
+                    "answer": {"type": "string"},
+                },
+                "required": ["subtopic", "question", "answer"],
+            },
+        },
+    },
+    "required": ["flashcards"],
+}
+
+
+class Flashcard(NamedTuple):
+    subtopic: str
+    question: str
+    answer: str
+
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def parse_flashcards(content):
+    """Parse the JSON reply to the structured prompt into Flashcard records.
+
+    Raises:
+        ValueError: If the reply is not JSON of the expected shape
+    """
+    try:
+        data = json.loads(_FENCE.sub("", content.strip()))
+        return [_flashcard(card) for card in data["flashcards"]]
+    except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as exc:
+        raise ValueError(f"Flashcard reply is not valid JSON: {exc}") from exc
 
-    # Chain 2 - Flashcards Generation
-    flashcards_chain = LLMChain(
-        llm=llmClient,
-        prompt=flashcards_prompt,
-        output_key="flashcards",
+
+def _flashcard(card):
+    return Flashcard(
+        str(card.get("subtopic", "")).strip(),
+        str(card["question"]).strip(),
+        str(card["answer"]).strip(),
     )
 
-    # 4. Chain them together
-    overall_chain = SequentialChain(
-        chains=[subtopics_chain, flashcards_chain],
-        input_variables=["topic"],
-        output_variables=["subtopics", "flashcards"],
-        verbose=True,  # (optional) show intermediate steps
+
+class _CardScanner:
+    """Picks the flashcard objects out of a structured reply as it streams in.
+
+    Braces are counted outside JSON strings; each object nested one level
+    below the reply object is a flashcard, complete when its brace closes.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = self._escaped = False
+        self._card = []
+
+    def feed(self, text):
+        """Flashcards completed by this piece of the reply."""
+        cards = []
+        for char in text:
+            if self._depth >= 2:
+                self._card.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+                if self._depth == 2:
+                    self._card = [char]
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 1:
+                    try:
+                        cards.append(_flashcard(json.loads("".join(self._card))))
+                    except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+                        pass  # Not a flashcard after all
+        return cards
+
+
+def format_flashcards(cards):
+    """Render flashcards the way the two-step prompt asks for them."""
+    return "\n\n".join(f"- Q: {card.question} A: {card.answer}" for card in cards)
+
+
+@lru_cache(maxsize=None)
+def _prompts():
+    from langchain_core.prompts import PromptTemplate
+
+    return (
+        PromptTemplate(input_variables=["topic"], template=SUBTOPICS_TEMPLATE),
+        PromptTemplate(input_variables=["subtopics"], template=FLASHCARDS_TEMPLATE),
+        PromptTemplate(
+            input_variables=["topic"],
+            template=STRUCTURED_TEMPLATE,
+            partial_variables={"schema": json.dumps(FLASHCARDS_SCHEMA)},
+        ),
     )
-    input_topic = text
 
-    # Run the final chain
-    result = overall_chain.invoke({"topic": input_topic})
 
-    return result['flashcards']
+# Chains per chat model; the app uses a single process-wide model
+_chains = {}
+_chains_lock = threading.Lock()
 
-# Function to generate embeddings using OpenAI
 
+def _cached_chain(kind, llmClient, build):
+    key = (kind, id(llmClient))
+    with _chains_lock:
+        if key not in _chains:
+            # Keep the model alive so its id can't be reused by another one
+            _chains[key] = (llmClient, build())
+        return _chains[key][1]
 
-def generate_embedding(text, client, deployment_name):
-    """Generate an embedding vector for a given text using OpenAI's model."""
-    response = client.embeddings.create(input=text, model=deployment_name)
-    return np.array(response['data'][0]['embedding'], dtype=np.float32)
 
-# Retrieve results from tavily AI calls for any question asked
+def _flashcards_chain(llmClient):
+    """The subtopics -> flashcards chain (two requests) for a chat model."""
+    def build():
+        from langchain.chains import LLMChain, SequentialChain
 
+        subtopics_prompt, flashcards_prompt, _ = _prompts()
+        # Chain 1 - Subtopics Generation
+        subtopics_chain = LLMChain(
+            llm=llmClient,
+            prompt=subtopics_prompt,
+            output_key="subtopics",
+        )
 
-def search_internet(query, client, top_k=3):
-    """Search the internet."""
-    queries = "Give the lastest studies/reasearch paper regarding " + query
-    responses = client.search(queries, max_result=3)
-    return responses
+        # Chain 2 - Flashcards Generation
+        flashcards_chain = LLMChain(
+            llm=llmClient,
+            prompt=flashcards_prompt,
+            output_key="flashcards",
+        )
 
-# Retrieve Books urls and names from tavily AI calls for a given topic
+        # Chain them together
+        return SequentialChain(
+            chains=[subtopics_chain, flashcards_chain],
+            input_variables=["topic"],
+            output_variables=["subtopics", "flashcards"],
+        )
 
+    return _cached_chain("sequential", llmClient, build)
 
-def search_books(topic, client):
-    """Search the internet via Tavily AI."""
-    query = (
-        "Provide me recent and most relevant books url that can be helpful "
-        "for basic learning on topic "
-        + topic
-    )
-    responses = client.search(query, max_result=2)
-    return responses
+
+def structured_chain(llmClient, max_tokens):
+    """Prompt -> chat model in JSON mode: subtopics and flashcards in one request."""
+    def build():
+        structured_prompt = _prompts()[2]
+        return structured_prompt | llmClient.bind(
+            max_tokens=max_tokens, response_format={"type": "json_object"}
+        )
+
+    return _cached_chain(f"structured:{max_tokens}", llmClient, build)
+
+
+def structured_messages(text):
+    """What the structured prompt sends, for budgeting and usage estimates."""
+    prompt = STRUCTURED_TEMPLATE.format(schema=json.dumps(FLASHCARDS_SCHEMA), topic=text)
+    return [{"role": "user", "content": prompt}]
+
+
+def record_reply(meter, messages, reply, seconds):
+    """Record a structured chain reply's token usage on meter, if any."""
+    if meter is not None:
+        metadata = getattr(reply, "response_metadata", None) or {}
+        meter.record_response(
+            "flashcards", metadata.get("token_usage"), messages, reply.content, seconds
+        )
+
+
+def _structured_reply(text, llmClient, meter=None):
+    messages = structured_messages(text)
+    # Raises PromptTooLong for oversized input before it is sent
+    max_tokens = plan_max_tokens("flashcards", count_prompt_tokens(messages))
+    start = time.perf_counter()
+    with span("langchain.flashcards", input_chars=len(text)):
+        reply = structured_chain(llmClient, max_tokens).invoke({"topic": text})
+    record_reply(meter, messages, reply, time.perf_counter() - start)
+    return reply
+
+
+def generate_flashcard_records(text, llmClient, meter=None):
+    """Generate flashcards for a topic as Flashcard records, in one request."""
+    return parse_flashcards(_structured_reply(text, llmClient, meter).content)
+
+
+# Generate flashcards using OpenAI
+@traced()
+def generate_flashcards(text, llmClient, single_call=True, meter=None):
+    """Generate flashcards (Q&A pairs) from input text.
+
+    By default subtopics and flashcards come from one structured request.
+    single_call=False runs the original two-request chain instead.
+    """
+    if not single_call:
+        return _flashcards_chain(llmClient).invoke({"topic": text})['flashcards']
+
+    reply = _structured_reply(text, llmClient, meter)
+    try:
+        return format_flashcards(parse_flashcards(reply.content))
+    except ValueError:
+        # The model answered in prose after all; that's still readable
+        return reply.content
+
+
+def stream_flashcards(text, llmClient, meter=None):
+    """Generate flashcards, yielding each one as soon as the model has written it.
+
+    The structured request is streamed and parsed as it arrives, so the
+    text joins up to what generate_flashcards returns. A reply that isn't
+    JSON after all is yielded whole at the end.
+
+    Raises:
+        PromptTooLong: For oversized input, before anything is sent
+    """
+    messages = structured_messages(text)
+    max_tokens = plan_max_tokens("flashcards", count_prompt_tokens(messages))
+    return _stream_cards(text, structured_chain(llmClient, max_tokens), messages, meter)
+
+
+def _stream_cards(text, chain, messages, meter):
+    start = time.perf_counter()
+    # Not made current: it stays open across yields to the consumer
+    stream_span = start_span("langchain.flashcards.stream", input_chars=len(text))
+    scanner, parts, cards = _CardScanner(), [], 0
+    try:
+        for chunk in chain.stream({"topic": text}):
+            if not chunk.content:
+                continue
+            if not parts:
+                stream_span.set(first_token_ms=round((time.perf_counter() - start) * 1000, 1))
+            parts.append(chunk.content)
+            for card in scanner.feed(chunk.content):
+                yield ("\n\n" if cards else "") + format_flashcards([card])
+                cards += 1
+        if not cards and parts:
+            # The model answered in prose after all; that's still readable
+            yield "".join(parts)
+        stream_span.set(cards=cards)
+    finally:
+        stream_span.end()
+
+    if meter is not None:
+        # Streamed chunks carry no token usage; it is estimated
+        meter.record_response(
+            "flashcards", None, messages, "".join(parts), time.perf_counter() - start
+        )
+
+
+# Function to generate embeddings using OpenAI
+
+
+def generate_embedding(text, client, deployment_name):
+    """Generate an embedding vector for a given text using OpenAI's model.
+
+    Use generate_embeddings from archive.embeddings to embed many texts.
+    """
+    return generate_embeddings([text], client, deployment_name)[0]
@@ -1,37 +1,96 @@
 import streamlit as st
-import os
-from tavily import TavilyClient
-from openai import AzureOpenAI
-from dotenv import load_dotenv
-from archive.flashcards import generate_flashcards, search_internet, search_books
-from archive.quiz import generate_quiz
-from archive.summary import summarize_text
-from langchain.chat_models import AzureChatOpenAI
-
-# Set up your OpenAI API key and credentials
-load_dotenv(".env")
-api_key = os.getenv('AZURE_OPENAI_API_KEY')
-api_endpoint = os.getenv('AZURE_ENDPOINT')
-deployment_name = os.getenv('DEPLOYMENT_NAME')
-apiversion = os.getenv('AZURE_OPENAI_API_VERSION')
-tavilyclient = os.getenv('TAVILY_KEY')
-
-# Initialize OpenAI client
-client = AzureOpenAI(
-  azure_endpoint=api_endpoint,
-  api_key=api_key,
-  api_version=apiversion
-)
-
-tavily_client = TavilyClient(api_key=tavilyclient)
-
-llmClient = AzureChatOpenAI(
-    openai_api_key=api_key,
-    azure_endpoint=api_endpoint,
-    openai_api_version=apiversion,
-    deployment_name=deployment_name,
-    temperature=0.7
-)
+import functools
+from archive import clients, tracing
+from archive.chunking import DEFAULT_CHUNK_TOKENS
+from archive.executor import run_concurrently
+from archive.flashcards import stream_flashcards
+from archive.quiz import stream_quiz
+from archive.request_ledger import RequestLedger
+from archive.response_cache import ResponseCache
+from archive.search import search_internet, search_books
+from archive.search_cache import SearchCache
+from archive.semantic_cache import SemanticCache, semantic_call, semantic_stream
+from archive.summary import stream_summary, summarize_long_text
+from archive.usage import PromptTooLong, UsageMeter
+from archive.tokens import count_tokens
+from core.session_store import SessionStore, StoredSession
+
+# Messages rendered per "load older" step
+CHAT_PAGE_SIZE = 20
+
+# Seconds a stage waits for its backend calls before giving up
+STAGE_TIMEOUT = 90
+
+
+# Chat history and stage outlive server restarts; sessions are resumed from
+# the ?session= id in the URL
+@st.cache_resource
+def session_store():
+    return SessionStore()
+
+
+# Repeated study material is served from disk; summaries and quizzes run at
+# temperature > 0, so opt in to caching those as well
+@st.cache_resource
+def response_cache():
+    return ResponseCache(cache_nondeterministic=True)
+
+
+# Tavily results for a topic seen recently are reused until their TTL runs out
+@st.cache_resource
+def search_cache():
+    return SearchCache()
+
+
+# Reworded repeats ("explain photosynthesis" / "photosynthesis basics") are
+# matched on meaning; needs an embedding deployment
+@st.cache_resource
+def semantic_cache():
+    deployment = clients.settings()["embedding_deployment_name"]
+    return SemanticCache(clients.openai_client(), deployment) if deployment else None
+
+
+def _reply(content, replies):
+    """Show an assistant message, add it to the chat and to the stage's replies."""
+    message = {"role": "assistant", "content": content}
+    st.session_state["messages"].append(message)
+    st.chat_message("assistant").write(content)
+    replies.append(message)
+
+
+def _replay(replies):
+    """Show replies stored in the ledger again, without calling the backend."""
+    for message in replies:
+        st.session_state["messages"].append(message)
+        st.chat_message(message["role"]).write(message["content"])
+
+
+def _usage_panel(usage):
+    """Settings panel with this session's token use per feature."""
+    with st.expander("⚙️ Settings: token usage"):
+        totals = usage.totals()
+        if not totals.calls:
+            st.caption("No requests yet.")
+            return
+        st.metric("Tokens this session", f"{totals.total_tokens:,}")
+        st.dataframe(
+            [
+                {
+                    "Feature": feature,
+                    "Calls": row.calls,
+                    "Cached": row.cached,
+                    "Prompt": row.prompt_tokens,
+                    "Completion": row.completion_tokens,
+                    "Avg latency (s)": round(row.seconds / max(row.calls - row.cached, 1), 2),
+                }
+                for feature, row in sorted(usage.by_feature().items())
+            ],
+            hide_index=True,
+        )
+        if st.button("Reset usage"):
+            usage.clear()
+            st.rerun()
+
 
 # Main Study Assistant Function
 
@@ -47,15 +106,42 @@ def study_assistant():
             "(https://github.com/codespaces/badge.svg)]"
             "(https://codespaces.new/streamlit/llm-examples?quickstart=1)"
         )
+        cache = semantic_cache() if clients.openai_client.peek() else None
+        if cache is not None and cache.hits + cache.misses:
+            stats = cache.stats()
+            st.caption(
+                f"🧠 Semantic cache: {stats['hit_rate']:.0%} of {stats['lookups']} "
+                f"lookups answered from cache"
+            )
 
     st.title(" My Study Assistant ")
 
+    if "session" not in st.session_state:
+        session = StoredSession(session_store(), st.query_params.get("session"))
+        st.query_params["session"] = session.session_id
+        st.session_state["session"] = session
+        for key, value in session.load().items():
+            st.session_state[key] = value
+
     if "messages" not in st.session_state:
-        st.session_state["messages"] = []
+        st.session_state["messages"] = st.session_state["session"].history()
+
+    if "chat_visible" not in st.session_state:
+        st.session_state["chat_visible"] = CHAT_PAGE_SIZE
 
     if "stage" not in st.session_state:
         st.session_state["stage"] = "main_menu"
 
+    if "ledger" not in st.session_state:
+        st.session_state["ledger"] = RequestLedger()
+
+    if "usage" not in st.session_state:
+        st.session_state["usage"] = UsageMeter()
+    usage = st.session_state["usage"]
+
+    with st.sidebar:
+        _usage_panel(usage)
+
     # Initialize chat history and state
     if st.session_state["stage"] == "main_menu":
         if (
@@ -76,15 +162,26 @@ def study_assistant():
                 }
             )
 
-    # Display chat messages
-    for msg in st.session_state["messages"]:
-        st.chat_message(msg["role"]).write(msg["content"])
+    # Display the newest chat messages, older ones are paged in on request
+    history = st.session_state["messages"]
+    hidden = history.total_count - st.session_state["chat_visible"]
+    if hidden > 0 and st.button(f"⬆️ Load older messages ({hidden} hidden)"):
+        st.session_state["chat_visible"] += CHAT_PAGE_SIZE
+        st.rerun()
+
+    with tracing.span("render.history", visible=st.session_state["chat_visible"]):
+        for msg in history.window(st.session_state["chat_visible"]):
+            st.chat_message(msg["role"]).write(msg["content"])
+
+    ledger = st.session_state["ledger"]
 
     # Main menu logic
     if st.session_state["stage"] == "main_menu":
-        choice = st.text_input("Enter your choice .. ")
+        choice = st.text_input("Enter your choice .. ", key="menu_choice")
 
         if choice:
+            # Clear the box, otherwise the choice is made again on every rerun
+            st.session_state.pop("menu_choice", None)
             st.session_state["messages"].append(
                 {
                     "role": "user",
@@ -108,111 +205,203 @@ def study_assistant():
                     }
                 )
                 st.chat_message("assistant").write(bot_reply)
+            st.rerun()
 
-    # Summarize text logic
-    if st.session_state["stage"] == "summarize":
-        text = st.text_input(
-            "Enter the text you'd like to summarize: ",
-            key="summary_input"
-        )
+    # Each stage below handles a submission once. Reruns with the same input
+    # are skipped (the chat history already shows the replies), and an input
+    # submitted again later is replayed from the ledger.
 
-        if text:
-            summary = summarize_text(text, client, deployment_name)
-            st.session_state["messages"].append(
-                {
-                    "role": "assistant",
-                    "content": text
-                }
+    stage = st.session_state["stage"]
+    with tracing.span(f"stage.{stage}") as stage_span:
+        # Summarize text logic
+        if stage == "summarize":
+            text = st.text_area(
+                "Enter the text you'd like to summarize: ",
+                key="summary_input"
             )
-            st.session_state["messages"].append(
-                {
-                    "role": "assistant",
-                    "content": summary
-                }
-            )
-            st.chat_message("assistant").write(summary)
 
-            st.session_state.pop("summary_input", None)
-            st.session_state["stage"] == "main_menu"
-            st.rerun()
+            if text and not ledger.handled("summarize", text):
+                replies = ledger.replies("summarize", text)
+                stage_span.set(input_chars=len(text), replayed=replies is not None)
+                if replies is not None:
+                    _replay(replies)
+                else:
+                    progress = None
+                    try:
+                        if count_tokens(text) > DEFAULT_CHUNK_TOKENS:
+                            # Long documents are summarized chunk by chunk in parallel
+                            progress = st.progress(0.0, text="Summarizing sections...")
+                            summarize = functools.partial(
+                                summarize_long_text,
+                                meter=usage,
+                                on_progress=lambda done, total: progress.progress(
+                                    done / total, text=f"Summarized {done} of {total} sections"
+                                ),
+                            )
+                            summary = semantic_call(
+                                semantic_cache(), "summarize", text,
+                                summarize, text, clients.openai_client(),
+                                clients.settings()["deployment_name"], response_cache(),
+                            )
+                            progress.empty()
+                            st.chat_message("assistant").write(summary)
+                        else:
+                            # Tokens are rendered as they arrive; write_stream returns the full text
+                            summary = st.chat_message("assistant").write_stream(
+                                semantic_stream(
+                                    semantic_cache(), "summarize", text,
+                                    stream_summary(
+                                        text, clients.openai_client(),
+                                        clients.settings()["deployment_name"],
+                                        cache=response_cache(), meter=usage,
+                                    ),
+                                )
+                            )
+                    except Exception as exc:
+                        # Stay on the stage so the text can be edited and sent again
+                        if progress is not None:
+                            progress.empty()
+                        replies = []
+                        _reply(f"Could not summarize the text: {exc}", replies)
+                        ledger.record("summarize", text, None)
+                        return
+                    replies = [
+                        {
+                            "role": "assistant",
+                            "content": text
+                        },
+                        {
+                            "role": "assistant",
+                            "content": summary
+                        },
+                    ]
+                    for message in replies:
+                        st.session_state["messages"].append(message)
+                    ledger.record("summarize", text, replies)
 
-    # Flashcard generation logic
-    elif st.session_state["stage"] == "flashcard":
-        flashcard_word = st.text_input(
-            "Enter the text you'd like to convert into flashcards"
-        )
+                st.session_state.pop("summary_input", None)
+                ledger.reset("summarize")
+                st.session_state["stage"] = "main_menu"
+                st.rerun()
 
-        if flashcard_word:
-            bot_reply = "Generating Flashcards for ..." + flashcard_word
-            st.session_state["messages"].append(
-                {
-                    "role": "assistant",
-                    "content": bot_reply
-                }
+        # Flashcard generation logic
+        elif stage == "flashcard":
+            flashcard_word = st.text_input(
+                "Enter the text you'd like to convert into flashcards"
             )
-            st.chat_message("assistant").write(bot_reply)
-            flashcards = generate_flashcards(flashcard_word, llmClient)
-            st.session_state["messages"].append(
-                {
-                    "role": "assistant",
-                    "content": flashcards
-                }
-            )
-            st.chat_message("assistant").write(flashcards)
-            bot_reply = "Here are some recent books to improve on your learning...."  # noqa: E501
-            st.session_state["messages"].append(
-                {
-                    "role": "assistant",
-                    "content": bot_reply
-                }
-            )
-            st.chat_message("assistant").write(bot_reply)
-            search = search_books(flashcard_word, tavily_client)
-
-            sources = search.get("results", [])
-            if sources:
-                for i, source in enumerate(sources[:2], 1):
-                    st.chat_message("assistant").write(
-                        f"**Source {i}:** [{source.get('title', 'No Title')}]"
-                        f"({source.get('url', '')})\n"
+
+            if flashcard_word and not ledger.handled("flashcard", flashcard_word):
+                replies = ledger.replies("flashcard", flashcard_word)
+                stage_span.set(input_chars=len(flashcard_word), replayed=replies is not None)
+                if replies is not None:
+                    _replay(replies)
+                else:
+                    replies = []
+                    failed = False
+                    _reply("Generating Flashcards for ..." + flashcard_word, replies)
+                    # The book search runs on the shared pool while the flashcards
+                    # stream in on this thread, one card at a time
+                    books = run_concurrently(
+                        {
+                            "books": (
+                                search_books, flashcard_word, clients.tavily_client(), 2,
+                                search_cache(),
+                            ),
+                        },
+                        timeout=STAGE_TIMEOUT,
                     )
-            else:
-                st.chat_message("assistant").write("No recent study material found.")  # noqa: E501
-
-    # Quiz generation logic
-    elif st.session_state["stage"] == "quiz":
-        text = st.text_input("Enter the text you'd like to use for generating a quiz:")  # noqa: E501
-
-        if text:
-            bot_reply = "Generating Quiz ..." + text
-            st.session_state["messages"].append({"role": "assistant", "content": bot_reply})  # noqa: E501
-            st.chat_message("assistant").write(bot_reply)
-            quiz = generate_quiz(text, client, deployment_name)
-            st.session_state["messages"].append({"role": "assistant", "content": text})  # noqa: E501
-            st.session_state["messages"].append({"role": "assistant", "content": quiz})  # noqa: E501
-            st.chat_message("assistant").write(quiz)
-
-    # Flashcard ask me anything logic
-    elif st.session_state["stage"] == "query":
-        query = st.text_input("Ask me anything:")
-
-        if query:
-            bot_reply = "Searching most recent research /books/ articles..." + query  # noqa: E501
-            st.session_state["messages"].append({"role": "assistant", "content": bot_reply})  # noqa: E501
-            st.chat_message("assistant").write(bot_reply)
-            search = search_internet(query, tavily_client, top_k=3)
-
-            sources = search.get("results", [])
-            if sources:
-                for i, source in enumerate(sources, 1):
-                    st.chat_message("assistant").write(
-                        f"**Source {i}:** [{source.get('title', 'No Title')}]({source.get('url', '')})\n\n"  # noqa: E501
-                        f"📌 {source.get('content', 'No content')}"
+                    try:
+                        flashcards = st.chat_message("assistant").write_stream(
+                            semantic_stream(
+                                semantic_cache(), "flashcard", flashcard_word,
+                                stream_flashcards(flashcard_word, clients.llm_client(), meter=usage),
+                            )
+                        )
+                        message = {"role": "assistant", "content": flashcards}
+                        st.session_state["messages"].append(message)
+                        replies.append(message)
+                    except Exception as exc:
+                        failed = True
+                        _reply(f"Could not generate flashcards: {exc}", replies)
+
+                    for _, result, error in books:
+                        failed = failed or error is not None
+                        _reply("Here are some recent books to improve on your learning....", replies)  # noqa: E501
+
+                        sources = result.get("results", []) if error is None else []
+                        if sources:
+                            for i, source in enumerate(sources[:2], 1):
+                                _reply(
+                                    f"**Source {i}:** [{source.get('title', 'No Title')}]"
+                                    f"({source.get('url', '')})\n",
+                                    replies,
+                                )
+                        else:
+                            _reply("No recent study material found.", replies)
+                    ledger.record("flashcard", flashcard_word, None if failed else replies)
+
+        # Quiz generation logic
+        elif stage == "quiz":
+            text = st.text_input("Enter the text you'd like to use for generating a quiz:")  # noqa: E501
+
+            if text and not ledger.handled("quiz", text):
+                replies = ledger.replies("quiz", text)
+                stage_span.set(input_chars=len(text), replayed=replies is not None)
+                if replies is not None:
+                    _replay(replies)
+                else:
+                    replies = []
+                    _reply("Generating Quiz ..." + text, replies)
+                    try:
+                        quiz_stream = stream_quiz(
+                            text, clients.openai_client(),
+                            clients.settings()["deployment_name"], cache=response_cache(),
+                            meter=usage,
+                        )
+                    except PromptTooLong as exc:
+                        _reply(f"That text is too long for one quiz: {exc}", replies)
+                        ledger.record("quiz", text, None)
+                    else:
+                        quiz = st.chat_message("assistant").write_stream(quiz_stream)
+                        replies.append({"role": "assistant", "content": text})
+                        replies.append({"role": "assistant", "content": quiz})
+                        st.session_state["messages"].append(replies[-2])
+                        st.session_state["messages"].append(replies[-1])
+                        ledger.record("quiz", text, replies)
+
+        # Flashcard ask me anything logic
+        elif stage == "query":
+            query = st.text_input("Ask me anything:")
+
+            if query and not ledger.handled("query", query):
+                replies = ledger.replies("query", query)
+                stage_span.set(input_chars=len(query), replayed=replies is not None)
+                if replies is not None:
+                    _replay(replies)
+                else:
+                    replies = []
+                    _reply("Searching most recent research /books/ articles..." + query, replies)  # noqa: E501
+                    search = semantic_call(
+                        semantic_cache(), "query", query,
+                        search_internet, query, clients.tavily_client(), 3, search_cache(),
                     )
-            else:
-                st.chat_message("assistant").write("No sources found.")
+
+                    sources = search.get("results", [])
+                    if sources:
+                        for i, source in enumerate(sources, 1):
+                            _reply(
+                                f"**Source {i}:** [{source.get('title', 'No Title')}]({source.get('url', '')})\n\n"  # noqa: E501
+                                f"📌 {source.get('content', 'No content')}",
+                                replies,
+                            )
+                    else:
+                        _reply("No sources found.", replies)
+                    ledger.record("query", query, replies)
 
 
 # Run the assistant
 if __name__ == "__main__":
-    study_assistant()
+    with tracing.span("rerun", stage=st.session_state.get("stage")):
+        study_assistant()
+        # A stage change ends with st.rerun(), so it is saved on the next run
+        st.session_state["session"].save(stage=st.session_state["stage"])
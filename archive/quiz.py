@@ -1,7 +1,10 @@
-# Generate quizzes using OpenAI
-def generate_quiz(text, client, deployment_name):
-    """Generate multiple-choice questions from input text."""
+from archive.response_cache import cached_chat_completion, stream_chat_completion
+from archive.tracing import traced
+from archive.usage import count_prompt_tokens, plan_max_tokens
+
 
+def quiz_request(text, deployment_name):
+    """Chat completion arguments for a quiz on text."""
     messages = [
         {
             "role": "system",
@@ -19,12 +22,30 @@ def generate_quiz(text, client, deployment_name):
         }
     ]
 
-    # Create a chat completion request with specified parameters
-    response = client.chat.completions.create(
+    # Chat completion parameters; longer input gets room for more questions
+    return dict(
         model=deployment_name,
         messages=messages,
-        max_tokens=300,
+        max_tokens=plan_max_tokens("quiz", count_prompt_tokens(messages)),
         temperature=0.7
     )
 
-    return response.choices[0].message.content
+
+# Generate quizzes using OpenAI
+@traced()
+def generate_quiz(text, client, deployment_name, cache=None, meter=None):
+    """Generate multiple-choice questions from input text.
+
+    Pass a ResponseCache to serve text that was already processed from disk,
+    and a UsageMeter to record the tokens used.
+    """
+    return cached_chat_completion(
+        client, cache, **quiz_request(text, deployment_name), meter=meter, feature="quiz"
+    )
+
+
+def stream_quiz(text, client, deployment_name, cache=None, meter=None):
+    """Generate multiple-choice questions, yielding tokens as they arrive."""
+    return stream_chat_completion(
+        client, cache, **quiz_request(text, deployment_name), meter=meter, feature="quiz"
+    )
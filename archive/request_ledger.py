@@ -0,0 +1,63 @@
+# Remembers which stage submissions were already handled, so a Streamlit
+# rerun doesn't send the same request to the backend again
+import hashlib
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 64
+
+
+def input_hash(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class RequestLedger:
+    """Replies produced by each stage, keyed on (stage, input hash).
+
+    Streamlit reruns the whole script on every interaction and text inputs
+    keep their value, so a stage sees the same submission again and again.
+    handled() tells a rerun apart from a new submission; replies() returns
+    what an earlier submission of the same input produced, to replay it
+    without a backend call.
+
+    Lives in st.session_state, so it is per session.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._replies = OrderedDict()
+        # Key of the submission each stage handled last
+        self._current = {}
+
+    def __len__(self):
+        return len(self._replies)
+
+    def handled(self, stage, text):
+        """Whether text is the submission stage has already handled."""
+        return self._current.get(stage) == input_hash(text)
+
+    def replies(self, stage, text):
+        """Stored replies for this input, or None."""
+        key = (stage, input_hash(text))
+        replies = self._replies.get(key)
+        if replies is not None:
+            self._replies.move_to_end(key)
+        return replies
+
+    def record(self, stage, text, replies=None):
+        """Mark text as handled by stage and store its replies for replay.
+
+        Pass replies=None for a failed attempt, so a later submission of
+        the same input is retried rather than replayed.
+        """
+        key = input_hash(text)
+        self._current[stage] = key
+        if replies is None:
+            return
+        self._replies[(stage, key)] = list(replies)
+        self._replies.move_to_end((stage, key))
+        while len(self._replies) > self.max_entries:
+            self._replies.popitem(last=False)
+
+    def reset(self, stage):
+        """Forget the handled submission, e.g. when the stage is left."""
+        self._current.pop(stage, None)
@@ -0,0 +1,235 @@
+# Persistent, content-addressed cache for LLM responses
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from archive.tracing import span, start_span
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "STUDY_ASSISTANT_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "study_assistant"),
+)
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def request_key(model, messages, max_tokens, temperature):
+    """Hash the parts of a chat completion request that determine its output."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """SQLite key/value store with a TTL and a least-recently-used size limit.
+
+    Args:
+        path: Database file, or ":memory:" for a throwaway cache
+        ttl: Seconds an entry stays valid (per-entry override in set())
+        max_entries: Entries kept before the least recently used are evicted
+        cache_nondeterministic: Also cache completions requested with
+            temperature > 0. Off by default, since callers asking for a
+            non-zero temperature usually expect varied output.
+    """
+
+    def __init__(
+        self,
+        path=None,
+        ttl=DEFAULT_TTL,
+        max_entries=DEFAULT_MAX_ENTRIES,
+        cache_nondeterministic=False,
+    ):
+        if path is None:
+            os.makedirs(DEFAULT_CACHE_DIR, exist_ok=True)
+            path = os.path.join(DEFAULT_CACHE_DIR, "responses.sqlite3")
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_nondeterministic = cache_nondeterministic
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Streamlit runs each session's script in its own thread
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+        )
+        self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_used = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        """Store a JSON-serializable value under key."""
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now),
+            )
+            self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def lookup_response(cache, model, messages, max_tokens, temperature, meter, feature, span_name):
+    """Check the cache before a chat completion is sent.
+
+    Returns (key, content). key is None when the request isn't cached: there
+    is no cache, or temperature > 0 without cache_nondeterministic. content
+    is the cached reply, or None on a miss. A hit is recorded on meter and
+    as a span.
+    """
+    if cache is None or not (temperature == 0 or cache.cache_nondeterministic):
+        return None, None
+    key = request_key(model, messages, max_tokens, temperature)
+    content = cache.get(key)
+    if content is not None:
+        if meter is not None:
+            meter.record(feature, cached=True)
+        span(span_name, feature=feature, cache_hit=True).end()
+    return key, content
+
+
+def store_response(cache, key, content):
+    """Store a completion looked up under key; no-op for uncached requests."""
+    if key is not None and content is not None:
+        cache.set(key, content)
+
+
+def cached_chat_completion(
+    client, cache, model, messages, max_tokens, temperature, meter=None, feature="chat"
+):
+    """Run a chat completion, serving repeats of the same request from cache.
+
+    Pass a UsageMeter to record the request's tokens and latency under feature.
+
+    Returns:
+        The content of the first choice
+    """
+    key, content = lookup_response(
+        cache, model, messages, max_tokens, temperature, meter, feature, "openai.chat"
+    )
+    if content is not None:
+        return content
+
+    start = time.perf_counter()
+    with span("openai.chat", feature=feature, max_tokens=max_tokens, cache_hit=False):
+        response = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+    content = response.choices[0].message.content
+    if meter is not None:
+        meter.record_response(
+            feature, getattr(response, "usage", None), messages, content,
+            time.perf_counter() - start,
+        )
+    store_response(cache, key, content)
+    return content
+
+
+def stream_chat_completion(
+    client, cache, model, messages, max_tokens, temperature, meter=None, feature="chat"
+):
+    """Like cached_chat_completion, but yield the content as it arrives.
+
+    A cache hit yields the stored content in one piece. A streamed
+    completion is stored once it has finished.
+    """
+    key, content = lookup_response(
+        cache, model, messages, max_tokens, temperature, meter, feature, "openai.chat.stream"
+    )
+    if content is not None:
+        yield content
+        return
+
+    start = time.perf_counter()
+    usage = None
+    # Not made current: it stays open across yields to the consumer
+    stream_span = start_span(
+        "openai.chat.stream", feature=feature, max_tokens=max_tokens, cache_hit=False
+    )
+    try:
+        stream = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True
+        )
+        parts = []
+        for chunk in stream:
+            # Only sent when the deployment includes usage in streams
+            usage = getattr(chunk, "usage", None) or usage
+            # Azure sends a first chunk with content filter results and no choices
+            if not chunk.choices:
+                continue
+            token = chunk.choices[0].delta.content
+            if token:
+                if not parts:
+                    stream_span.set(first_token_ms=round((time.perf_counter() - start) * 1000, 1))
+                parts.append(token)
+                yield token
+    finally:
+        stream_span.end()
+
+    if meter is not None:
+        meter.record_response(
+            feature, usage, messages, "".join(parts), time.perf_counter() - start
+        )
+    if parts:
+        store_response(cache, key, "".join(parts))
@@ -0,0 +1,43 @@
+# Tavily searches for research papers and books
+from archive.search_cache import cached_search
+from archive.tracing import traced
+
+
+# Retrieve results from tavily AI calls for any question asked
+
+
+def internet_query(query):
+    """The Tavily query sent for an internet search."""
+    return "Give the lastest studies/reasearch paper regarding " + query
+
+
+@traced()
+def search_internet(query, client, top_k=3, cache=None):
+    """Search the internet.
+
+    Pass a SearchCache to reuse results for the same normalized query.
+    """
+    return cached_search(
+        cache, "internet", query, top_k,
+        lambda: client.search(internet_query(query), max_results=top_k),
+    )
+
+# Retrieve Books urls and names from tavily AI calls for a given topic
+
+
+def books_query(topic):
+    """The Tavily query sent for a books search."""
+    return (
+        "Provide me recent and most relevant books url that can be helpful "
+        "for basic learning on topic "
+        + topic
+    )
+
+
+@traced()
+def search_books(topic, client, top_k=2, cache=None):
+    """Search the internet via Tavily AI."""
+    return cached_search(
+        cache, "books", topic, top_k,
+        lambda: client.search(books_query(topic), max_results=top_k),
+    )
@@ -0,0 +1,135 @@
+# Cache for Tavily search results, keyed on the normalized query
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from archive.response_cache import DEFAULT_CACHE_DIR, ResponseCache
+from archive.tracing import span
+
+# Research results go stale faster than book lists
+DEFAULT_TTLS = {
+    "internet": 24 * 3600,
+    "books": 7 * 24 * 3600,
+}
+DEFAULT_MEMORY_ENTRIES = 256
+
+# Filler only: question words stay, since "why X" and "how X" ask different things
+STOP_WORDS = frozenset(
+    """
+    a about an and are as at be by can could do does explain for from give
+    i in into is it me my of on or please show tell that the this to us
+    with would you
+    """.split()
+)
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def normalize_query(text):
+    """Fold case, punctuation, whitespace and stop words out of a query.
+
+    "Tell me about  Photosynthesis!" and "photosynthesis" normalize the same. A
+    query made only of stop words is kept as is, lower-cased.
+    """
+    tokens = _TOKEN.findall(text.lower())
+    kept = [token for token in tokens if token not in STOP_WORDS]
+    return " ".join(kept or tokens)
+
+
+def search_key(kind, query, top_k):
+    payload = f"{kind}\0{normalize_query(query)}\0{top_k}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SearchCache:
+    """In-memory LRU in front of an on-disk ResponseCache.
+
+    Args:
+        path: SQLite file for the disk store, or ":memory:"
+        ttls: Seconds results stay valid, per search kind
+        memory_entries: Results kept in the in-memory LRU
+    """
+
+    def __init__(self, path=None, ttls=None, memory_entries=DEFAULT_MEMORY_ENTRIES):
+        if path is None:
+            os.makedirs(DEFAULT_CACHE_DIR, exist_ok=True)
+            path = os.path.join(DEFAULT_CACHE_DIR, "search.sqlite3")
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._disk = ResponseCache(path, ttl=max(self.ttls.values()))
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind, query, top_k):
+        """Return cached results, or None if missing or expired."""
+        key = search_key(kind, query, top_k)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self._memory.pop(key, None)
+
+        stored = self._disk.get(key)
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+                return None
+            self._remember(key, stored["results"], stored["expires_at"])
+            self.hits += 1
+        return stored["results"]
+
+    def set(self, kind, query, top_k, value):
+        key = search_key(kind, query, top_k)
+        ttl = self.ttls[kind]
+        expires_at = time.time() + ttl
+        self._disk.set(key, {"results": value, "expires_at": expires_at}, ttl=ttl)
+        with self._lock:
+            self._remember(key, value, expires_at)
+
+    def clear(self):
+        self._disk.clear()
+        with self._lock:
+            self._memory.clear()
+
+    def _remember(self, key, value, expires_at):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+
+def search_span(kind, query, top_k):
+    """The span every Tavily search, cached or not, is recorded under."""
+    return span("tavily.search", kind=kind, top_k=top_k, query_chars=len(query))
+
+
+def lookup_search(cache, kind, query, top_k, trace_span):
+    """Cached results for an equivalent query, or None; marks the span a hit or miss."""
+    if cache is None:
+        return None
+    results = cache.get(kind, query, top_k)
+    trace_span.set(cache_hit=results is not None)
+    return results
+
+
+def store_search(cache, kind, query, top_k, results):
+    """Cache fresh search results; no-op without a cache."""
+    if cache is not None:
+        cache.set(kind, query, top_k, results)
+
+
+def cached_search(cache, kind, query, top_k, search):
+    """Return search(), or the cached results for an equivalent query."""
+    with search_span(kind, query, top_k) as trace_span:
+        results = lookup_search(cache, kind, query, top_k, trace_span)
+        if results is None:
+            results = search()
+            store_search(cache, kind, query, top_k, results)
+        return results
@@ -0,0 +1,208 @@
+# Answer cache keyed on prompt meaning rather than exact text
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+
+from archive.embeddings import MAX_TOKENS_PER_INPUT, generate_embeddings
+from archive.response_cache import DEFAULT_CACHE_DIR
+from archive.tokens import count_tokens
+from archive.tracing import traced
+from archive.vector_index import VectorIndex, index_exists
+
+DEFAULT_THRESHOLD = float(os.getenv("STUDY_ASSISTANT_SEMANTIC_THRESHOLD", "0.92"))
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 2000
+
+# Best-match similarities kept for stats()
+_SIMILARITY_WINDOW = 1000
+
+
+class SemanticCache:
+    """Serve answers to prompts that mean the same as an earlier one.
+
+    Each prompt is embedded and compared with the prompts answered before
+    in the same namespace (one per stage, e.g. "query" or "summarize"). If
+    the closest one has a cosine similarity of at least threshold, its
+    answer is returned instead of calling the backend again. Entries are
+    kept in one VectorIndex per namespace under path. Prompts too long to
+    embed in one request (whole documents) bypass the cache.
+
+    Args:
+        client: OpenAI or AzureOpenAI client used for embeddings
+        deployment_name: Embedding model deployment
+        threshold: Minimum cosine similarity that counts as a hit
+        path: Directory for the indexes
+        ttl: Seconds an answer stays valid
+        max_entries: Answers kept per namespace before the oldest are dropped
+    """
+
+    def __init__(
+        self,
+        client,
+        deployment_name,
+        threshold=DEFAULT_THRESHOLD,
+        path=None,
+        ttl=DEFAULT_TTL,
+        max_entries=DEFAULT_MAX_ENTRIES,
+    ):
+        self.client = client
+        self.deployment_name = deployment_name
+        self.threshold = threshold
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, "semantic")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.skipped = 0
+        self.similarities = deque(maxlen=_SIMILARITY_WINDOW)
+        self.hit_similarities = deque(maxlen=_SIMILARITY_WINDOW)
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Hit rate and similarity figures for display."""
+        return {
+            "lookups": self.hits + self.misses,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "hit_rate": self.hit_rate,
+            "threshold": self.threshold,
+            "mean_hit_similarity": _mean(self.hit_similarities),
+            "mean_best_similarity": _mean(self.similarities),
+        }
+
+    @traced("semantic_cache.lookup")
+    def lookup(self, namespace, prompt):
+        """Find an answer for a prompt similar to this one.
+
+        Returns:
+            (answer, vector) - answer is None on a miss; pass vector on to
+            store() so the prompt isn't embedded twice. vector is None if
+            the embedding request failed, which counts as a miss, or the
+            prompt is too long to embed, which counts as neither.
+        """
+        if _too_long(prompt):
+            self.skipped += 1
+            return None, None
+        vector = self._embed(prompt)
+        if vector is None:
+            self.misses += 1
+            return None, None
+
+        with self._lock:
+            index = self._index(namespace, len(vector))
+            matches = index.search(vector, k=1) if index is not None else []
+            if matches:
+                id_, similarity, entry = matches[0]
+                self.similarities.append(similarity)
+                if similarity >= self.threshold:
+                    if entry["expires_at"] > time.time():
+                        self.hits += 1
+                        self.hit_similarities.append(similarity)
+                        return entry["answer"], vector
+                    index.delete([id_])
+            self.misses += 1
+        return None, vector
+
+    def store(self, namespace, prompt, answer, vector=None):
+        """Remember a JSON-serializable answer to prompt."""
+        if vector is None:
+            if _too_long(prompt):
+                return
+            vector = self._embed(prompt)
+            if vector is None:
+                return
+
+        id_ = hashlib.sha256(prompt.encode()).hexdigest()
+        # The id already stands for the prompt; only what lookup() needs is kept
+        entry = {"answer": answer, "expires_at": time.time() + self.ttl}
+        with self._lock:
+            index = self._index(namespace, len(vector), create=True)
+            index.add([id_], [vector], [entry])
+            overflow = len(index) - self.max_entries
+            if overflow > 0:
+                index.delete(index.ids()[:overflow])
+            if index.deleted_count > max(len(index), 64):
+                index.compact()
+
+    def clear(self):
+        with self._lock:
+            for index in self._indexes.values():
+                index.delete(index.ids())
+                index.compact()
+        self.hits = self.misses = self.errors = self.skipped = 0
+        self.similarities.clear()
+        self.hit_similarities.clear()
+
+    def _embed(self, prompt):
+        # A cache must never be the reason a stage fails
+        try:
+            return generate_embeddings(
+                [prompt], self.client, self.deployment_name, max_retries=0
+            )[0]
+        except Exception:
+            self.errors += 1
+            return None
+
+    def _index(self, namespace, dim, create=False):
+        index = self._indexes.get(namespace)
+        if index is None:
+            path = os.path.join(self.path, namespace)
+            exists = index_exists(path)
+            if not (exists or create):
+                return None
+            index = VectorIndex(path, dim=None if exists else dim)
+            self._indexes[namespace] = index
+        return index
+
+
+def _too_long(prompt):
+    return count_tokens(prompt) > MAX_TOKENS_PER_INPUT
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else None
+
+
+def semantic_call(cache, namespace, prompt, fn, *args):
+    """Return fn(*args), or a cached answer to a prompt that means the same."""
+    if cache is None:
+        return fn(*args)
+    answer, vector = cache.lookup(namespace, prompt)
+    if answer is not None:
+        return answer
+    answer = fn(*args)
+    if answer and vector is not None:
+        cache.store(namespace, prompt, answer, vector)
+    return answer
+
+
+def semantic_stream(cache, namespace, prompt, stream):
+    """Like semantic_call for a token generator.
+
+    A hit yields the cached answer in one piece and stream is never
+    started; otherwise its tokens are passed through and stored at the end.
+    """
+    if cache is None:
+        yield from stream
+        return
+    answer, vector = cache.lookup(namespace, prompt)
+    if answer is not None:
+        yield answer
+        return
+    parts = []
+    for token in stream:
+        parts.append(token)
+        yield token
+    if parts and vector is not None:
+        cache.store(namespace, prompt, "".join(parts), vector)
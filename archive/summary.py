@@ -1,7 +1,19 @@
-# Summarize text using OpenAI
-def summarize_text(text, client, deployment_name):
-    """Summarize the input text."""
+from archive.chunking import DEFAULT_CHUNK_TOKENS, DEFAULT_OVERLAP_TOKENS, split_text
+from archive.executor import MAX_WORKERS, run_concurrently
+from archive.response_cache import cached_chat_completion, stream_chat_completion
+from archive.tracing import traced
+from archive.usage import count_prompt_tokens, plan_max_tokens
+
+# Longest partial summary in a long-document summary
+CHUNK_SUMMARY_TOKENS = 300
+
+# Seconds one chunk summary may take; a level of chunks gets this per
+# round of MAX_WORKERS requests
+CHUNK_TIMEOUT = 120
 
+
+def summary_request(text, deployment_name):
+    """Chat completion arguments for a summary of text."""
     messages = [
         {
             "role": "system",
@@ -16,11 +28,145 @@ def summarize_text(text, client, deployment_name):
         }
     ]
 
-    # Create a chat completion request with specified parameters
-    response = client.chat.completions.create(
+    # Chat completion parameters; longer input gets a longer summary
+    return dict(
         model=deployment_name,
         messages=messages,
-        max_tokens=150,
+        max_tokens=plan_max_tokens("summary", count_prompt_tokens(messages)),
         temperature=0.5
     )
-    return response.choices[0].message.content
+
+
+# Summarize text using OpenAI
+@traced()
+def summarize_text(text, client, deployment_name, cache=None, meter=None):
+    """Summarize the input text.
+
+    Pass a ResponseCache to serve text that was already summarized from disk,
+    and a UsageMeter to record the tokens used.
+    """
+    return cached_chat_completion(
+        client, cache, **summary_request(text, deployment_name), meter=meter, feature="summary"
+    )
+
+
+def stream_summary(text, client, deployment_name, cache=None, meter=None):
+    """Summarize the input text, yielding tokens as they arrive."""
+    return stream_chat_completion(
+        client, cache, **summary_request(text, deployment_name), meter=meter, feature="summary"
+    )
+
+
+def _chunk_request(text, deployment_name, max_tokens=None, combine=False, feature="summary_chunk"):
+    """Request for one map (part of a document) or reduce (partial summaries) step.
+
+    The reply length comes from the feature's budget, capped at max_tokens.
+    """
+    instruction = (
+        "Combine these partial summaries of one document into concise bullet "
+        "points, removing repetition:"
+        if combine else
+        "Summarize this part of a longer document into concise bullet points:"
+    )
+    messages = [
+        {
+            "role": "system",
+            "content": "You are an assistant that summarizes input text."
+        },
+        {
+            "role": "user",
+            "content": f"{instruction}\n\n{text}"
+        }
+    ]
+    planned = plan_max_tokens(feature, count_prompt_tokens(messages))
+    return dict(
+        model=deployment_name,
+        messages=messages,
+        max_tokens=planned if max_tokens is None else min(planned, max_tokens),
+        temperature=0.5
+    )
+
+
+def _complete(client, cache, request, meter=None, feature="summary_chunk"):
+    return cached_chat_completion(client, cache, **request, meter=meter, feature=feature)
+
+
+def _summarize_parts(parts, client, deployment_name, cache, max_tokens, combine, progress, meter):
+    """Summarize parts concurrently, returning the summaries in input order."""
+    calls = {
+        i: (
+            _complete, client, cache,
+            _chunk_request(part, deployment_name, max_tokens, combine), meter,
+        )
+        for i, part in enumerate(parts)
+    }
+    summaries = [None] * len(parts)
+    rounds = -(-len(parts) // MAX_WORKERS)
+    for i, summary, error in run_concurrently(calls, timeout=CHUNK_TIMEOUT * rounds):
+        if error is not None:
+            raise error
+        summaries[i] = summary or ""
+        progress()
+    return summaries
+
+
+@traced()
+def summarize_long_text(
+    text,
+    client,
+    deployment_name,
+    cache=None,
+    chunk_tokens=DEFAULT_CHUNK_TOKENS,
+    overlap_tokens=DEFAULT_OVERLAP_TOKENS,
+    chunk_summary_tokens=CHUNK_SUMMARY_TOKENS,
+    target_tokens=None,
+    on_progress=None,
+    meter=None,
+):
+    """Summarize text of any length with a parallel map-reduce.
+
+    The text is split into overlapping chunks of chunk_tokens, which are
+    summarized at the same time on the shared executor. The partial
+    summaries are combined the same way, level by level, until they fit in
+    one request; a final request condenses them. Text that already fits in
+    one chunk is summarized directly.
+
+    Reply lengths come from the summary_chunk budget (partial summaries, at
+    most chunk_summary_tokens) and the summary budget (the final summary,
+    at most target_tokens if given).
+
+    Args:
+        on_progress: Called as on_progress(done, total) after each request.
+            total grows if another reduce level turns out to be needed.
+    """
+    if 2 * chunk_summary_tokens > chunk_tokens:
+        raise ValueError("chunk_tokens must fit at least two partial summaries")
+    progress_state = {"done": 0, "total": 1}
+
+    def progress():
+        progress_state["done"] += 1
+        if on_progress is not None:
+            on_progress(progress_state["done"], progress_state["total"])
+
+    parts = split_text(text, chunk_tokens, overlap_tokens)
+    combine = False
+    while len(parts) > 1:
+        progress_state["total"] += len(parts)
+        summaries = _summarize_parts(
+            parts, client, deployment_name, cache, chunk_summary_tokens, combine, progress,
+            meter,
+        )
+        text, combine = "\n\n".join(summaries), True
+        parts = split_text(text, chunk_tokens, 0)
+
+    if combine:
+        request = _chunk_request(
+            text, deployment_name, target_tokens, combine=True, feature="summary"
+        )
+    else:
+        request = summary_request(text, deployment_name)
+        if target_tokens is not None:
+            request["max_tokens"] = min(request["max_tokens"], target_tokens)
+    summary = _complete(client, cache, request, meter, feature="summary")
+    progress()
+    return summary
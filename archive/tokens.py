@@ -0,0 +1,32 @@
+# Local token counting, used to size requests before they are sent
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:  # optional; fall back to a character estimate
+    tiktoken = None
+
+DEFAULT_ENCODING = "cl100k_base"
+
+# Average characters per token for English text with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding(name):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception:  # encoding files can't be downloaded (offline)
+        return None
+
+
+def count_tokens(text, encoding=DEFAULT_ENCODING):
+    """Count the tokens in text, exactly with tiktoken or else estimated."""
+    if not text:
+        return 0
+    enc = _encoding(encoding)
+    if enc is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(enc.encode(text))
@@ -0,0 +1,214 @@
+# Span-based tracing for stages, helpers and outbound requests
+#
+# Off unless STUDY_ASSISTANT_TRACE_DIR is set or configure() is called. While
+# off, span() returns a shared no-op and traced() calls straight through, so
+# instrumented code pays for one attribute check.
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+
+_current = contextvars.ContextVar("study_assistant_span", default=None)
+_ids = itertools.count(1)
+
+
+class Span:
+    """One timed operation. Use set() to add attributes while it runs."""
+
+    __slots__ = ("tracer", "name", "span_id", "parent_id", "trace_id", "attributes",
+                 "start_ns", "end_ns", "thread_id", "error", "_token")
+
+    def __init__(self, tracer, name, parent, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.span_id = next(_ids)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.trace_id = parent.trace_id if parent is not None else self.span_id
+        self.attributes = attributes
+        self.thread_id = threading.get_ident()
+        self.error = None
+        self.end_ns = None
+        self._token = None
+        self.start_ns = time.perf_counter_ns()
+
+    @property
+    def duration_ms(self):
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.perf_counter_ns()
+            self.tracer._finish(self)
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        _current.reset(self._token)
+        self.end()
+        return False
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "thread_id": self.thread_id,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def end(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class JsonlExporter:
+    """Appends one JSON object per finished span."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+    def flush(self):
+        pass
+
+
+class ChromeTraceExporter:
+    """Writes spans as Chrome trace events (chrome://tracing, ui.perfetto.dev).
+
+    The file is rewritten when a root span finishes, so it is always a
+    complete JSON document. Only the newest max_events are kept.
+    """
+
+    def __init__(self, path, max_events=100_000):
+        self.path = path
+        self.max_events = max_events
+        self._events = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def export(self, span):
+        event = {
+            "name": span.name,
+            "ph": "X",
+            "ts": span.start_ns / 1000,
+            "dur": (span.end_ns - span.start_ns) / 1000,
+            "pid": self._pid,
+            "tid": span.thread_id,
+            "args": dict(span.attributes, span_id=span.span_id, parent_id=span.parent_id,
+                         error=span.error),
+        }
+        with self._lock:
+            self._events.append(event)
+            if len(self._events) > self.max_events:
+                del self._events[:len(self._events) - self.max_events]
+
+    def flush(self):
+        with self._lock:
+            payload = json.dumps({"traceEvents": self._events}, default=str)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.exporters = []
+
+    def configure(self, path=None, exporters=None):
+        """Turn tracing on, writing trace-<pid>.jsonl and .json under path."""
+        if exporters is None:
+            os.makedirs(path, exist_ok=True)
+            base = os.path.join(path, f"trace-{os.getpid()}")
+            exporters = [JsonlExporter(base + ".jsonl"), ChromeTraceExporter(base + ".json")]
+        self.exporters = list(exporters)
+        self.enabled = True
+
+    def disable(self):
+        for exporter in self.exporters:
+            exporter.flush()
+        self.enabled = False
+        self.exporters = []
+
+    def span(self, name, **attributes):
+        """Context manager timing a block as a child of the current span."""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, _current.get(), attributes)
+
+    def start_span(self, name, **attributes):
+        """A span that is not made current; call end() when done.
+
+        For work that crosses yields, like consuming a stream, where a
+        current span would leak into the caller.
+        """
+        return self.span(name, **attributes)
+
+    def _finish(self, span):
+        for exporter in self.exporters:
+            exporter.export(span)
+        if span.parent_id is None:
+            for exporter in self.exporters:
+                exporter.flush()
+
+
+tracer = Tracer()
+span = tracer.span
+start_span = tracer.start_span
+
+if os.getenv("STUDY_ASSISTANT_TRACE_DIR"):
+    tracer.configure(os.getenv("STUDY_ASSISTANT_TRACE_DIR"))
+
+
+def configure(path=None, exporters=None):
+    tracer.configure(path, exporters)
+
+
+def traced(name=None):
+    """Decorator running the function inside a span named name (default: qualname)."""
+    def decorate(fn):
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            with tracer.span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
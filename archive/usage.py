@@ -0,0 +1,124 @@
+# Token accounting and per-feature token budgets for chat completions
+import threading
+from typing import NamedTuple
+
+from archive.tokens import count_tokens
+
+# Tokens the chat format adds around each message, and to prime the reply
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+
+class Budget(NamedTuple):
+    """Token limits for one feature's requests."""
+    total: int  # prompt + completion tokens one request may use
+    min_completion: int
+    max_completion: int
+    ratio: float  # completion tokens wanted per prompt token
+
+
+FEATURE_BUDGETS = {
+    "summary": Budget(total=8000, min_completion=150, max_completion=600, ratio=0.25),
+    "summary_chunk": Budget(total=4000, min_completion=150, max_completion=300, ratio=0.2),
+    "quiz": Budget(total=8000, min_completion=300, max_completion=1200, ratio=0.5),
+    "flashcards": Budget(total=4000, min_completion=400, max_completion=800, ratio=0.0),
+}
+
+
+class PromptTooLong(ValueError):
+    """The prompt leaves no room for a reply within the feature's budget."""
+
+
+def count_prompt_tokens(messages):
+    """Estimate the prompt tokens of a chat request before sending it."""
+    return TOKENS_PER_REPLY + sum(
+        TOKENS_PER_MESSAGE + count_tokens(message["content"]) for message in messages
+    )
+
+
+def plan_max_tokens(feature, prompt_tokens, budgets=FEATURE_BUDGETS):
+    """Pick max_tokens for a request from its feature budget and prompt size.
+
+    Longer inputs get longer replies (prompt_tokens * ratio, clamped to
+    the feature's min/max), but never more than the budget leaves.
+
+    Raises:
+        PromptTooLong: If even the minimum reply doesn't fit the budget
+    """
+    budget = budgets[feature]
+    room = budget.total - prompt_tokens
+    if room < budget.min_completion:
+        raise PromptTooLong(
+            f"{feature} prompt has about {prompt_tokens} tokens; "
+            f"the budget of {budget.total} leaves no room for a reply"
+        )
+    wanted = int(prompt_tokens * budget.ratio)
+    wanted = max(budget.min_completion, min(wanted, budget.max_completion))
+    return min(wanted, room)
+
+
+class FeatureUsage(NamedTuple):
+    calls: int
+    cached: int
+    prompt_tokens: int
+    completion_tokens: int
+    seconds: float
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+
+def _usage_value(usage, name):
+    # OpenAI responses carry a usage object, LangChain messages a dict
+    if isinstance(usage, dict):
+        return usage.get(name)
+    return getattr(usage, name, None)
+
+
+class UsageMeter:
+    """Prompt/completion tokens and latency of every request, per feature.
+
+    Counts come from the response's usage when the provider sends it, and
+    from local token counts otherwise. Cache hits are counted as calls with
+    no tokens. Safe to share between threads.
+    """
+
+    def __init__(self):
+        self._features = {}
+        self._lock = threading.Lock()
+
+    def record(self, feature, prompt_tokens=0, completion_tokens=0, seconds=0.0, cached=False):
+        with self._lock:
+            usage = self._features.get(feature, FeatureUsage(0, 0, 0, 0, 0.0))
+            self._features[feature] = FeatureUsage(
+                usage.calls + 1,
+                usage.cached + bool(cached),
+                usage.prompt_tokens + prompt_tokens,
+                usage.completion_tokens + completion_tokens,
+                usage.seconds + seconds,
+            )
+
+    def record_response(self, feature, usage, messages, content, seconds):
+        """Record a completed request, preferring the provider's usage numbers."""
+        prompt_tokens = _usage_value(usage, "prompt_tokens")
+        completion_tokens = _usage_value(usage, "completion_tokens")
+        self.record(
+            feature,
+            prompt_tokens if prompt_tokens is not None else count_prompt_tokens(messages),
+            completion_tokens if completion_tokens is not None else count_tokens(content or ""),
+            seconds,
+        )
+
+    def by_feature(self):
+        with self._lock:
+            return dict(self._features)
+
+    def totals(self):
+        features = self.by_feature().values()
+        return FeatureUsage(*(sum(column) for column in zip(*features))) if features \
+            else FeatureUsage(0, 0, 0, 0, 0.0)
+
+    def clear(self):
+        with self._lock:
+            self._features.clear()
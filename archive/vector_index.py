@@ -0,0 +1,239 @@
+# Local vector index over study material, persisted to a memory-mapped file
+import json
+import os
+import sqlite3
+
+import numpy as np
+
+BACKENDS = ("numpy", "faiss-hnsw", "faiss-ivf")
+
+_VECTORS_FILE = "vectors.f32"
+_STATE_FILE = "index.sqlite3"
+_INITIAL_CAPACITY = 1024
+
+
+def index_exists(path):
+    """Whether a VectorIndex has been created under path."""
+    return os.path.exists(os.path.join(path, _STATE_FILE))
+
+
+class VectorIndex:
+    """Add, delete and top-k search over embedding vectors.
+
+    Vectors live in <path>/vectors.f32, a float32 matrix opened with
+    np.memmap, so reopening an index doesn't re-embed or even read every
+    vector up front. Ids, metadata and deletions are kept in
+    <path>/index.sqlite3, one row per vector, so add() and delete() only
+    write the rows they touch. Deleted rows are tombstoned until compact().
+
+    Vectors are L2-normalized on add, so scores are cosine similarities.
+
+    Args:
+        path: Directory holding the index files (created if missing)
+        dim: Vector size; read from disk when reopening an index
+        backend: "numpy" for exact brute force, or "faiss-hnsw"/"faiss-ivf"
+            for approximate search (needs faiss-cpu)
+    """
+
+    def __init__(self, path, dim=None, backend="numpy"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+        self.path = path
+        self.backend = backend
+        os.makedirs(path, exist_ok=True)
+
+        exists = index_exists(path)
+        # Callers serialize access, possibly from different threads
+        self._conn = sqlite3.connect(os.path.join(path, _STATE_FILE), check_same_thread=False)
+        if exists:
+            settings = dict(self._conn.execute("SELECT name, value FROM settings"))
+            if dim is not None and dim != settings["dim"]:
+                raise ValueError(f"Index at {path} has dim {settings['dim']}, not {dim}")
+            self.dim = settings["dim"]
+            self._capacity = settings["capacity"]
+            rows = self._conn.execute(
+                "SELECT id, metadata, alive FROM rows ORDER BY position"
+            ).fetchall()
+            self._ids = [row[0] for row in rows]
+            self._metadata = [json.loads(row[1]) for row in rows]
+            self._alive = np.array([row[2] for row in rows], dtype=bool)
+        else:
+            if dim is None:
+                raise ValueError("dim is required to create a new index")
+            self.dim = dim
+            self._ids, self._metadata = [], []
+            self._alive = np.zeros(0, dtype=bool)
+            self._capacity = _INITIAL_CAPACITY
+            self._resize_file(self._capacity)
+            self._conn.execute("CREATE TABLE settings (name TEXT PRIMARY KEY, value INTEGER)")
+            self._conn.execute(
+                "CREATE TABLE rows ("
+                " position INTEGER PRIMARY KEY,"
+                " id TEXT NOT NULL,"
+                " metadata TEXT NOT NULL,"
+                " alive INTEGER NOT NULL)"
+            )
+            self._save_settings()
+
+        self._positions = {id_: i for i, id_ in enumerate(self._ids) if self._alive[i]}
+        self._vectors = self._open_vectors()
+        self._faiss = None
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, id_):
+        return id_ in self._positions
+
+    def ids(self):
+        """Return the live ids, oldest first."""
+        return [id_ for id_, alive in zip(self._ids, self._alive) if alive]
+
+    @property
+    def deleted_count(self):
+        """Tombstoned rows that compact() would reclaim."""
+        return len(self._ids) - len(self._positions)
+
+    def add(self, ids, vectors, metadata=None):
+        """Add vectors under ids; an existing id is replaced."""
+        ids = list(ids)
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim)
+        metadata = list(metadata) if metadata is not None else [None] * len(ids)
+
+        self.delete([id_ for id_ in ids if id_ in self._positions], save=False)
+
+        start = len(self._ids)
+        if start + len(ids) > self._capacity:
+            self._grow(start + len(ids))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self._vectors[start:start + len(ids)] = np.divide(
+            vectors, norms, out=np.zeros_like(vectors), where=norms > 0
+        )
+        self._vectors.flush()
+
+        for offset, id_ in enumerate(ids):
+            self._positions[id_] = start + offset
+        self._ids.extend(ids)
+        self._metadata.extend(metadata)
+        self._alive = np.concatenate([self._alive, np.ones(len(ids), dtype=bool)])
+        self._faiss = None
+        self._conn.executemany(
+            "INSERT INTO rows (position, id, metadata, alive) VALUES (?, ?, ?, 1)",
+            [(start + offset, id_, json.dumps(entry))
+             for offset, (id_, entry) in enumerate(zip(ids, metadata))],
+        )
+        self._conn.commit()
+
+    def delete(self, ids, save=True):
+        """Remove ids from the index; unknown ids are ignored."""
+        positions = []
+        for id_ in ids:
+            position = self._positions.pop(id_, None)
+            if position is not None:
+                self._alive[position] = False
+                positions.append((position,))
+                self._faiss = None
+        self._conn.executemany("UPDATE rows SET alive = 0 WHERE position = ?", positions)
+        if save:
+            self._conn.commit()
+
+    def search(self, query, k=5):
+        """Return up to k (id, score, metadata) tuples, best match first."""
+        if not self._positions:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+        k = min(k, len(self._positions))
+
+        if self.backend == "numpy":
+            positions, scores = self._search_numpy(query, k)
+        else:
+            positions, scores = self._search_faiss(query, k)
+        return [
+            (self._ids[p], float(s), self._metadata[p])
+            for p, s in zip(positions, scores)
+        ]
+
+    def compact(self):
+        """Drop deleted rows from disk and renumber the live ones."""
+        live = np.flatnonzero(self._alive)
+        vectors = np.array(self._vectors[live])
+        self._ids = [self._ids[i] for i in live]
+        self._metadata = [self._metadata[i] for i in live]
+        self._alive = np.ones(len(live), dtype=bool)
+        self._positions = {id_: i for i, id_ in enumerate(self._ids)}
+        self._vectors[:len(live)] = vectors
+        self._vectors.flush()
+        self._faiss = None
+        self._conn.execute("DELETE FROM rows")
+        self._conn.executemany(
+            "INSERT INTO rows (position, id, metadata, alive) VALUES (?, ?, ?, 1)",
+            [(i, id_, json.dumps(entry))
+             for i, (id_, entry) in enumerate(zip(self._ids, self._metadata))],
+        )
+        self._conn.commit()
+
+    def _search_numpy(self, query, k):
+        count = len(self._ids)
+        scores = np.asarray(self._vectors[:count] @ query)
+        scores[~self._alive] = -np.inf
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return top, scores[top]
+
+    def _search_faiss(self, query, k):
+        if self._faiss is None:
+            self._faiss = self._build_faiss()
+        index, live = self._faiss
+        scores, rows = index.search(query.reshape(1, -1), k)
+        found = rows[0] >= 0
+        return live[rows[0][found]], scores[0][found]
+
+    def _build_faiss(self):
+        try:
+            import faiss
+        except ImportError as exc:
+            raise ImportError(f"The {self.backend} backend needs faiss-cpu installed") from exc
+
+        live = np.flatnonzero(self._alive)
+        vectors = np.ascontiguousarray(self._vectors[live])
+        if self.backend == "faiss-hnsw":
+            index = faiss.IndexHNSWFlat(self.dim, 32, faiss.METRIC_INNER_PRODUCT)
+        else:
+            nlist = max(1, int(np.sqrt(len(live))))
+            quantizer = faiss.IndexFlatIP(self.dim)
+            index = faiss.IndexIVFFlat(quantizer, self.dim, nlist, faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+            index.nprobe = min(nlist, 8)
+        index.add(vectors)
+        return index, live
+
+    def _open_vectors(self):
+        return np.memmap(
+            os.path.join(self.path, _VECTORS_FILE),
+            dtype=np.float32, mode="r+", shape=(self._capacity, self.dim),
+        )
+
+    def _resize_file(self, capacity):
+        with open(os.path.join(self.path, _VECTORS_FILE), "ab") as f:
+            f.truncate(capacity * self.dim * np.dtype(np.float32).itemsize)
+
+    def _grow(self, needed):
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        self._vectors.flush()
+        del self._vectors
+        self._resize_file(capacity)
+        self._capacity = capacity
+        self._vectors = self._open_vectors()
+        self._save_settings()
+
+    def _save_settings(self):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO settings (name, value) VALUES (?, ?)",
+            [("dim", self.dim), ("capacity", self._capacity)],
+        )
+        self._conn.commit()
@@ -0,0 +1,93 @@
+"""Measure cold-start and per-rerun script time for every app page.
+
+Each page is measured in a fresh interpreter so that the first visit pays
+for its imports, exactly like the first visit after a server start. The
+landing page, shown before a name is entered, is the first run of every
+session and gets its own row; the other pages are visited after it.
+
+Usage:
+    python benchmarks/bench_pages.py [--reruns N] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+PAGES = ["Landing", "Home", "Data Generator", "Mini Games", "Chat System", "Quiz", "Settings"]
+
+# Runs inside the child interpreter; prints one JSON line with the timings
+_CHILD = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+app_path, page, reruns = sys.argv[1], sys.argv[2], int(sys.argv[3])
+at = AppTest.from_file(app_path, default_timeout=120)
+heavy = ("pandas", "numpy", "pyarrow")
+
+if page != "Landing":
+    at.run()
+    at.sidebar.text_input[0].input("Benchmark")
+    at.run()
+    at.sidebar.radio[0].set_value(page)
+
+loaded = set(sys.modules)
+t0 = time.perf_counter()
+at.run()
+first_visit_s = time.perf_counter() - t0
+assert not at.exception, at.exception
+
+rerun_s = []
+for _ in range(reruns):
+    t0 = time.perf_counter()
+    at.run()
+    rerun_s.append(time.perf_counter() - t0)
+
+print(json.dumps({
+    "page": page,
+    "first_visit_s": first_visit_s,
+    "rerun_s": rerun_s,
+    "imported_modules": sorted(m for m in heavy if m in sys.modules and m not in loaded),
+}))
+"""
+
+
+def bench_page(page, reruns):
+    """Run one page in a fresh interpreter and return its timings."""
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, APP_PATH, page, str(reruns)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["rerun_median_s"] = statistics.median(result["rerun_s"])
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=20, help="reruns measured per page")
+    parser.add_argument("--json", help="write the raw results to this file")
+    args = parser.parse_args(argv)
+
+    results = [bench_page(page, args.reruns) for page in PAGES]
+
+    print(
+        f"{'Page':<16}{'first visit ms':>16}{'rerun p50 ms':>14}"
+        "  heavy modules imported"
+    )
+    for r in results:
+        print(
+            f"{r['page']:<16}{r['first_visit_s'] * 1000:>16.1f}"
+            f"{r['rerun_median_s'] * 1000:>14.1f}  {', '.join(r['imported_modules']) or '-'}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
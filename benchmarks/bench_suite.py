@@ -0,0 +1,390 @@
+"""Time the app's hot paths offline and compare them with a stored baseline.
+
+The OpenAI, LangChain and Tavily clients are replaced by the deterministic
+fakes in benchmarks/fakes.py, so nothing touches the network and every run
+does the same work. Each benchmark is timed at a few input sizes; the median
+of the timed repeats is compared with benchmarks/baseline.json, or with
+benchmarks/baseline-<MS>ms.json for runs with a simulated --latency-ms.
+
+Usage:
+    python benchmarks/bench_suite.py [--only NAME ...] [--latency-ms MS]
+    python benchmarks/bench_suite.py [--latency-ms MS] --update-baseline
+
+Exits with status 1 when a case's median is more than its threshold times
+the baseline (1.5x for plain functions, 2x for app reruns, or --threshold)
+and slower by at least --min-delta-ms, so tiny cases don't fail on noise.
+Baselines are machine-specific: record one on the machine that runs the
+comparison.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.fakes import fake_backends, fake_text  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, "app.py")
+ASSISTANT_PATH = os.path.join(ROOT, "archive", "genai_study_assistant.py")
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+DEFAULT_THRESHOLD = 1.5
+DEFAULT_MIN_DELTA_MS = 5.0
+DEFAULT_REPEAT = 7
+
+# Whole-script runs through AppTest vary much more between runs than plain
+# function calls, so they get more repeats and a looser threshold
+APP_REPEAT = 7
+APP_THRESHOLD = 2.0
+
+# name -> (function, sizes, repeat, threshold)
+BENCHMARKS = {}
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark that can't run here (e.g. an optional package is missing)."""
+
+
+def benchmark(sizes, repeat=APP_REPEAT, threshold=APP_THRESHOLD):
+    """Register fn(size, env) -> run, where run() is the operation to time.
+
+    Everything before the return is setup and is not timed.
+    """
+    def register(fn):
+        BENCHMARKS[fn.__name__.removeprefix("bench_")] = (fn, sizes, repeat, threshold)
+        return fn
+    return register
+
+
+def case_key(name, size):
+    return f"{name}[{size}]"
+
+
+def measure(run, repeat):
+    """Time one warmup and `repeat` calls of run(); return the timed ones in ms.
+
+    A run() that returns a float is taken to report its own duration in
+    seconds, so it can leave steps out of the timing.
+    """
+    durations = []
+    for i in range(repeat + 1):
+        t0 = time.perf_counter()
+        reported = run()
+        elapsed = reported if isinstance(reported, float) else time.perf_counter() - t0
+        if i:
+            durations.append(elapsed * 1000)
+    return durations
+
+
+def _document(words, salt=""):
+    """Prose of about `words` words in sentences and paragraphs."""
+    sentences = [
+        fake_text(f"{salt}{i}", 12).capitalize() + "."
+        for i in range(max(1, words // 12))
+    ]
+    return "\n\n".join(" ".join(sentences[i:i + 8]) for i in range(0, len(sentences), 8))
+
+
+def _history(messages, archive_path):
+    from core.chat_history import ChatHistory
+
+    history = ChatHistory(archive_path=archive_path)
+    for i in range(messages):
+        role = "user" if i % 2 == 0 else "assistant"
+        history.append({"role": role, "content": f"Message {i}: {fake_text(str(i), 20)}"})
+    return history
+
+
+def _app_page(page, session=None):
+    """app.py with a user signed in and `page` selected."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    for key, value in (session or {}).items():
+        at.session_state[key] = value
+    at.run()
+    at.sidebar.text_input[0].input("Benchmark").run()
+    at.sidebar.radio[0].set_value(page).run()
+    assert not at.exception, at.exception
+    return at
+
+
+def _assistant(session=None):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(ASSISTANT_PATH, default_timeout=120)
+    for key, value in (session or {}).items():
+        at.session_state[key] = value
+    at.run()
+    assert not at.exception, at.exception
+    return at
+
+
+def _submit(at, run):
+    """Apply a widget change, rerun and fail loudly if the script raised."""
+    run()
+    assert not at.exception, at.exception
+
+
+def _menu(at, choice):
+    _submit(at, lambda: at.text_input(key="menu_choice").input(choice).run())
+
+
+@benchmark(sizes=[1_000, 100_000, 1_000_000],
+           repeat=DEFAULT_REPEAT, threshold=DEFAULT_THRESHOLD)
+def bench_csv_export(size, env):
+    """generate_csv_from_data on a generated series."""
+    from core.datagen import generate_dataset
+    from core.export import generate_csv_from_data
+
+    frame = generate_dataset(size, "Sales", seed=0)
+    return lambda: generate_csv_from_data(frame, "Sales")
+
+
+@benchmark(sizes=[1_000, 100_000, 1_000_000])
+def bench_data_generator_rerun(size, env):
+    """A Data Generator rerun with unchanged inputs (dataset and chart cached)."""
+    at = _app_page("Data Generator")
+    _submit(at, lambda: at.number_input[0].set_value(size).run())
+    return lambda: _submit(at, at.run)
+
+
+@benchmark(sizes=[1_000, 100_000, 1_000_000])
+def bench_data_generator_new_data(size, env):
+    """Generate New Data: a new seed, so the series and chart are rebuilt."""
+    at = _app_page("Data Generator")
+    _submit(at, lambda: at.number_input[0].set_value(size).run())
+
+    def run():
+        button = next(b for b in at.button if "Generate New Data" in b.label)
+        _submit(at, button.click().run)
+
+    return run
+
+
+@benchmark(sizes=[100, 1_000, 10_000])
+def bench_chat_rerun(size, env):
+    """A Chat System rerun with `size` messages in the history."""
+    history = _history(size, os.path.join(env["cache_dir"], f"chat-{size}.jsonl"))
+    at = _app_page("Chat System", {"messages": history})
+    return lambda: _submit(at, at.run)
+
+
+@benchmark(sizes=[100, 1_000, 10_000])
+def bench_assistant_history_rerun(size, env):
+    """A study assistant rerun at the main menu with `size` messages in the history."""
+    history = _history(size, os.path.join(env["cache_dir"], f"assistant-{size}.jsonl"))
+    at = _assistant({"messages": history})
+    return lambda: _submit(at, at.run)
+
+
+@benchmark(sizes=[100, 1_000, 5_000])
+def bench_assistant_summarize(size, env):
+    """Submitting text to summarize; 5,000 words takes the chunked map-reduce path."""
+    at = _assistant()
+    runs = iter(range(1_000_000))
+
+    def run():
+        # Summarizing returns to the menu; picking option 2 again isn't timed
+        _menu(at, "2")
+        text = _document(size, salt=f"summary {next(runs)} ")
+        t0 = time.perf_counter()
+        _submit(at, lambda: at.text_area(key="summary_input").input(text).run())
+        return time.perf_counter() - t0
+
+    return run
+
+
+@benchmark(sizes=[50, 500, 2_000])
+def bench_assistant_quiz(size, env):
+    """Submitting text for a quiz, streamed from the fake client."""
+    at = _assistant()
+    _menu(at, "3")
+    runs = iter(range(1_000_000))
+    return lambda: _submit(
+        at, lambda: at.text_input[0].input(_document(size, salt=f"quiz {next(runs)} ")).run()
+    )
+
+
+@benchmark(sizes=[3, 30])
+def bench_assistant_query(size, env):
+    """Submitting a question of `size` words to the search stage."""
+    at = _assistant()
+    _menu(at, "4")
+    runs = iter(range(1_000_000))
+    return lambda: _submit(
+        at, lambda: at.text_input[0].input(f"{next(runs)} {fake_text('query', size)}").run()
+    )
+
+
+@benchmark(sizes=[3, 30])
+def bench_assistant_flashcards(size, env):
+    """Submitting a topic for flashcards (structured request plus book search)."""
+    try:
+        import langchain_core  # noqa: F401
+    except ImportError:
+        raise SkipBenchmark("langchain_core is not installed")
+    at = _assistant()
+    _menu(at, "1")
+    runs = iter(range(1_000_000))
+    return lambda: _submit(
+        at, lambda: at.text_input[0].input(f"{next(runs)} {fake_text('topic', size)}").run()
+    )
+
+
+def run_benchmarks(names=None, latency=0.0, repeat=None, log=print):
+    """Run the selected benchmarks and return {case key: result}."""
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir, fake_backends(cache_dir, latency):
+        env = {"cache_dir": cache_dir, "latency": latency}
+        for name, (fn, sizes, default_repeat, _) in BENCHMARKS.items():
+            if names and name not in names:
+                continue
+            for size in sizes:
+                key = case_key(name, size)
+                try:
+                    run = fn(size, env)
+                except SkipBenchmark as exc:
+                    log(f"{key:<40}skipped: {exc}")
+                    continue
+                durations = measure(run, repeat or default_repeat)
+                results[key] = {
+                    "median_ms": round(statistics.median(durations), 3),
+                    "min_ms": round(min(durations), 3),
+                    "repeat": len(durations),
+                }
+                log(f"{key:<40}{results[key]['median_ms']:>12.2f}{results[key]['min_ms']:>12.2f}")
+    return results
+
+
+def case_threshold(key):
+    """The regression threshold registered for a case's benchmark."""
+    entry = BENCHMARKS.get(key.partition("[")[0])
+    return entry[3] if entry else DEFAULT_THRESHOLD
+
+
+def compare(results, baseline, threshold=None, min_delta_ms=DEFAULT_MIN_DELTA_MS):
+    """Compare results with baseline results.
+
+    A case regresses when its median is more than threshold times the
+    baseline median (each benchmark's own threshold if threshold is None).
+
+    Returns:
+        List of (case key, median ms, baseline median ms, status), where status
+        is "ok", "regressed" or "new"
+    """
+    rows = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            rows.append((key, result["median_ms"], None, "new"))
+            continue
+        slower = result["median_ms"] - base["median_ms"]
+        limit = threshold or case_threshold(key)
+        regressed = (result["median_ms"] > base["median_ms"] * limit
+                     and slower > min_delta_ms)
+        rows.append((key, result["median_ms"], base["median_ms"],
+                     "regressed" if regressed else "ok"))
+    return rows
+
+
+def environment(latency):
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "latency_ms": latency * 1000,
+    }
+
+
+def baseline_path(latency_ms):
+    """Default baseline file for a simulated latency; each latency has its own."""
+    if not latency_ms:
+        return BASELINE_PATH
+    return os.path.join(ROOT, "benchmarks", f"baseline-{latency_ms:g}ms.json")
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, latency, previous=None):
+    """Write results as the new baseline, keeping cases that weren't rerun."""
+    merged = dict(previous["results"]) if previous else {}
+    merged.update(results)
+    with open(path, "w") as f:
+        json.dump({"environment": environment(latency), "results": merged}, f,
+                  indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="simulated latency of each fake API request")
+    parser.add_argument("--repeat", type=int, help="timed runs per case (default: per benchmark)")
+    parser.add_argument("--baseline",
+                        help="baseline JSON file (default: one per --latency-ms)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store these results as the baseline instead of comparing")
+    parser.add_argument("--threshold", type=float,
+                        help="fail when a median is more than this times the baseline "
+                             f"(default: {DEFAULT_THRESHOLD:g} for functions, "
+                             f"{APP_THRESHOLD:g} for app reruns)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="ignore slowdowns smaller than this")
+    parser.add_argument("--json", help="write the raw results to this file")
+    args = parser.parse_args(argv)
+
+    latency = args.latency_ms / 1000
+    if args.baseline is None:
+        args.baseline = baseline_path(args.latency_ms)
+    baseline = load_baseline(args.baseline)
+    if (baseline and not args.update_baseline
+            and baseline["environment"]["latency_ms"] != args.latency_ms):
+        parser.error(
+            f"the baseline was recorded with --latency-ms "
+            f"{baseline['environment']['latency_ms']:g}; use that or --update-baseline"
+        )
+
+    print(f"{'Case':<40}{'median ms':>12}{'min ms':>12}")
+    results = run_benchmarks(args.only, latency, args.repeat)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"environment": environment(latency), "results": results}, f, indent=2)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results, latency, baseline)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    rows = compare(results, baseline["results"], args.threshold, args.min_delta_ms)
+    print(f"\n{'Case':<40}{'median ms':>12}{'baseline ms':>12}{'ratio':>8}  status")
+    for key, median, base, status in rows:
+        ratio = f"{median / base:.2f}" if base else "-"
+        base_text = f"{base:.2f}" if base is not None else "-"
+        print(f"{key:<40}{median:>12.2f}{base_text:>12}{ratio:>8}  {status}")
+    regressed = [row for row in rows if row[3] == "regressed"]
+    if regressed:
+        print(f"\n{len(regressed)} case(s) regressed past their threshold")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""Deterministic in-process stand-ins for the OpenAI, LangChain and Tavily clients.
+
+Replies are derived from a hash of the request, so the same input always
+gets the same output and nothing touches the network. Each fake can wait
+`latency` seconds per request to imitate a remote service. The benchmarks
+and the test suite share these fakes.
+"""
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+from archive.tokens import count_tokens
+
+_WORDS = (
+    "cell energy light water carbon process system structure function model "
+    "theory evidence result change growth force reaction pattern network data"
+).split()
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def fake_text(seed_text, words):
+    """`words` words of filler chosen deterministically from seed_text."""
+    digest = _digest(seed_text)
+    return " ".join(_WORDS[digest[i % len(digest)] % len(_WORDS)] for i in range(words))
+
+
+def _quiz_text(seed_text, questions=5):
+    lines = []
+    for q in range(1, questions + 1):
+        lines.append(f"{q}. What is {fake_text(seed_text + str(q), 3)}?")
+        answer = _digest(seed_text + str(q))[0] % 4
+        for i, letter in enumerate("abcd"):
+            marker = " *" if i == answer else ""
+            lines.append(f"   {letter}) {fake_text(seed_text + str(q) + letter, 2)}{marker}")
+    return "\n".join(lines)
+
+
+def _flashcards_json(seed_text, cards=5):
+    return json.dumps({"flashcards": [
+        {
+            "subtopic": fake_text(seed_text + f"s{i}", 2),
+            "question": fake_text(seed_text + f"q{i}", 6) + "?",
+            "answer": fake_text(seed_text + f"a{i}", 8) + ".",
+        }
+        for i in range(cards)
+    ]})
+
+
+def document(paragraphs=40, sentences=12):
+    """Long study text made of numbered sentences, for chunking and summaries."""
+    return "\n\n".join(
+        " ".join(f"Paragraph {p} sentence {s} explains a detail of the topic." for s in range(sentences))
+        for p in range(paragraphs)
+    )
+
+
+def _reply_for(prompt, max_tokens=None):
+    if "quiz" in prompt.lower():
+        return _quiz_text(prompt)
+    words = 60 if max_tokens is None else max(1, min(max_tokens // 2, 200))
+    return fake_text(prompt, words)
+
+
+def _usage(messages, content):
+    return SimpleNamespace(
+        prompt_tokens=sum(count_tokens(m["content"]) for m in messages),
+        completion_tokens=count_tokens(content),
+    )
+
+
+class FakeOpenAIClient:
+    """Stands in for AzureOpenAI: chat completions (plain and streamed) and embeddings.
+
+    Counts requests (calls) and the most that ran at once (peak). With
+    usage=False replies carry no token usage, like deployments that leave
+    it out of streams, so callers have to estimate it.
+    """
+
+    def __init__(self, latency=0.0, dim=64, usage=True):
+        self.latency = latency
+        self.dim = dim
+        self.usage = usage
+        self.calls = 0
+        self.active = self.peak = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.embeddings = SimpleNamespace(create=self._embed)
+
+    def _wait(self):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.active -= 1
+
+    def _create(self, model, messages, max_tokens=None, temperature=None, stream=False, **kwargs):
+        self._wait()
+        content = _reply_for(messages[-1]["content"], max_tokens)
+        usage = _usage(messages, content) if self.usage else None
+        if stream:
+            return self._stream(content, usage)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    def _stream(self, content, usage):
+        # Azure starts with a chunk that has no choices
+        yield SimpleNamespace(choices=[], usage=None)
+        for token in content.split(" "):
+            delta = SimpleNamespace(content=token + " ")
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+        yield SimpleNamespace(choices=[], usage=usage)
+
+    def _embed(self, input, model):
+        self._wait()
+        data = []
+        for index, text in enumerate(input):
+            digest = _digest(text)
+            vector = [(digest[i % len(digest)] - 127.5) / 127.5 for i in range(self.dim)]
+            data.append(SimpleNamespace(index=index, embedding=vector))
+        return SimpleNamespace(data=data)
+
+
+class FakeAsyncOpenAIClient:
+    """Stands in for AsyncAzureOpenAI; replies match FakeOpenAIClient's.
+
+    Tracks the requests in flight (in_flight, max_in_flight).
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = self.max_in_flight = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, model, messages, max_tokens=None, temperature=None, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        content = _reply_for(messages[-1]["content"], max_tokens)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message)], usage=_usage(messages, content)
+        )
+
+
+class FakeChatModel:
+    """Stands in for AzureChatOpenAI in the LangChain flashcard chains.
+
+    bind() returns a callable, which LangChain wraps as a runnable when it
+    is piped after a prompt.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._json = False
+
+    def bind(self, response_format=None, **kwargs):
+        bound = FakeChatModel(self.latency)
+        bound._json = bool(response_format)
+        return bound
+
+    def invoke(self, prompt, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        text = prompt.to_string() if hasattr(prompt, "to_string") else str(prompt)
+        content = _flashcards_json(text) if self._json else _reply_for(text)
+        usage = {"prompt_tokens": count_tokens(text), "completion_tokens": count_tokens(content)}
+        return SimpleNamespace(content=content, response_metadata={"token_usage": usage})
+
+    __call__ = invoke
+
+    def stream(self, prompt, *args, **kwargs):
+        for token in self.invoke(prompt).content.split(" "):
+            yield SimpleNamespace(content=token + " ")
+
+
+class FakeTavilyClient:
+    """Stands in for TavilyClient.search with numbered, deterministic results.
+
+    calls lists the (query, max_results) of every search.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = []
+
+    def search(self, query, max_results=5, **kwargs):
+        self.calls.append((query, max_results))
+        if self.latency:
+            time.sleep(self.latency)
+        return self._results(query, max_results)
+
+    def _results(self, query, max_results):
+        slug = hashlib.sha1(query.encode("utf-8")).hexdigest()[:8]
+        return {"query": query, "results": [
+            {
+                "title": f"{fake_text(query + str(i), 4).title()}",
+                "url": f"https://example.com/{slug}/{i}",
+                "content": fake_text(query + f"c{i}", 40),
+                "score": round(1 - i / 10, 2),
+            }
+            for i in range(max_results)
+        ]}
+
+
+class FakeAsyncTavilyClient(FakeTavilyClient):
+    """Stands in for AsyncTavilyClient.search."""
+
+    async def search(self, query, max_results=5, **kwargs):
+        self.calls.append((query, max_results))
+        await asyncio.sleep(self.latency)
+        return self._results(query, max_results)
+
+
+@contextlib.contextmanager
+def fake_backends(cache_dir, latency=0.0):
+    """Point archive.clients at fakes, and the on-disk caches and sessions at cache_dir.
+
+    Yields (openai, llm, tavily). Everything is restored on exit.
+    """
+    import streamlit as st
+
+    import archive.response_cache
+    import archive.search_cache
+    import archive.semantic_cache
+    from archive import clients
+
+    openai, llm, tavily = (
+        FakeOpenAIClient(latency), FakeChatModel(latency), FakeTavilyClient(latency)
+    )
+    patches = [
+        (archive.response_cache, "DEFAULT_CACHE_DIR", cache_dir),
+        (archive.search_cache, "DEFAULT_CACHE_DIR", cache_dir),
+        (archive.semantic_cache, "DEFAULT_CACHE_DIR", cache_dir),
+        (clients, "settings", lambda: {
+            "deployment_name": "gpt", "embedding_deployment_name": None,
+        }),
+        (clients, "openai_client", clients.singleton(lambda: openai)),
+        (clients, "llm_client", clients.singleton(lambda: llm)),
+        (clients, "tavily_client", clients.singleton(lambda: tavily)),
+    ]
+    saved = [(module, name, getattr(module, name)) for module, name, _ in patches]
+    for module, name, value in patches:
+        setattr(module, name, value)
+    saved_db = os.environ.get("APP_SESSION_DB")
+    os.environ["APP_SESSION_DB"] = os.path.join(cache_dir, "sessions.sqlite3")
+    st.cache_resource.clear()
+    try:
+        yield openai, llm, tavily
+    finally:
+        for module, name, value in saved:
+            setattr(module, name, value)
+        if saved_db is None:
+            os.environ.pop("APP_SESSION_DB", None)
+        else:
+            os.environ["APP_SESSION_DB"] = saved_db
+        st.cache_resource.clear()
@@ -0,0 +1,30 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.fakes import fake_backends
+
+_session_dir = None
+
+
+def pytest_configure(config):
+    # Before collection: importing app.py (test_streamlit_app) runs the script,
+    # which opens the session store, so the path has to be set this early
+    global _session_dir
+    _session_dir = tempfile.mkdtemp(prefix="app-sessions-")
+    os.environ["APP_SESSION_DB"] = os.path.join(_session_dir, "sessions.sqlite3")
+
+
+def pytest_unconfigure(config):
+    os.environ.pop("APP_SESSION_DB", None)
+    shutil.rmtree(_session_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def assistant(tmp_path):
+    """The study assistant script with fake API clients"""
+    with fake_backends(str(tmp_path)) as (openai, _, tavily):
+        yield AppTest.from_file("archive/genai_study_assistant.py", default_timeout=30), openai, tavily
@@ -0,0 +1,101 @@
+# Bounded chat history: a ring buffer in memory, older messages spilled to disk
+import json
+import os
+import tempfile
+import uuid
+from collections import deque
+
+DEFAULT_MAX_MESSAGES = 200
+ARCHIVE_DIR = os.path.join(tempfile.gettempdir(), "study_assistant_chats")
+
+
+class ChatHistory:
+    """Chat messages for one session.
+
+    The newest max_messages messages stay in memory. When the buffer is
+    full the oldest message is appended to a JSONL archive instead of being
+    dropped, so window() can page back through the whole conversation.
+    Iteration, len() and indexing only cover the in-memory messages.
+
+    With a session store (core.session_store) every message is also written
+    there, and the store takes the place of the JSONL archive.
+    """
+
+    def __init__(self, max_messages=DEFAULT_MAX_MESSAGES, archive_path=None,
+                 store=None, session_id=None):
+        self._buffer = deque(maxlen=max_messages)
+        self.archive_path = archive_path or os.path.join(ARCHIVE_DIR, f"{uuid.uuid4().hex}.jsonl")
+        # Byte offset of every archived message, so paging can seek directly
+        self._offsets = []
+        self._store = store
+        self.session_id = session_id
+        self._stored_archived = 0
+
+    @classmethod
+    def resume(cls, store, session_id, max_messages=DEFAULT_MAX_MESSAGES):
+        """Reopen a stored history, reading only its newest max_messages."""
+        history = cls(max_messages, store=store, session_id=session_id)
+        total = store.message_count(session_id)
+        history._buffer.extend(store.messages(session_id, max(0, total - max_messages), total))
+        history._stored_archived = total - len(history._buffer)
+        return history
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def __iter__(self):
+        return iter(self._buffer)
+
+    def __getitem__(self, index):
+        return self._buffer[index]
+
+    @property
+    def archived_count(self):
+        return self._stored_archived if self._store is not None else len(self._offsets)
+
+    @property
+    def total_count(self):
+        """Number of messages including the archived ones."""
+        return self.archived_count + len(self._buffer)
+
+    def append(self, message):
+        if self._store is not None:
+            self._store.append_message(self.session_id, self.total_count, message)
+        if len(self._buffer) == self._buffer.maxlen:
+            self._spill(self._buffer[0])
+        self._buffer.append(message)
+
+    def clear(self):
+        self._buffer.clear()
+        self._offsets = []
+        if self._store is not None:
+            self._store.clear_messages(self.session_id)
+            self._stored_archived = 0
+        if os.path.exists(self.archive_path):
+            os.remove(self.archive_path)
+
+    def window(self, count):
+        """Return the newest count messages, oldest first."""
+        count = max(0, min(count, self.total_count))
+        in_memory = list(self._buffer)
+        if count <= len(in_memory):
+            return in_memory[len(in_memory) - count:]
+        return self._read_archive(count - len(in_memory)) + in_memory
+
+    def _spill(self, message):
+        if self._store is not None:
+            self._stored_archived += 1  # already in the store
+            return
+        os.makedirs(os.path.dirname(self.archive_path), exist_ok=True)
+        with open(self.archive_path, "ab") as f:
+            self._offsets.append(f.tell())
+            f.write(json.dumps(message).encode() + b"\n")
+
+    def _read_archive(self, count):
+        """Read the newest count archived messages."""
+        if self._store is not None:
+            end = self._stored_archived
+            return self._store.messages(self.session_id, end - count, end)
+        with open(self.archive_path, "rb") as f:
+            f.seek(self._offsets[-count])
+            return [json.loads(line) for line in f.read().splitlines()]
@@ -0,0 +1,114 @@
+# Memoized Data Generator datasets keyed by (data_points, data_type, seed)
+import threading
+from collections import OrderedDict
+
+from core.datagen import generate_dataset
+from core.downsample import downsample_frame
+from core.export import export_bytes
+
+DEFAULT_MAX_ENTRIES = 16
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class CachedDataset:
+    """A generated frame with its statistics and the chart views and exports
+    built from it so far.
+
+    Entries are shared between sessions, so callers must treat the frame
+    as read-only.
+    """
+
+    __slots__ = ("frame", "mean", "maximum", "minimum", "charts", "exports")
+
+    def __init__(self, frame, data_type):
+        values = frame[data_type].to_numpy()
+        self.frame = frame
+        self.mean = float(values.mean()) if len(values) else 0.0
+        self.maximum = values.max().item() if len(values) else 0
+        self.minimum = values.min().item() if len(values) else 0
+        self.charts = {}
+        self.exports = {}
+
+    @property
+    def nbytes(self):
+        frame_bytes = int(self.frame.memory_usage(index=True).sum())
+        chart_bytes = sum(int(view.memory_usage(index=True).sum()) for view in self.charts.values())
+        return frame_bytes + chart_bytes + sum(len(data) for data in self.exports.values())
+
+
+class DatasetCache:
+    """Thread-safe LRU cache of generated datasets with a byte budget.
+
+    The most recently used entry is never evicted, even if it alone
+    exceeds max_bytes.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        with self._lock:
+            return sum(entry.nbytes for entry in self._entries.values())
+
+    def get(self, data_points, data_type, seed):
+        """Return the cached dataset for the key, generating it on a miss."""
+        key = (data_points, data_type, seed)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Generate outside the lock so other sessions aren't blocked
+        entry = CachedDataset(generate_dataset(data_points, data_type, seed), data_type)
+        with self._lock:
+            # Another session may have generated the same key meanwhile
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            self._evict()
+        return entry
+
+    def get_chart(self, data_points, data_type, seed, chart_type, width_px):
+        """Return the downsampled rows to plot, computing them at most once."""
+        entry = self.get(data_points, data_type, seed)
+        view = entry.charts.get((chart_type, width_px))
+        if view is None:
+            view = downsample_frame(entry.frame, data_type, chart_type, width_px)
+            with self._lock:
+                entry.charts[(chart_type, width_px)] = view
+        return view
+
+    def get_export(self, data_points, data_type, seed, fmt, include_labels=False):
+        """Return the encoded export for the key, building it at most once."""
+        entry = self.get(data_points, data_type, seed)
+        data = entry.exports.get((fmt, include_labels))
+        if data is None:
+            data = export_bytes(entry.frame, data_type, fmt, include_labels=include_labels)
+            with self._lock:
+                entry.exports[(fmt, include_labels)] = data
+                self._evict()
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self):
+        # Caller holds the lock
+        while len(self._entries) > max(self.max_entries, 1):
+            self._entries.popitem(last=False)
+        total = sum(entry.nbytes for entry in self._entries.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            total -= evicted.nbytes
@@ -0,0 +1,108 @@
+# Server-side downsampling so charts get a bounded number of points
+import numpy as np
+
+DEFAULT_CHART_WIDTH = 800
+
+# Chart type -> downsampling method
+CHART_METHODS = {
+    "Line Chart": "lttb",
+    "Area Chart": "lttb",
+    "Bar Chart": "minmax",
+}
+
+
+def lttb_indices(y, threshold):
+    """Pick points with Largest-Triangle-Three-Buckets.
+
+    Args:
+        y: 1-D array of evenly spaced values
+        threshold: Number of points to keep (first and last are always kept)
+
+    Returns:
+        Sorted int64 array of the selected positions
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket edges for the n - 2 points between the fixed first and last one
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = (end + next_end - 1) / 2
+        avg_y = y[end:next_end].mean(dtype=np.float64)
+
+        a_y = float(y[a])
+        bucket_x = np.arange(start, end, dtype=np.float64)
+        bucket_y = y[start:end].astype(np.float64)
+        # Twice the triangle area; the constant factor doesn't change argmax
+        area = np.abs((a - avg_x) * (bucket_y - a_y) - (a - bucket_x) * (avg_y - a_y))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+
+    return indices
+
+
+def minmax_indices(y, n_buckets):
+    """Keep the minimum and maximum of each of n_buckets equal-width buckets.
+
+    Returns:
+        Sorted, de-duplicated int64 array of the selected positions
+    """
+    n = len(y)
+    if n_buckets < 1 or 2 * n_buckets >= n:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)
+    full = n // size
+    body = y[:full * size].reshape(full, size)
+    offsets = np.arange(full, dtype=np.int64) * size
+    picks = [body.argmin(axis=1) + offsets, body.argmax(axis=1) + offsets]
+
+    if full * size < n:
+        tail = y[full * size:]
+        picks.append(np.array([tail.argmin(), tail.argmax()]) + full * size)
+
+    return np.unique(np.concatenate(picks))
+
+
+def target_points(width_px=DEFAULT_CHART_WIDTH):
+    """Number of points worth sending for a chart of the given pixel width.
+
+    One point per pixel: LTTB keeps that many points, min-max bucketing uses
+    half as many buckets since it keeps two points per bucket.
+    """
+    return max(int(width_px), 3)
+
+
+def downsample_frame(frame, column, chart_type, width_px=DEFAULT_CHART_WIDTH):
+    """Return the rows of frame worth plotting for the given chart.
+
+    Args:
+        frame: DataFrame returned by generate_dataset
+        column: Name of the value column
+        chart_type: One of the keys of CHART_METHODS
+        width_px: Rendered chart width in pixels
+
+    Returns:
+        A row subset of frame, or frame itself if it is already small enough
+    """
+    target = target_points(width_px)
+    if len(frame) <= target:
+        return frame
+
+    values = frame[column].to_numpy()
+    if CHART_METHODS[chart_type] == "minmax":
+        indices = minmax_indices(values, target // 2)
+    else:
+        indices = lttb_indices(values, target)
+
+    view = frame.iloc[indices]
+    # Positions are below MAX_DATA_POINTS, so int32 halves the x-axis payload
+    view.index = view.index.astype(np.int32)
+    return view
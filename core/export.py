@@ -0,0 +1,131 @@
+# Chunked export of Data Generator frames to CSV, gzip CSV, Parquet and Arrow IPC
+import gzip
+import io
+
+import pandas as pd
+
+from core.datagen import series_labels, series_unit
+
+# Rows encoded per chunk; bounds the temporary memory used while exporting
+CHUNK_ROWS = 250_000
+
+# Format name -> (file extension, mime type)
+EXPORT_FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "CSV (gzip)": (".csv.gz", "application/gzip"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC": (".arrow", "application/vnd.apache.arrow.file"),
+}
+
+
+def _column_names(frame, data_type, include_labels):
+    return ['Label' if include_labels else series_unit(frame), data_type]
+
+
+def _chunk_columns(chunk, data_type, include_labels):
+    """Key and value columns for a slice of a generated frame."""
+    key = series_labels(chunk).to_numpy() if include_labels else chunk.index.to_numpy()
+    return key, chunk[data_type].to_numpy()
+
+
+def iter_csv_chunks(frame, data_type, chunk_rows=CHUNK_ROWS, include_labels=False):
+    """Yield the CSV export of a generated frame as encoded byte chunks.
+
+    Args:
+        frame: DataFrame returned by generate_dataset
+        data_type: Name of the value column
+        chunk_rows: Number of rows encoded per chunk
+        include_labels: Write 'Day 1'-style labels instead of the integer index
+
+    Yields:
+        UTF-8 encoded CSV bytes, header first
+    """
+    columns = _column_names(frame, data_type, include_labels)
+    yield (",".join(columns) + "\n").encode()
+    for start in range(0, len(frame), chunk_rows):
+        key, values = _chunk_columns(frame.iloc[start:start + chunk_rows], data_type, include_labels)
+        chunk = pd.DataFrame({columns[0]: key, columns[1]: values})
+        yield chunk.to_csv(index=False, header=False).encode()
+
+
+def _iter_record_batches(frame, data_type, chunk_rows, include_labels, schema):
+    import pyarrow as pa
+
+    for start in range(0, len(frame), chunk_rows):
+        key, values = _chunk_columns(frame.iloc[start:start + chunk_rows], data_type, include_labels)
+        yield pa.record_batch([pa.array(key), pa.array(values)], schema=schema)
+
+
+def _arrow_schema(frame, data_type, include_labels):
+    import pyarrow as pa
+
+    key_name, value_name = _column_names(frame, data_type, include_labels)
+    key_type = pa.string() if include_labels else pa.from_numpy_dtype(frame.index.dtype)
+    return pa.schema([
+        (key_name, key_type),
+        (value_name, pa.from_numpy_dtype(frame[data_type].dtype)),
+    ])
+
+
+def write_export(frame, data_type, fmt, fileobj, chunk_rows=CHUNK_ROWS, include_labels=False):
+    """Stream a generated frame into a binary file object.
+
+    Args:
+        frame: DataFrame returned by generate_dataset
+        data_type: Name of the value column
+        fmt: One of the keys of EXPORT_FORMATS
+        fileobj: Writable binary file object
+        chunk_rows: Number of rows encoded per chunk
+        include_labels: Write 'Day 1'-style labels instead of the integer index
+    """
+    if fmt == "CSV":
+        for chunk in iter_csv_chunks(frame, data_type, chunk_rows, include_labels):
+            fileobj.write(chunk)
+    elif fmt == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=6) as gz:
+            for chunk in iter_csv_chunks(frame, data_type, chunk_rows, include_labels):
+                gz.write(chunk)
+    elif fmt == "Parquet":
+        import pyarrow.parquet as pq
+
+        schema = _arrow_schema(frame, data_type, include_labels)
+        with pq.ParquetWriter(fileobj, schema) as writer:
+            for batch in _iter_record_batches(frame, data_type, chunk_rows, include_labels, schema):
+                writer.write_batch(batch)
+    elif fmt == "Arrow IPC":
+        import pyarrow as pa
+
+        schema = _arrow_schema(frame, data_type, include_labels)
+        with pa.ipc.new_file(fileobj, schema) as writer:
+            for batch in _iter_record_batches(frame, data_type, chunk_rows, include_labels, schema):
+                writer.write_batch(batch)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+
+def export_bytes(frame, data_type, fmt, chunk_rows=CHUNK_ROWS, include_labels=False):
+    """Return the encoded export of a generated frame.
+
+    Only the encoded output is held in full; intermediate strings are built
+    one chunk at a time.
+    """
+    buffer = io.BytesIO()
+    write_export(frame, data_type, fmt, buffer, chunk_rows, include_labels)
+    return buffer.getvalue()
+
+
+def generate_csv_from_data(data, data_type):
+    """Generate CSV string from data dictionary.
+
+    Args:
+        data: Dictionary with labels as keys and values, or a DataFrame
+            returned by generate_dataset
+        data_type: String representing the type of data (e.g., 'Sales', 'Temperature')
+
+    Returns:
+        CSV string representation of the data
+    """
+    if isinstance(data, pd.DataFrame):
+        return export_bytes(data, data_type, "CSV", include_labels=True).decode()
+    df = pd.DataFrame(list(data.items()), columns=['Label', data_type])
+    return df.to_csv(index=False)
@@ -0,0 +1,33 @@
+# Page registry: each page lives in its own module, imported on first visit
+import importlib
+from typing import NamedTuple
+
+
+class PageContext(NamedTuple):
+    """Sidebar values the pages need."""
+    name: str
+    show_advanced: bool
+    auto_refresh: bool
+
+
+# Page name -> module with a render(ctx) function
+PAGES = {
+    "Home": "views.home",
+    "Data Generator": "views.data_generator",
+    "Mini Games": "views.mini_games",
+    "Chat System": "views.chat_system",
+    "Quiz": "views.quiz",
+    "Settings": "views.settings",
+}
+
+LANDING_PAGE = "views.landing"
+
+
+def load_page(module_name):
+    """Import a page module; later calls return the already imported module."""
+    return importlib.import_module(module_name)
+
+
+def render_page(page, ctx):
+    """Render a registered page by name."""
+    load_page(PAGES[page]).render(ctx)
@@ -0,0 +1,190 @@
+# Opt-in per-section profiling of app.py reruns, kept per session
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import deque
+
+DEFAULT_HISTORY = 100
+
+# Metrics recorded per section: wall ms, CPU ms of the script thread, and the
+# net and peak KiB allocated while it ran (tracemalloc). The peak is exact
+# while one session profiles; tracemalloc's peak is process-wide, so with
+# several sessions profiling it is an upper bound
+METRICS = ("wall_ms", "cpu_ms", "alloc_kib", "peak_kib")
+
+# tracemalloc is process-wide; it runs while any session is profiling
+_tracemalloc_users = 0
+_tracemalloc_lock = threading.Lock()
+
+
+def _acquire_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracemalloc_users += 1
+
+
+def _release_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users = max(0, _tracemalloc_users - 1)
+        if _tracemalloc_users == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def percentile(values, q):
+    """Nearest-rank percentile (q in 0-100) of a non-empty sequence."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+class _NoopSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SECTION = _NoopSection()
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "_wall", "_cpu", "_memory")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self._memory = tracemalloc.get_traced_memory()[0]
+        # Resetting the peak would corrupt the sections other sessions are in
+        if _tracemalloc_users == 1:
+            tracemalloc.reset_peak()
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        current, peak = tracemalloc.get_traced_memory()
+        self.profiler._record(self.name, (
+            wall * 1000,
+            cpu * 1000,
+            (current - self._memory) / 1024,
+            max(0, peak - self._memory) / 1024,
+        ))
+        # st.rerun() and st.stop() end a rerun early; what ran is still kept
+        return False
+
+
+class RerunProfiler:
+    """Times the sections of each rerun for one session.
+
+    Off until enable() is called; while off, section() is a shared no-op.
+    The newest `history` reruns are kept, each as {section: metrics}, with
+    metrics in the order of METRICS. A rerun cut short by st.rerun() keeps
+    the sections that ran.
+    """
+
+    def __init__(self, history=DEFAULT_HISTORY):
+        self.enabled = False
+        self.history = deque(maxlen=history)
+        self._current = None
+        self._release = None
+
+    def enable(self):
+        if not self.enabled:
+            _acquire_tracemalloc()
+            # A session that ends while profiling still releases tracemalloc
+            self._release = weakref.finalize(self, _release_tracemalloc)
+            self.enabled = True
+
+    def disable(self):
+        if self.enabled:
+            self._current = None
+            self._release()
+            self.enabled = False
+
+    def start_rerun(self):
+        """Begin a rerun's record, storing an unfinished previous one."""
+        self._finish()
+        if self.enabled:
+            self._current = {}
+
+    def end_rerun(self):
+        self._finish()
+
+    def section(self, name):
+        """Context manager timing one section of the current rerun.
+
+        Sections run one after another; nesting them skews the peak memory.
+        """
+        if self._current is None:
+            return _NOOP_SECTION
+        return _Section(self, name)
+
+    def clear(self):
+        self.history.clear()
+
+    def sections(self):
+        """Section names in the order they first ran."""
+        names = {}
+        for rerun in self.history:
+            names.update(dict.fromkeys(rerun))
+        return list(names)
+
+    def series(self, name, metric="wall_ms"):
+        """One metric of a section over the kept reruns, oldest first."""
+        index = METRICS.index(metric)
+        return [rerun[name][index] for rerun in self.history if name in rerun]
+
+    def totals(self, metric="wall_ms"):
+        """One metric summed over each rerun's sections (peak_kib: the largest)."""
+        index = METRICS.index(metric)
+        if metric == "peak_kib":
+            return [max(values[index] for values in rerun.values()) for rerun in self.history]
+        return [sum(values[index] for values in rerun.values()) for rerun in self.history]
+
+    def summary(self):
+        """p50/p95 of each metric per section, plus the rerun total."""
+        if not self.history:
+            return []
+        rows = []
+        for name in self.sections() + ["total"]:
+            row = {"section": name}
+            for metric in METRICS:
+                values = (self.totals(metric) if name == "total"
+                          else self.series(name, metric))
+                row[f"{metric}_p50"] = round(percentile(values, 50), 2)
+                row[f"{metric}_p95"] = round(percentile(values, 95), 2)
+            row["reruns"] = len(values)
+            rows.append(row)
+        return rows
+
+    def to_dict(self):
+        """Summary and raw history, for export."""
+        return {
+            "metrics": list(METRICS),
+            "summary": self.summary(),
+            "history": [
+                {name: dict(zip(METRICS, (round(v, 3) for v in values)))
+                 for name, values in rerun.items()}
+                for rerun in self.history
+            ],
+        }
+
+    def _record(self, name, metrics):
+        if self._current is not None:
+            self._current[name] = metrics
+
+    def _finish(self):
+        if self._current:
+            self.history.append(self._current)
+        self._current = None
@@ -0,0 +1,222 @@
+# Question bank for the Quiz page: array-backed, indexed by topic and difficulty
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+
+_INITIAL_CAPACITY = 64
+
+
+class Question(NamedTuple):
+    text: str
+    options: tuple
+    answer: int
+    topic: str
+    difficulty: str
+
+
+# (text, options, answer index, topic, difficulty)
+DEFAULT_QUESTIONS = [
+    ("What is 15 + 27?", ("40", "42", "45", "48"), 1, "Math", "Easy"),
+    ("How many sides does a hexagon have?", ("5", "6", "7", "8"), 1, "Math", "Easy"),
+    ("What is 12 × 12?", ("124", "144", "132", "154"), 1, "Math", "Medium"),
+    ("What is the square root of 169?", ("11", "12", "13", "14"), 2, "Math", "Medium"),
+    ("What is 2 to the power of 10?", ("512", "1000", "1024", "2048"), 2, "Math", "Hard"),
+    ("Which planet is closest to the Sun?", ("Venus", "Mercury", "Earth", "Mars"), 1, "Science", "Easy"),
+    ("What gas do plants absorb from the air?", ("Oxygen", "Nitrogen", "Carbon dioxide", "Helium"), 2, "Science", "Easy"),
+    ("What is the chemical symbol for gold?", ("Ag", "Au", "Gd", "Go"), 1, "Science", "Medium"),
+    ("Which organelle produces most of a cell's energy?", ("Nucleus", "Ribosome", "Mitochondrion", "Golgi body"), 2, "Science", "Medium"),
+    ("What particle has no electric charge?", ("Proton", "Electron", "Neutron", "Positron"), 2, "Science", "Hard"),
+    ("What is the capital of France?", ("London", "Berlin", "Paris", "Madrid"), 2, "Geography", "Easy"),
+    ("Which is the largest ocean?", ("Atlantic", "Indian", "Arctic", "Pacific"), 3, "Geography", "Easy"),
+    ("What is the capital of Australia?", ("Sydney", "Melbourne", "Canberra", "Perth"), 2, "Geography", "Medium"),
+    ("Which river flows through Budapest?", ("Rhine", "Danube", "Elbe", "Vistula"), 1, "Geography", "Hard"),
+]
+
+
+class QuestionBank:
+    """Questions stored column-wise in slots.
+
+    Answer indices, topic codes and difficulties live in numpy arrays, so
+    grading a quiz is one vectorized comparison. Slots are also indexed by
+    (topic, difficulty), so selecting a pool never scans the whole bank.
+    """
+
+    __slots__ = ("_texts", "_options", "_answers", "_topics", "_difficulties",
+                 "_topic_names", "_topic_codes", "_index")
+
+    def __init__(self):
+        self._texts = []
+        self._options = []
+        self._answers = np.empty(_INITIAL_CAPACITY, dtype=np.int8)
+        self._topics = np.empty(_INITIAL_CAPACITY, dtype=np.int32)
+        self._difficulties = np.empty(_INITIAL_CAPACITY, dtype=np.int8)
+        self._topic_names = []
+        self._topic_codes = {}
+        # (topic code, difficulty code) -> slots
+        self._index = {}
+
+    def __len__(self):
+        return len(self._texts)
+
+    @property
+    def topics(self):
+        return list(self._topic_names)
+
+    def add(self, text, options, answer, topic, difficulty="Medium"):
+        """Store one question and return its slot."""
+        options = tuple(options)
+        if not 0 <= answer < len(options):
+            raise ValueError(f"Answer index {answer} is out of range for {len(options)} options")
+        level = DIFFICULTIES.index(difficulty)
+        code = self._topic_codes.get(topic)
+        if code is None:
+            code = self._topic_codes[topic] = len(self._topic_names)
+            self._topic_names.append(topic)
+
+        slot = len(self._texts)
+        if slot == len(self._answers):
+            self._grow()
+        self._texts.append(text)
+        self._options.append(options)
+        self._answers[slot] = answer
+        self._topics[slot] = code
+        self._difficulties[slot] = level
+        self._index.setdefault((code, level), []).append(slot)
+        return slot
+
+    def add_many(self, questions):
+        """Store (text, options, answer, topic, difficulty) tuples; return their slots."""
+        return [self.add(*question) for question in questions]
+
+    def import_quiz(self, text, topic, difficulty="Medium"):
+        """Parse generate_quiz output and store its questions.
+
+        Returns:
+            Number of questions added; ones without a marked answer are skipped
+        """
+        parsed = parse_quiz(text)
+        self.add_many((q, options, answer, topic, difficulty) for q, options, answer in parsed)
+        return len(parsed)
+
+    def question(self, slot):
+        return Question(
+            self._texts[slot],
+            self._options[slot],
+            int(self._answers[slot]),
+            self._topic_names[self._topics[slot]],
+            DIFFICULTIES[self._difficulties[slot]],
+        )
+
+    def slots(self, topic=None, difficulty=None):
+        """Slots of the questions matching topic and difficulty (None matches all)."""
+        codes = range(len(self._topic_names)) if topic is None else [self._topic_codes.get(topic)]
+        levels = range(len(DIFFICULTIES)) if difficulty is None else [DIFFICULTIES.index(difficulty)]
+        pools = [self._index.get((code, level), ()) for code in codes for level in levels]
+        return np.fromiter(
+            (slot for pool in pools for slot in pool),
+            dtype=np.int64,
+            count=sum(len(pool) for pool in pools),
+        )
+
+    def grade(self, slots, chosen):
+        """Count the chosen option indices that match the answers for slots."""
+        return int(np.count_nonzero(self._answers[np.asarray(slots)] == np.asarray(chosen)))
+
+    def _grow(self):
+        capacity = 2 * len(self._answers)
+        for name in ("_answers", "_topics", "_difficulties"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+
+def default_bank():
+    bank = QuestionBank()
+    bank.add_many(DEFAULT_QUESTIONS)
+    return bank
+
+
+class Deck:
+    """Draws slots at random without replacement, O(1) per draw.
+
+    A partial Fisher-Yates shuffle: each draw swaps a random remaining slot
+    into place, so nothing is reshuffled or rebuilt between draws.
+    """
+
+    __slots__ = ("_slots", "_drawn", "_rng")
+
+    def __init__(self, slots, seed=None):
+        self._slots = np.array(slots, dtype=np.int64)
+        self._drawn = 0
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return len(self._slots)
+
+    @property
+    def remaining(self):
+        return len(self._slots) - self._drawn
+
+    def draw(self, count):
+        """Return up to count slots not drawn since the last reset()."""
+        count = min(count, self.remaining)
+        start = self._drawn
+        for i in range(start, start + count):
+            j = self._rng.integers(i, len(self._slots))
+            self._slots[i], self._slots[j] = self._slots[j], self._slots[i]
+        self._drawn += count
+        return self._slots[start:self._drawn].copy()
+
+    def reset(self):
+        """Make every slot available again."""
+        self._drawn = 0
+
+
+_QUESTION = re.compile(r"^\s*(?:\*\*)?(?:Q(?:uestion)?\s*)?\d+[.):]\s*(?:\*\*)?\s*(.+?)(?:\*\*)?\s*$")
+_OPTION = re.compile(r"^\s*[-*]?\s*\(?([a-hA-H])[.)]\s*(.+?)\s*$")
+_ANSWER = re.compile(r"^\s*(?:\*\*)?(?:Correct\s+)?Answer(?:\*\*)?\s*[:\-]\s*(?:\*\*)?\(?([a-hA-H])\b")
+_MARKER = re.compile(r"\s*(?:\*|\(correct\)|✓|✅)\s*$", re.IGNORECASE)
+
+
+def parse_quiz(text):
+    """Parse multiple-choice questions from generate_quiz output.
+
+    Understands numbered questions with lettered options, the correct one
+    marked with a trailing "*" (as in the README example) or given on an
+    "Answer: b" line.
+
+    Returns:
+        List of (question, options, answer index) tuples
+    """
+    parsed = []
+    question, options, answer = None, [], None
+
+    def finish():
+        if question and len(options) >= 2 and answer is not None and answer < len(options):
+            parsed.append((question, tuple(options), answer))
+
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        answer_match = _ANSWER.match(line)
+        if answer_match and question:
+            answer = "abcdefgh".index(answer_match.group(1).lower())
+            continue
+        option_match = _OPTION.match(line)
+        if option_match and question:
+            option = option_match.group(2)
+            if _MARKER.search(option):
+                option = _MARKER.sub("", option)
+                answer = len(options)
+            options.append(option)
+            continue
+        question_match = _QUESTION.match(line)
+        if question_match:
+            finish()
+            question, options, answer = question_match.group(1), [], None
+    finish()
+    return parsed
@@ -0,0 +1,265 @@
+# Durable session state: incremental writes to SQLite (WAL), batched off the script thread
+import atexit
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+import uuid
+
+from core.chat_history import DEFAULT_MAX_MESSAGES, ChatHistory
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "streamlit_app", "sessions.sqlite3")
+
+
+def default_path():
+    """APP_SESSION_DB if set, else DEFAULT_PATH; read when a store is opened."""
+    return os.getenv("APP_SESSION_DB") or DEFAULT_PATH
+
+# Sessions not written to for this long are deleted when a store is opened
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+
+# Writes queued within this many seconds of each other share a transaction
+BATCH_DELAY = 0.05
+BATCH_SIZE = 500
+
+_SESSION_ID = re.compile(r"^[0-9a-f]{32}$")
+_STOP = object()
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS sessions ("
+    " id TEXT PRIMARY KEY,"
+    " updated_at REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS session_values ("
+    " session_id TEXT NOT NULL,"
+    " key TEXT NOT NULL,"
+    " value TEXT NOT NULL,"
+    " PRIMARY KEY (session_id, key)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS messages ("
+    " session_id TEXT NOT NULL,"
+    " seq INTEGER NOT NULL,"
+    " message TEXT NOT NULL,"
+    " PRIMARY KEY (session_id, seq)) WITHOUT ROWID",
+)
+
+_TOUCH = (
+    "INSERT INTO sessions (id, updated_at) VALUES (?, ?)"
+    " ON CONFLICT (id) DO UPDATE SET updated_at = excluded.updated_at"
+)
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # With WAL, NORMAL only risks the last transactions on power loss
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SessionStore:
+    """Session values and chat messages in SQLite, written in the background.
+
+    Writes are queued and a writer thread commits them in batches, so the
+    script thread never waits on disk. Values are stored per key and
+    messages one row each, so a rerun only writes what changed. Reads go
+    through a separate connection; WAL lets them run while a batch commits.
+
+    Args:
+        path: Database file
+        max_age: Seconds after which an untouched session is deleted
+    """
+
+    def __init__(self, path=None, max_age=DEFAULT_MAX_AGE):
+        if path is None:
+            path = default_path()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.write_errors = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._conn = _connect(path)
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+        self._prune(time.time() - max_age)
+
+        self._queue = queue.Queue()
+        # session id -> queued writes not yet committed
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name="session-store", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    # Writes (queued)
+
+    def set_values(self, session_id, values):
+        """Store JSON-serializable values by key, replacing earlier ones."""
+        now = time.time()
+        self._put(session_id, [(_TOUCH, (session_id, now))] + [
+            ("INSERT OR REPLACE INTO session_values (session_id, key, value) VALUES (?, ?, ?)",
+             (session_id, key, json.dumps(value)))
+            for key, value in values.items()
+        ])
+
+    def append_message(self, session_id, seq, message):
+        """Store a chat message as number seq (0-based) of the session."""
+        self._put(session_id, [
+            (_TOUCH, (session_id, time.time())),
+            ("INSERT OR REPLACE INTO messages (session_id, seq, message) VALUES (?, ?, ?)",
+             (session_id, seq, json.dumps(message))),
+        ])
+
+    def clear_messages(self, session_id):
+        self._put(session_id, [("DELETE FROM messages WHERE session_id = ?", (session_id,))])
+
+    def delete_session(self, session_id):
+        self._put(session_id, [
+            ("DELETE FROM messages WHERE session_id = ?", (session_id,)),
+            ("DELETE FROM session_values WHERE session_id = ?", (session_id,)),
+            ("DELETE FROM sessions WHERE id = ?", (session_id,)),
+        ])
+
+    def flush(self):
+        """Wait until every queued write is committed."""
+        if self._writer.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Commit queued writes and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    # Reads (see every write the same session queued before them)
+
+    def values(self, session_id):
+        self._wait_for(session_id)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM session_values WHERE session_id = ?", (session_id,)
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def message_count(self, session_id):
+        self._wait_for(session_id)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(seq) FROM messages WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return 0 if row[0] is None else row[0] + 1
+
+    def messages(self, session_id, start, stop):
+        """Messages numbered start to stop - 1, oldest first."""
+        self._wait_for(session_id)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT message FROM messages WHERE session_id = ? AND seq >= ? AND seq < ?"
+                " ORDER BY seq",
+                (session_id, start, stop),
+            ).fetchall()
+        return [json.loads(message) for message, in rows]
+
+    def _put(self, session_id, statements):
+        with self._pending_lock:
+            self._pending[session_id] = self._pending.get(session_id, 0) + 1
+        self._queue.put((session_id, statements))
+
+    def _wait_for(self, session_id):
+        """Wait until this session's queued writes are committed.
+
+        Writes from other sessions queued later aren't waited for, so a
+        resume can't be held up by a busy queue.
+        """
+        with self._pending_lock:
+            if not self._pending.get(session_id) or not self._writer.is_alive():
+                return
+            committed = threading.Event()
+            self._queue.put(committed)
+        committed.wait()
+
+    def _prune(self, cutoff):
+        with self._lock, self._conn:
+            stale = "SELECT id FROM sessions WHERE updated_at < ?"
+            self._conn.execute(f"DELETE FROM messages WHERE session_id IN ({stale})", (cutoff,))
+            self._conn.execute(
+                f"DELETE FROM session_values WHERE session_id IN ({stale})", (cutoff,)
+            )
+            self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (cutoff,))
+
+    def _write_loop(self):
+        conn = _connect(self.path)
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + BATCH_DELAY
+            # A reader waiting on the batch (an Event) cuts the delay short
+            while (len(batch) < BATCH_SIZE and batch[-1] is not _STOP
+                   and not isinstance(batch[-1], threading.Event)):
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            stopping = batch[-1] is _STOP
+            writes = [item for item in batch if isinstance(item, tuple)]
+            try:
+                with conn:
+                    for _, statements in writes:
+                        for sql, params in statements:
+                            conn.execute(sql, params)
+            except sqlite3.Error as exc:
+                # The batch is lost; the session keeps working from memory
+                self.write_errors += 1
+                self.last_error = exc
+            finally:
+                with self._pending_lock:
+                    for session_id, _ in writes:
+                        self._pending[session_id] -= 1
+                        if not self._pending[session_id]:
+                            del self._pending[session_id]
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+                    self._queue.task_done()
+        conn.close()
+
+
+class StoredSession:
+    """One browser session's state in a SessionStore.
+
+    The id travels in the URL, so reopening the link after a server restart
+    resumes the session. save() only writes values that changed since they
+    were last loaded or saved.
+    """
+
+    def __init__(self, store, session_id=None):
+        self.store = store
+        valid = session_id is not None and _SESSION_ID.match(session_id)
+        self.session_id = session_id if valid else uuid.uuid4().hex
+        self._saved = {}
+
+    def load(self):
+        """The session's stored values ({} for a new session)."""
+        values = self.store.values(self.session_id)
+        self._saved = {key: json.dumps(value, sort_keys=True) for key, value in values.items()}
+        return values
+
+    def save(self, **values):
+        changed = {}
+        for key, value in values.items():
+            encoded = json.dumps(value, sort_keys=True)
+            if self._saved.get(key) != encoded:
+                self._saved[key] = encoded
+                changed[key] = value
+        if changed:
+            self.store.set_values(self.session_id, changed)
+
+    def history(self, max_messages=DEFAULT_MAX_MESSAGES):
+        """The chat history, with only the newest max_messages loaded."""
+        return ChatHistory.resume(self.store, self.session_id, max_messages)
+
+    def delete(self):
+        self.store.delete_session(self.session_id)
+        self._saved = {}
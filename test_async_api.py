@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+
+from archive import tracing
+from archive.async_api import (
+    configure_limits, generate_quiz_async, run_sync, search_internet_async, summarize_text_async,
+)
+from archive.search import search_internet
+from archive.search_cache import SearchCache
+from archive.summary import summarize_text
+from benchmarks.fakes import (
+    FakeAsyncOpenAIClient, FakeAsyncTavilyClient, FakeOpenAIClient, FakeTavilyClient,
+)
+
+
+class TestAsyncApi:
+    """Test suite for the async helpers and the provider limiter"""
+
+    def test_async_matches_sync_request(self):
+        """Test that the async summary sends the same request as the sync one"""
+        sync_result = summarize_text("Osmosis", FakeOpenAIClient(), "gpt")
+        async_result = run_sync(summarize_text_async("Osmosis", FakeAsyncOpenAIClient(), "gpt"))
+
+        assert async_result == sync_result, "Both should send the same prompt"
+
+        print("✅ Async summary test passed")
+
+    def test_limiter_caps_in_flight_requests(self):
+        """Test that concurrent calls never exceed the provider limit"""
+        configure_limits(openai=3)
+        try:
+            client = FakeAsyncOpenAIClient(latency=0.05)
+
+            async def many():
+                return await asyncio.gather(*(
+                    generate_quiz_async(f"topic {i}", client, "gpt") for i in range(12)
+                ))
+
+            results = run_sync(many())
+        finally:
+            configure_limits(openai=16)
+
+        assert len(results) == 12, "Every call should complete"
+        assert client.max_in_flight == 3, f"Expected 3 in flight, saw {client.max_in_flight}"
+
+        print("✅ Provider limiter test passed")
+
+    def test_async_search_shares_cache_and_spans(self):
+        """Test that async searches hit the sync cache and are traced like sync ones"""
+        cache, client = SearchCache(":memory:"), FakeAsyncTavilyClient()
+        spans = []
+        tracing.configure(exporters=[SimpleNamespace(export=spans.append, flush=lambda: None)])
+        try:
+            first = run_sync(search_internet_async("Osmosis", client, cache=cache))
+            again = search_internet("osmosis ", FakeTavilyClient(), cache=cache)
+        finally:
+            tracing.tracer.disable()
+
+        assert len(client.calls) == 1 and again == first, "The sync search should reuse the async result"
+        searches = [span.attributes.get("cache_hit") for span in spans if span.name == "tavily.search"]
+        assert searches == [False, True]
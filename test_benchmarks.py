@@ -0,0 +1,70 @@
+import pytest
+
+from benchmarks import bench_suite
+from benchmarks.fakes import FakeOpenAIClient, FakeTavilyClient, fake_backends
+
+
+class TestFakes:
+    """Test suite for the offline API fakes"""
+
+    def test_replies_are_deterministic(self):
+        """Test that the same request always gets the same reply"""
+        messages = [{"role": "user", "content": "Summarize photosynthesis"}]
+        first = FakeOpenAIClient()._create("gpt", messages, max_tokens=100)
+        second = FakeOpenAIClient()._create("gpt", messages, max_tokens=100)
+        assert first.choices[0].message.content == second.choices[0].message.content
+        assert first.usage.completion_tokens > 0
+
+        streamed = FakeOpenAIClient()._create("gpt", messages, max_tokens=100, stream=True)
+        text = "".join(c.choices[0].delta.content for c in streamed if c.choices)
+        assert text.strip() == first.choices[0].message.content
+
+        assert FakeTavilyClient().search("cells", 3) == FakeTavilyClient().search("cells", 3)
+
+    def test_backends_are_restored(self, tmp_path):
+        """Test that fake_backends puts the real clients back"""
+        from archive import clients
+
+        original = clients.openai_client
+        with fake_backends(str(tmp_path)) as (openai, _, _):
+            assert clients.openai_client() is openai
+        assert clients.openai_client is original
+
+
+class TestBenchSuite:
+    """Test suite for the benchmark runner and regression check"""
+
+    def test_compare(self):
+        """Test the threshold, the minimum delta and new cases"""
+        baseline = {"a[1]": {"median_ms": 100.0}, "b[1]": {"median_ms": 1.0}}
+        results = {
+            "a[1]": {"median_ms": 160.0},
+            "b[1]": {"median_ms": 3.0},  # 3x slower, but only by 2 ms
+            "c[1]": {"median_ms": 5.0},
+        }
+        rows = bench_suite.compare(results, baseline, threshold=1.5, min_delta_ms=5)
+        assert [row[3] for row in rows] == ["regressed", "ok", "new"]
+        assert bench_suite.compare(results, baseline, threshold=2.0)[0][3] == "ok"
+
+    def test_baseline_per_latency(self):
+        """Test that runs with a simulated latency get their own baseline file"""
+        assert bench_suite.baseline_path(0.0) == bench_suite.BASELINE_PATH
+        assert bench_suite.baseline_path(200.0).endswith("baseline-200ms.json")
+        assert bench_suite.baseline_path(200.0) != bench_suite.baseline_path(50.0)
+
+    def test_measure_uses_reported_duration(self):
+        """Test that a run() reporting its own time is measured by it"""
+        calls = []
+        durations = bench_suite.measure(lambda: calls.append(1) or 0.25, repeat=3)
+        assert len(calls) == 4, "One warmup call plus the timed ones"
+        assert durations == [250.0] * 3
+
+    @pytest.mark.parametrize("name, size", [("csv_export", 100), ("assistant_quiz", 50)])
+    def test_benchmarks_run(self, tmp_path, name, size):
+        """Test that benchmarks run offline against the fakes"""
+        fn = bench_suite.BENCHMARKS[name][0]
+        with fake_backends(str(tmp_path)) as (openai, _, _):
+            run = fn(size, {"cache_dir": str(tmp_path), "latency": 0.0})
+            assert len(bench_suite.measure(run, repeat=1)) == 1
+        if name == "assistant_quiz":
+            assert openai.calls == 2, "Each submission should reach the fake client once"
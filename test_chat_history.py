@@ -0,0 +1,47 @@
+from core.chat_history import ChatHistory
+
+
+def _message(i):
+    return {"role": "user" if i % 2 else "assistant", "content": f"message {i}"}
+
+
+class TestChatHistory:
+    """Test suite for the bounded, disk-spilling chat history"""
+
+    def test_buffer_is_bounded(self, tmp_path):
+        """Test that only max_messages stay in memory"""
+        history = ChatHistory(max_messages=5, archive_path=str(tmp_path / "chat.jsonl"))
+        for i in range(12):
+            history.append(_message(i))
+
+        assert len(history) == 5, "Ring buffer should hold max_messages"
+        assert history.archived_count == 7, "Older messages should be archived"
+        assert history.total_count == 12, "Total count should include archived messages"
+        assert history[-1]["content"] == "message 11", "Newest message should be last"
+
+        print("✅ Chat history bound test passed")
+
+    def test_window_pages_into_archive(self, tmp_path):
+        """Test that windows larger than the buffer read from the archive"""
+        history = ChatHistory(max_messages=4, archive_path=str(tmp_path / "chat.jsonl"))
+        for i in range(10):
+            history.append(_message(i))
+
+        assert [m["content"] for m in history.window(3)] == ["message 7", "message 8", "message 9"]
+        assert history.window(10) == [_message(i) for i in range(10)], "Full window should be in order"
+        assert len(history.window(50)) == 10, "Window should stop at the first message"
+        assert history.window(0) == [], "Empty window should return no messages"
+
+        print("✅ Chat history window test passed")
+
+    def test_clear_removes_archive(self, tmp_path):
+        """Test that clearing drops both memory and archive"""
+        path = tmp_path / "chat.jsonl"
+        history = ChatHistory(max_messages=2, archive_path=str(path))
+        for i in range(5):
+            history.append(_message(i))
+        assert path.exists(), "Archive should be created on spill"
+
+        history.clear()
+        assert history.total_count == 0, "History should be empty after clear"
+        assert not path.exists(), "Archive file should be removed"
@@ -0,0 +1,130 @@
+import time
+
+import pytest
+from archive.chunking import split_text
+from archive.executor import MAX_WORKERS
+from archive.summary import summarize_long_text
+from archive.tokens import count_tokens
+from archive.usage import count_prompt_tokens, plan_max_tokens
+from benchmarks.fakes import FakeOpenAIClient, document
+
+
+class TestSplitText:
+    """Test suite for the token-aware splitter"""
+
+    def test_chunks_respect_limit_and_boundaries(self):
+        """Test that chunks fit the budget and end on paragraph/sentence boundaries"""
+        chunks = split_text(document(), max_tokens=500, overlap_tokens=50)
+        assert len(chunks) > 1
+        assert all(count_tokens(chunk) <= 500 + 10 for chunk in chunks), "Chunk over budget"
+        assert all(chunk.endswith(".") for chunk in chunks), "Chunks should end on a sentence"
+
+        print("✅ Text splitting test passed")
+
+    def test_overlap_repeats_the_previous_tail(self):
+        """Test that each chunk starts with the end of the previous one"""
+        chunks = split_text(document(sentences=2), max_tokens=200, overlap_tokens=60)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            first_paragraph = chunk.split("\n\n")[0]
+            assert first_paragraph in previous, "Overlap should come from the previous chunk"
+
+    def test_overlap_splits_long_paragraphs(self):
+        """Test that paragraphs longer than the overlap still carry their last sentences"""
+        chunks = split_text(document(paragraphs=12, sentences=40), max_tokens=1000, overlap_tokens=100)
+        assert len(chunks) > 1
+        for previous, chunk in zip(chunks, chunks[1:]):
+            carried = chunk.split("\n\n")[0]
+            assert 0 < count_tokens(carried) <= 100
+            assert previous.endswith(carried), "Next chunk should start with the previous tail"
+            assert carried.endswith("."), "Overlap should be whole sentences"
+
+        run_on = split_text("word " * 2000, max_tokens=300, overlap_tokens=50)
+        for previous, chunk in zip(run_on, run_on[1:]):
+            carried = chunk.split("\n\n")[0]
+            assert carried and previous.endswith(carried), "Run-on text should overlap on words"
+
+    def test_long_sentences_and_edge_cases(self):
+        """Test word-level fallback, blank text and invalid overlap"""
+        chunks = split_text("word " * 2000, max_tokens=100, overlap_tokens=0)
+        assert all(count_tokens(chunk) <= 100 for chunk in chunks)
+        assert split_text("   \n\n  ") == []
+        with pytest.raises(ValueError):
+            split_text("text", max_tokens=100, overlap_tokens=100)
+
+
+class TestLongSummaries:
+    """Test suite for map-reduce summarization"""
+
+    def test_short_text_is_one_request(self):
+        """Test that text fitting in one chunk is summarized directly"""
+        client = FakeOpenAIClient()
+        summary = summarize_long_text("Plants make sugar from light.", client, "gpt")
+        assert client.calls == 1 and summary
+
+    def test_chunks_run_in_parallel_with_progress(self):
+        """Test that chunk summaries run concurrently and report progress"""
+        client = FakeOpenAIClient(latency=0.2)
+        progress = []
+        start = time.perf_counter()
+        summarize_long_text(
+            document(), client, "gpt", chunk_tokens=1000, overlap_tokens=100,
+            chunk_summary_tokens=40, on_progress=lambda done, total: progress.append((done, total)),
+        )
+        elapsed = time.perf_counter() - start
+
+        chunks = len(split_text(document(), 1000, 100))
+        assert client.calls == chunks + 1, "One request per chunk plus the final reduce"
+        assert client.peak > 1, "Chunks should be summarized concurrently"
+        assert elapsed < client.calls * client.latency / 2, f"Took {elapsed:.2f}s, not parallel"
+        assert progress[-1] == (chunks + 1, chunks + 1), "Progress should end at 100%"
+        assert [done for done, _ in progress] == list(range(1, chunks + 2))
+
+        print(f"✅ Map-reduce test passed: {chunks} chunks in {elapsed:.2f}s")
+
+    def test_chunk_timeout_scales_with_pool_rounds(self, monkeypatch):
+        """Test that a level with more chunks than workers gets a timeout per round"""
+        monkeypatch.setattr("archive.summary.CHUNK_TIMEOUT", 0.4)
+        client = FakeOpenAIClient(latency=0.2)
+        text = document(paragraphs=100)
+        chunks = len(split_text(text, 1000, 100))
+        assert chunks > 2 * MAX_WORKERS, "The map level should need three rounds of the pool"
+
+        summarize_long_text(
+            text, client, "gpt", chunk_tokens=1000, overlap_tokens=100, chunk_summary_tokens=40
+        )
+        assert client.calls == chunks + 1
+
+    def test_requests_follow_feature_budgets(self):
+        """Test that partial and final summaries are sized by their budgets"""
+        client = FakeOpenAIClient()
+        requests = []
+        create = client.chat.completions.create
+        client.chat.completions.create = lambda **request: (
+            requests.append(request) or create(**request)
+        )
+        summarize_long_text(document(paragraphs=100), client, "gpt", chunk_summary_tokens=200)
+
+        *partial, final = requests
+        assert {r["max_tokens"] for r in partial} == {200}, \
+            "Full chunks get the cap, not the larger budget"
+        assert final["max_tokens"] == plan_max_tokens(
+            "summary", count_prompt_tokens(final["messages"])
+        ), "The final summary is sized by the summary budget"
+
+    def test_hierarchical_reduce(self):
+        """Test that partial summaries are reduced again when they don't fit one request"""
+        client = FakeOpenAIClient()
+        progress = []
+        summarize_long_text(
+            document(paragraphs=200), client, "gpt",
+            chunk_tokens=300, overlap_tokens=0, chunk_summary_tokens=100,
+            on_progress=lambda done, total: progress.append(total),
+        )
+        # FakeOpenAIClient answers max_tokens=100 with ~50 words, so 300-token
+        # reduce chunks hold only a handful of partial summaries
+        assert progress[-1] == client.calls
+        assert client.calls > len(split_text(document(paragraphs=200), 300, 0)) + 1, \
+            "Expected at least one intermediate reduce level"
+
+        with pytest.raises(ValueError):
+            summarize_long_text("text", client, "gpt", chunk_tokens=100, chunk_summary_tokens=60)
@@ -0,0 +1,64 @@
+import subprocess
+import sys
+import threading
+import time
+
+from archive.clients import singleton
+
+
+class TestClients:
+    """Test suite for the lazily created API clients"""
+
+    def test_singleton_is_created_once(self):
+        """Test that concurrent first calls share one instance"""
+        created = []
+
+        @singleton
+        def client():
+            time.sleep(0.05)
+            created.append(object())
+            return created[-1]
+
+        assert client.peek() is None, "peek() must not create the client"
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(created) == 1, f"Factory ran {len(created)} times"
+        assert all(result is created[0] for result in results)
+        assert client.peek() is created[0]
+
+        print("✅ Client singleton test passed")
+
+    def test_failed_factory_is_retried(self):
+        """Test that a missing credential doesn't poison the singleton"""
+        attempts = []
+
+        @singleton
+        def client():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("no credentials")
+            return "client"
+
+        try:
+            client()
+        except RuntimeError:
+            pass
+        assert client() == "client" and len(attempts) == 2
+
+    def test_app_import_defers_heavy_packages(self):
+        """Test that importing the assistant loads no client packages or credentials"""
+        code = (
+            "import sys, archive.genai_study_assistant\n"
+            "heavy = ['openai', 'langchain', 'tavily', 'dotenv', 'httpx']\n"
+            "print(','.join(m for m in heavy if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, timeout=60
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "", f"Imported at startup: {result.stdout.strip()}"
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from core.datagen import DATA_TYPES, MAX_DATA_POINTS, generate_dataset
+
+
+class TestDataEngine:
+    """Test suite for the vectorized Data Generator engine"""
+
+    def test_values_stay_in_range(self):
+        """Test that every data type stays inside its configured range"""
+        for data_type, (prefix, low, high) in DATA_TYPES.items():
+            frame = generate_dataset(5000, data_type, seed=7)
+            values = frame[data_type].to_numpy()
+
+            assert len(frame) == 5000, f"{data_type} should have 5000 rows"
+            assert list(frame.columns) == [data_type], "Frame should have one value column"
+            assert frame.index.name == prefix, f"Index should be named '{prefix}'"
+            assert values.min() >= low, f"{data_type} below minimum {low}"
+            assert values.max() <= high, f"{data_type} above maximum {high}"
+
+        print("✅ Data engine range test passed")
+
+    def test_seed_is_reproducible(self):
+        """Test that the same seed yields the same series"""
+        first = generate_dataset(1000, "Stock Price", seed=42)
+        second = generate_dataset(1000, "Stock Price", seed=42)
+        other = generate_dataset(1000, "Stock Price", seed=43)
+
+        assert first.equals(second), "Same seed should give identical data"
+        assert not first.equals(other), "Different seeds should give different data"
+
+        print("✅ Data engine seed test passed")
+
+    def test_index_is_one_based(self):
+        """Test that labels start at 1 like the original 'Day 1' keys"""
+        frame = generate_dataset(3, "Sales", seed=0)
+        assert list(frame.index) == [1, 2, 3], "Index should run from 1 to data_points"
+
+    def test_empty_dataset(self):
+        """Test that zero points gives an empty frame for every data type"""
+        for data_type, (prefix, _, _) in DATA_TYPES.items():
+            frame = generate_dataset(0, data_type, seed=0)
+            assert frame.empty, f"{data_type} should have no rows"
+            assert list(frame.columns) == [data_type] and frame.index.name == prefix
+
+    def test_random_walk_is_continuous(self):
+        """Test that stock prices move in small steps rather than jumping"""
+        values = generate_dataset(10_000, "Stock Price", seed=1)["Stock Price"].to_numpy()
+        steps = np.abs(np.diff(values.astype(np.float64)) / values[:-1])
+        assert steps.max() < 0.1, "Random walk should not jump more than 10% per step"
+
+    def test_invalid_arguments(self):
+        """Test that bad inputs raise ValueError"""
+        with pytest.raises(ValueError):
+            generate_dataset(10, "Unknown")
+        with pytest.raises(ValueError):
+            generate_dataset(MAX_DATA_POINTS + 1, "Sales")
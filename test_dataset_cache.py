@@ -0,0 +1,60 @@
+from core.dataset_cache import DatasetCache
+
+
+class TestDatasetCache:
+    """Test suite for the memoized Data Generator dataset cache"""
+
+    def test_same_key_is_generated_once(self):
+        """Test that repeated lookups return the same cached entry"""
+        cache = DatasetCache()
+
+        first = cache.get(100, "Sales", 0)
+        second = cache.get(100, "Sales", 0)
+
+        assert first is second, "Same key should return the cached entry"
+        assert (cache.hits, cache.misses) == (1, 1), "Expected one miss then one hit"
+        assert cache.get(100, "Sales", 1) is not first, "Bumping the seed should give new data"
+
+        print("✅ Dataset cache hit test passed")
+
+    def test_statistics_are_precomputed(self):
+        """Test that cached stats match the frame"""
+        entry = DatasetCache().get(500, "Temperature", 3)
+        values = entry.frame["Temperature"]
+
+        assert entry.mean == float(values.mean()), "Mean should match the frame"
+        assert entry.maximum == values.max(), "Maximum should match the frame"
+        assert entry.minimum == values.min(), "Minimum should match the frame"
+
+    def test_lru_eviction_by_count(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = DatasetCache(max_entries=2)
+
+        cache.get(10, "Sales", 0)
+        cache.get(10, "Sales", 1)
+        cache.get(10, "Sales", 0)  # refresh seed 0
+        cache.get(10, "Sales", 2)  # evicts seed 1
+
+        assert len(cache) == 2, "Cache should hold at most two entries"
+        misses = cache.misses
+        cache.get(10, "Sales", 0)
+        assert cache.misses == misses, "Recently used entry should survive"
+        cache.get(10, "Sales", 1)
+        assert cache.misses == misses + 1, "Least recently used entry should be evicted"
+
+        print("✅ Dataset cache LRU test passed")
+
+    def test_byte_budget_counts_exports(self):
+        """Test that cached export bytes count toward the byte budget"""
+        cache = DatasetCache(max_bytes=10**9)
+        first = cache.get(1000, "Sales", 0)
+        cache.get(1000, "Sales", 1)
+
+        data = cache.get_export(1000, "Sales", 0, "CSV")
+        assert cache.get_export(1000, "Sales", 0, "CSV") is data, "Export should be cached"
+        assert first.exports[("CSV", False)] is data, "Export should be stored next to the data"
+
+        # Shrink the budget so both entries no longer fit
+        cache.max_bytes = first.nbytes
+        cache.get(1000, "Sales", 2)
+        assert len(cache) == 1, "Only the newest entry should fit the byte budget"
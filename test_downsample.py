@@ -0,0 +1,48 @@
+import numpy as np
+from core.datagen import generate_dataset
+from core.downsample import downsample_frame, lttb_indices, minmax_indices
+
+
+class TestDownsampling:
+    """Test suite for LTTB and min-max chart downsampling"""
+
+    def test_lttb_keeps_endpoints_and_count(self):
+        """Test that LTTB returns exactly threshold sorted points"""
+        y = np.random.default_rng(0).normal(size=10_000)
+        indices = lttb_indices(y, 500)
+
+        assert len(indices) == 500, "LTTB should return threshold points"
+        assert indices[0] == 0 and indices[-1] == len(y) - 1, "Endpoints should be kept"
+        assert np.all(np.diff(indices) > 0), "Indices should be strictly increasing"
+
+        print("✅ LTTB point count test passed")
+
+    def test_lttb_keeps_spikes(self):
+        """Test that a single spike survives downsampling"""
+        y = np.zeros(100_000)
+        y[54_321] = 100.0
+        assert 54_321 in lttb_indices(y, 200), "LTTB should keep the outlier"
+
+    def test_minmax_keeps_extremes(self):
+        """Test that min-max bucketing keeps the global minimum and maximum"""
+        y = np.random.default_rng(1).integers(0, 1000, size=99_999)
+        indices = minmax_indices(y, 100)
+
+        assert len(indices) <= 202, "At most two points per bucket plus the tail"
+        assert y[indices].max() == y.max(), "Global maximum should be kept"
+        assert y[indices].min() == y.min(), "Global minimum should be kept"
+
+        print("✅ Min-max bucketing test passed")
+
+    def test_small_frames_are_untouched(self):
+        """Test that frames under the target are plotted as-is"""
+        frame = generate_dataset(100, "Sales", seed=0)
+        assert downsample_frame(frame, "Sales", "Line Chart", 800) is frame
+
+    def test_frame_downsampling_is_bounded(self):
+        """Test that large frames are cut down to about the pixel width"""
+        frame = generate_dataset(200_000, "Temperature", seed=2)
+        for chart_type in ("Line Chart", "Bar Chart", "Area Chart"):
+            view = downsample_frame(frame, "Temperature", chart_type, 400)
+            assert len(view) <= 402, f"{chart_type} should be bounded by the width"
+            assert view.index.name == "Hour", "Downsampled rows should keep their labels"
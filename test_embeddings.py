@@ -0,0 +1,82 @@
+import zlib
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from archive.embeddings import generate_embeddings
+
+
+class FakeEmbeddingsClient:
+    """Stands in for the OpenAI embeddings API with optional failures"""
+
+    def __init__(self, dim=8, fail_first=0, drop_every=0):
+        self.dim = dim
+        self.requests = []
+        self.fail_first = fail_first
+        self.drop_every = drop_every
+        self.embeddings = SimpleNamespace(create=self._create)
+
+    def vector(self, text):
+        return np.random.default_rng(zlib.crc32(text.encode())).normal(size=self.dim).tolist()
+
+    def _create(self, input, model):
+        self.requests.append(list(input))
+        if len(self.requests) <= self.fail_first:
+            raise ConnectionError("transient failure")
+        data = [
+            SimpleNamespace(index=i, embedding=self.vector(text))
+            for i, text in enumerate(input)
+            # Simulate a partial response on the first request
+            if not (self.drop_every and len(self.requests) == 1 and i % self.drop_every == 0)
+        ]
+        return SimpleNamespace(data=data[::-1])  # order is not guaranteed
+
+
+class TestBatchEmbeddings:
+    """Test suite for batched embedding generation"""
+
+    def test_matrix_is_contiguous_and_ordered(self):
+        """Test that rows come back as float32 in input order"""
+        client = FakeEmbeddingsClient()
+        texts = [f"note {i}" for i in range(10)]
+        matrix = generate_embeddings(texts, client, "embed", max_inputs=4)
+
+        assert matrix.shape == (10, 8) and matrix.dtype == np.float32
+        assert matrix.flags["C_CONTIGUOUS"], "Matrix should be contiguous"
+        assert len(client.requests) == 3, "10 texts at 4 per request need 3 requests"
+        for i, text in enumerate(texts):
+            assert np.allclose(matrix[i], client.vector(text)), f"Row {i} out of order"
+
+        print("✅ Batch embedding test passed")
+
+    def test_token_limit_splits_batches(self):
+        """Test that requests stay under the token budget"""
+        client = FakeEmbeddingsClient()
+        texts = ["x" * 400] * 6  # about 100 tokens each
+        generate_embeddings(texts, client, "embed", max_tokens=250)
+        assert [len(r) for r in client.requests] == [2, 2, 2], "Two texts fit per request"
+
+    def test_normalize(self):
+        """Test that normalized rows have unit length"""
+        matrix = generate_embeddings(["a", "b", "c"], FakeEmbeddingsClient(), "embed", normalize=True)
+        assert np.allclose(np.linalg.norm(matrix, axis=1), 1.0), "Rows should be unit length"
+
+    def test_partial_failures_are_retried(self):
+        """Test that failed requests and missing items are re-requested"""
+        client = FakeEmbeddingsClient(fail_first=1)
+        matrix = generate_embeddings(["a", "b"], client, "embed", backoff=0)
+        assert len(client.requests) == 2 and matrix.shape == (2, 8)
+
+        client = FakeEmbeddingsClient(drop_every=2)
+        matrix = generate_embeddings(["a", "b", "c", "d"], client, "embed", backoff=0)
+        assert client.requests[1] == ["a", "c"], "Only missing inputs should be retried"
+        assert np.allclose(matrix[2], client.vector("c")), "Retried rows should land in place"
+
+        print("✅ Embedding retry test passed")
+
+    def test_gives_up_after_max_retries(self):
+        """Test that a persistent failure is raised"""
+        client = FakeEmbeddingsClient(fail_first=10)
+        with pytest.raises(ConnectionError):
+            generate_embeddings(["a"], client, "embed", max_retries=2, backoff=0)
+        assert len(client.requests) == 3, "One attempt plus two retries"
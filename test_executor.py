@@ -0,0 +1,59 @@
+import time
+
+from archive.executor import run_concurrently
+
+
+def _sleep_then_return(seconds, value):
+    time.sleep(seconds)
+    return value
+
+
+def _fail():
+    raise ValueError("backend down")
+
+
+class TestRunConcurrently:
+    """Test suite for running independent backend calls at once"""
+
+    def test_latency_is_max_not_sum(self):
+        """Test that two calls overlap instead of running back to back"""
+        start = time.perf_counter()
+        results = list(run_concurrently({
+            "slow": (_sleep_then_return, 0.3, "flashcards"),
+            "fast": (_sleep_then_return, 0.1, "books"),
+        }))
+        elapsed = time.perf_counter() - start
+
+        assert [name for name, _, _ in results] == ["fast", "slow"], "Results should arrive in completion order"
+        assert dict((n, r) for n, r, _ in results) == {"slow": "flashcards", "fast": "books"}
+        assert elapsed < 0.38, f"Calls should overlap, took {elapsed:.2f}s"
+
+        print(f"✅ Concurrent stage test passed - {elapsed:.2f}s")
+
+    def test_calls_start_before_iteration(self):
+        """Test that calls run while the caller does its own work"""
+        results = run_concurrently({"books": (_sleep_then_return, 0.2, "books")})
+        time.sleep(0.2)
+        start = time.perf_counter()
+        assert list(results) == [("books", "books", None)]
+        assert time.perf_counter() - start < 0.1, "The call should already have finished"
+
+    def test_errors_are_reported_per_call(self):
+        """Test that one failing call doesn't hide the other result"""
+        results = {name: (result, error) for name, result, error in run_concurrently({
+            "broken": (_fail,),
+            "ok": (_sleep_then_return, 0, 42),
+        })}
+
+        assert results["ok"] == (42, None), "Healthy call should still return"
+        assert isinstance(results["broken"][1], ValueError), "Error should be passed through"
+
+    def test_timeout_reports_unfinished_calls(self):
+        """Test that calls past the deadline are reported as timeouts"""
+        results = list(run_concurrently({
+            "fast": (_sleep_then_return, 0, "done"),
+            "stuck": (_sleep_then_return, 2, "late"),
+        }, timeout=0.2))
+
+        assert results[0] == ("fast", "done", None), "Finished call should be returned first"
+        assert results[1][0] == "stuck" and isinstance(results[1][2], TimeoutError)
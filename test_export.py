@@ -0,0 +1,71 @@
+import gzip
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from core.datagen import generate_dataset
+from core.export import EXPORT_FORMATS, export_bytes, generate_csv_from_data, iter_csv_chunks
+
+
+class TestStreamingExport:
+    """Test suite for chunked multi-format export"""
+
+    def test_chunked_csv_matches_single_pass(self):
+        """Test that chunk boundaries don't change the CSV output"""
+        frame = generate_dataset(1003, "Temperature", seed=3)
+
+        chunked = b"".join(iter_csv_chunks(frame, "Temperature", chunk_rows=100, include_labels=True))
+        single = b"".join(iter_csv_chunks(frame, "Temperature", chunk_rows=10_000, include_labels=True))
+
+        assert chunked == single, "Chunked CSV should match single-chunk CSV"
+        df = pd.read_csv(io.BytesIO(chunked))
+        assert len(df) == 1003, "Every row should be exported exactly once"
+        assert df['Label'].iloc[-1] == "Hour 1003", "Last label should be 'Hour 1003'"
+
+        print("✅ Chunked CSV test passed")
+
+    def test_gzip_csv_round_trip(self):
+        """Test that gzip export decompresses to the plain CSV"""
+        frame = generate_dataset(500, "Sales", seed=1)
+
+        compressed = export_bytes(frame, "Sales", "CSV (gzip)", chunk_rows=64, include_labels=True)
+        assert gzip.decompress(compressed).decode() == generate_csv_from_data(frame, "Sales")
+
+        print("✅ Gzip CSV test passed")
+
+    def test_columnar_formats_round_trip(self):
+        """Test that Parquet and Arrow IPC exports read back to the same values"""
+        frame = generate_dataset(777, "Stock Price", seed=5)
+
+        parquet = pq.read_table(io.BytesIO(export_bytes(frame, "Stock Price", "Parquet", chunk_rows=100)))
+        arrow = pa.ipc.open_file(export_bytes(frame, "Stock Price", "Arrow IPC", chunk_rows=100)).read_all()
+
+        for table in (parquet, arrow):
+            assert table.column_names == ["Time", "Stock Price"], "Columns should be index and values"
+            assert table.column("Time").to_pylist() == list(frame.index), "Index should round-trip"
+            assert table.column("Stock Price").to_pylist() == frame["Stock Price"].tolist()
+
+        print("✅ Columnar export test passed")
+
+    def test_labels_are_opt_in(self):
+        """Test that exports write the integer index unless labels are asked for"""
+        frame = generate_dataset(3, "Sales", seed=1)
+
+        compact = export_bytes(frame, "Sales", "CSV").decode().splitlines()
+        labelled = export_bytes(frame, "Sales", "CSV", include_labels=True).decode().splitlines()
+        assert compact[0] == "Day,Sales", "Compact header should use the unit"
+        assert compact[1].startswith("1,"), "Compact rows should use the integer index"
+        assert labelled[0] == "Label,Sales", "Labelled header should keep 'Label'"
+        assert labelled[1].startswith("Day 1,"), "Labels should be materialized on request"
+
+        table = pa.ipc.open_file(export_bytes(frame, "Sales", "Arrow IPC", include_labels=True)).read_all()
+        assert table.column("Label").to_pylist() == ["Day 1", "Day 2", "Day 3"]
+
+        print("✅ Opt-in label export test passed")
+
+    def test_every_format_exports_empty_frame(self):
+        """Test that an empty frame still produces a valid file"""
+        frame = generate_dataset(0, "Website Visits")
+        for fmt in EXPORT_FORMATS:
+            assert export_bytes(frame, "Website Visits", fmt), f"{fmt} export should not be empty"
@@ -0,0 +1,135 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+import archive.async_api
+import archive.flashcards
+from archive.async_api import generate_flashcards_async, run_sync
+from archive.flashcards import (
+    Flashcard, _cached_chain, format_flashcards, generate_flashcard_records,
+    generate_flashcards, parse_flashcards, stream_flashcards,
+)
+from archive.usage import FEATURE_BUDGETS, UsageMeter
+
+REPLY = json.dumps({"flashcards": [
+    {"subtopic": "Light reactions", "question": "Where do light reactions happen?",
+     "answer": "In the thylakoid membranes."},
+    {"subtopic": "Calvin cycle", "question": "What does the Calvin cycle produce?",
+     "answer": "Glucose precursors."},
+]})
+
+
+class FakeStructuredChain:
+    """Stands in for prompt | model in JSON mode and counts requests"""
+
+    def __init__(self, content=REPLY):
+        self.content = content
+        self.requests = []
+
+    def invoke(self, inputs):
+        self.requests.append(inputs)
+        return SimpleNamespace(content=self.content)
+
+    async def ainvoke(self, inputs):
+        return self.invoke(inputs)
+
+    def stream(self, inputs):
+        content = self.invoke(inputs).content
+        for i in range(0, len(content), 7):
+            yield SimpleNamespace(content=content[i:i + 7])
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    fake = FakeStructuredChain()
+
+    def structured_chain(llm, max_tokens):
+        fake.max_tokens = max_tokens
+        return fake
+
+    monkeypatch.setattr(archive.flashcards, "structured_chain", structured_chain)
+    monkeypatch.setattr(archive.async_api, "structured_chain", structured_chain)
+    return fake
+
+
+class TestFlashcards:
+    """Test suite for structured flashcard generation"""
+
+    def test_parse_flashcards(self):
+        """Test that JSON replies, fenced or not, become Flashcard records"""
+        cards = parse_flashcards(REPLY)
+        assert cards[0] == Flashcard("Light reactions", "Where do light reactions happen?",
+                                     "In the thylakoid membranes.")
+        assert parse_flashcards(f"```json\n{REPLY}\n```") == cards, "Code fences should be ignored"
+
+        with pytest.raises(ValueError):
+            parse_flashcards("Q: What is light? A: Energy.")
+        with pytest.raises(ValueError):
+            parse_flashcards('{"cards": []}')
+
+        print("✅ Flashcard parsing test passed")
+
+    def test_single_request(self, chain):
+        """Test that records and text both come from one request"""
+        records = generate_flashcard_records("Photosynthesis", llmClient=None)
+        text = generate_flashcards("Photosynthesis", llmClient=None)
+
+        assert len(chain.requests) == 2, "One request per call"
+        assert chain.max_tokens == FEATURE_BUDGETS["flashcards"].min_completion
+        assert [card.subtopic for card in records] == ["Light reactions", "Calvin cycle"]
+        assert text == format_flashcards(records)
+        assert text.startswith("- Q: Where do light reactions happen? A: In the thylakoid")
+
+    def test_prose_reply_falls_back_to_text(self, chain):
+        """Test that a non-JSON reply is still shown to the user"""
+        chain.content = "- Q: What is light? A: Energy."
+        assert generate_flashcards("Light", llmClient=None) == chain.content
+        assert run_sync(generate_flashcards_async("Light", llmClient=None)) == chain.content
+
+    def test_async_matches_sync(self, chain):
+        """Test that the async helper makes the same single request"""
+        assert run_sync(generate_flashcards_async("Photosynthesis", None)) == \
+            generate_flashcards("Photosynthesis", None)
+        assert chain.requests == [{"topic": "Photosynthesis"}] * 2
+
+    def test_stream_yields_each_card(self, chain):
+        """Test that streamed cards arrive one by one and join up to the full text"""
+        meter = UsageMeter()
+        pieces = list(stream_flashcards("Photosynthesis", None, meter=meter))
+
+        assert len(pieces) == 2, "One piece per flashcard"
+        assert "".join(pieces) == generate_flashcards("Photosynthesis", None)
+        assert chain.max_tokens == FEATURE_BUDGETS["flashcards"].min_completion
+        assert meter.by_feature()["flashcards"].completion_tokens > 0
+
+        chain.content = json.dumps({"flashcards": [
+            {"subtopic": "Sets", "question": 'What does "{}" denote?', "answer": "The empty set \\ {}."},
+        ]})
+        assert list(stream_flashcards("Sets", None)) == [generate_flashcards("Sets", None)], \
+            "Braces and quotes inside strings don't end a card"
+
+        chain.content = "- Q: What is light? A: Energy."
+        assert list(stream_flashcards("Light", None)) == [chain.content], "Prose comes whole"
+
+    def test_chains_are_built_once(self):
+        """Test that chains are built once per model and reused"""
+        builds = []
+        model = object()
+        for _ in range(3):
+            chain = _cached_chain("test", model, lambda: builds.append(1) or object())
+        assert len(builds) == 1 and _cached_chain("test", model, object) is chain
+
+
+def test_flashcard_stage_streams_cards_and_books(assistant, chain):
+    """Test that the stage streams the flashcards and then lists the books"""
+    at, _, tavily = assistant
+    at.run()
+    at.text_input(key="menu_choice").input("1").run()
+    at.text_input[0].input("Photosynthesis").run()
+
+    assert not at.exception, at.exception
+    contents = [m["content"] for m in at.session_state["messages"]]
+    assert generate_flashcards("Photosynthesis", None) in contents
+    assert any(c.startswith("**Source 1:**") for c in contents)
+    assert contents.index(generate_flashcards("Photosynthesis", None)) < len(contents) - 2
+    assert len(tavily.calls) == 1
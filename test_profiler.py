@@ -0,0 +1,135 @@
+import gc
+import tracemalloc
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from core.profiler import METRICS, RerunProfiler, percentile
+
+
+@pytest.fixture
+def profiler():
+    profiler = RerunProfiler(history=3)
+    profiler.enable()
+    yield profiler
+    profiler.disable()
+
+
+class TestRerunProfiler:
+    """Test suite for the per-section rerun profiler"""
+
+    def test_disabled_records_nothing(self):
+        """Test that sections are no-ops until profiling is enabled"""
+        profiler = RerunProfiler()
+        profiler.start_rerun()
+        with profiler.section("page"):
+            pass
+        profiler.end_rerun()
+        assert len(profiler.history) == 0
+        assert profiler.summary() == []
+
+    def test_sections_are_measured(self, profiler):
+        """Test wall time and allocations of a section"""
+        profiler.start_rerun()
+        with profiler.section("compute"):
+            sum(range(10_000))
+        with profiler.section("allocate"):
+            kept = [bytearray(1024) for _ in range(100)]
+        profiler.end_rerun()
+
+        rerun = profiler.history[-1]
+        assert list(rerun) == ["compute", "allocate"]
+        wall_ms, cpu_ms, alloc_kib, peak_kib = rerun["allocate"]
+        assert wall_ms > 0 and cpu_ms >= 0
+        assert alloc_kib >= 100, "About 100 KiB should still be allocated"
+        assert peak_kib >= alloc_kib
+        assert len(kept) == 100
+
+        rows = {row["section"]: row for row in profiler.summary()}
+        assert set(rows) == {"compute", "allocate", "total"}
+        assert rows["total"]["wall_ms_p50"] >= rows["allocate"]["wall_ms_p50"]
+
+    def test_history_is_bounded_and_interrupted_reruns_kept(self, profiler):
+        """Test the rolling history and reruns cut short by an exception"""
+        for _ in range(5):
+            profiler.start_rerun()
+            with pytest.raises(RuntimeError):
+                with profiler.section("page"):
+                    raise RuntimeError("st.rerun()")
+        profiler.start_rerun()
+
+        assert len(profiler.history) == 3, "Only the newest reruns are kept"
+        assert len(profiler.series("page")) == 3
+        exported = profiler.to_dict()
+        assert exported["metrics"] == list(METRICS)
+        assert set(exported["history"][0]["page"]) == set(METRICS)
+
+    def test_tracemalloc_is_released(self):
+        """Test that tracemalloc stops when the last profiler is disabled"""
+        first, second = RerunProfiler(), RerunProfiler()
+        first.enable()
+        second.enable()
+        first.disable()
+        assert tracemalloc.is_tracing(), "Another session is still profiling"
+        second.disable()
+        assert not tracemalloc.is_tracing()
+
+    def test_tracemalloc_is_released_with_the_session(self):
+        """Test that a profiler dropped while enabled still releases tracemalloc"""
+        profiler = RerunProfiler()
+        profiler.enable()
+        del profiler
+        gc.collect()
+        assert not tracemalloc.is_tracing()
+
+    def test_shared_tracemalloc_peak_is_not_reset(self, monkeypatch):
+        """Test that a section only resets the peak when no other session profiles"""
+        resets = []
+        monkeypatch.setattr(tracemalloc, "reset_peak", lambda: resets.append(1))
+        first, second = RerunProfiler(), RerunProfiler()
+        first.enable()
+        first.start_rerun()
+        with first.section("page"):
+            pass
+        assert len(resets) == 1
+
+        second.enable()
+        with first.section("footer"):
+            pass
+        assert len(resets) == 1, "Another session's sections rely on the peak"
+        first.disable()
+        second.disable()
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile([7], 95) == 7
+
+
+def test_settings_performance_section():
+    """Test enabling profiling on the Settings page and exporting the timings"""
+    at = AppTest.from_file("app.py")
+    at.run()
+    at.sidebar.text_input[0].input("Test User").run()
+    at.sidebar.radio[0].set_value("Settings").run()
+
+    toggle = next(t for t in at.toggle if t.label == "Profile each rerun")
+    toggle.set_value(True).run()
+    at.run()
+    at.run()
+    assert not at.exception, at.exception
+
+    profiler = at.session_state.profiler
+    assert len(profiler.history) >= 2
+    assert {"session_init", "css", "sidebar", "page:Settings", "footer"} <= set(
+        profiler.sections())
+    assert len(at.dataframe) == 1, "The p50/p95 table should be shown"
+
+    next(b for b in at.button if "Export User Data" in b.label).click().run()
+    assert "performance" in at.json[0].value
+
+    toggle = next(t for t in at.toggle if t.label == "Profile each rerun")
+    toggle.set_value(False).run()
+    assert not profiler.enabled
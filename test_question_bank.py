@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from streamlit.testing.v1 import AppTest
+from core.question_bank import DEFAULT_QUESTIONS, Deck, QuestionBank, default_bank, parse_quiz
+
+README_QUIZ = """Quiz:
+1. What is the primary pigment involved in photosynthesis?
+   a) Hemoglobin
+   b) Chlorophyll *
+   c) Melanin
+   d) Keratin
+
+2. What are the main products of photosynthesis?
+   a) Carbon dioxide and glucose
+   b) Glucose and oxygen *
+   c) Oxygen and chlorophyll
+   d) Water and sunlight
+"""
+
+
+class TestQuestionBank:
+    """Test suite for the indexed question bank"""
+
+    def test_index_by_topic_and_difficulty(self):
+        """Test that slot lookups only return matching questions"""
+        bank = default_bank()
+        assert len(bank) == len(DEFAULT_QUESTIONS)
+
+        for slot in bank.slots("Math", "Easy"):
+            question = bank.question(slot)
+            assert (question.topic, question.difficulty) == ("Math", "Easy")
+        assert len(bank.slots("Science")) == sum(q[3] == "Science" for q in DEFAULT_QUESTIONS)
+        assert len(bank.slots()) == len(bank)
+        assert len(bank.slots("History")) == 0, "Unknown topics match nothing"
+
+        print("✅ Question bank index test passed")
+
+    def test_grading_uses_answer_indices(self):
+        """Test vectorized grading against precomputed answers"""
+        bank = default_bank()
+        slots = bank.slots()
+        answers = [bank.question(slot).answer for slot in slots]
+        assert bank.grade(slots, answers) == len(slots)
+        assert bank.grade(slots[:3], [(a + 1) % 4 for a in answers[:3]]) == 0
+
+        with pytest.raises(ValueError):
+            bank.add("Bad?", ["a", "b"], 2, "Math")
+
+    def test_thousands_of_questions(self):
+        """Test growth beyond the initial capacity"""
+        bank = QuestionBank()
+        bank.add_many(
+            (f"Question {i}?", ("a", "b", "c", "d"), i % 4, f"Topic {i % 10}", "Hard")
+            for i in range(5000)
+        )
+        assert len(bank) == 5000 and len(bank.slots("Topic 3", "Hard")) == 500
+        assert bank.question(4321).answer == 1
+
+    def test_deck_draws_without_replacement(self):
+        """Test that a deck never repeats a slot until reset"""
+        deck = Deck(np.arange(100), seed=1)
+        drawn = np.concatenate([deck.draw(7) for _ in range(15)])
+        assert len(drawn) == 100 and len(set(drawn.tolist())) == 100
+        assert deck.remaining == 0 and len(deck.draw(5)) == 0
+
+        deck.reset()
+        assert len(deck.draw(5)) == 5
+
+    def test_import_generated_quiz(self):
+        """Test parsing generate_quiz output in the README and 'Answer:' formats"""
+        assert parse_quiz(README_QUIZ) == [
+            ("What is the primary pigment involved in photosynthesis?",
+             ("Hemoglobin", "Chlorophyll", "Melanin", "Keratin"), 1),
+            ("What are the main products of photosynthesis?",
+             ("Carbon dioxide and glucose", "Glucose and oxygen",
+              "Oxygen and chlorophyll", "Water and sunlight"), 1),
+        ]
+        answer_lines = ("**Question 1:** Which gas do we exhale?\nA. Oxygen\nB. Carbon dioxide\n"
+                        "Answer: B\n\nQuestion 2: Unanswered?\nA. Yes\nB. No\n")
+        assert parse_quiz(answer_lines) == [("Which gas do we exhale?", ("Oxygen", "Carbon dioxide"), 1)]
+
+        bank = default_bank()
+        assert bank.import_quiz(README_QUIZ, "Biology", "Medium") == 2
+        assert len(bank.slots("Biology", "Medium")) == 2
+
+
+def test_quiz_page_scores_drawn_questions():
+    """Test that the Quiz page grades the questions it drew"""
+    at = AppTest.from_file("app.py")
+    at.run()
+    at.sidebar.text_input[0].input("Test User")
+    at.sidebar.radio[0].set_value("Quiz")
+    at.run()
+
+    bank = at.session_state.question_bank
+    questions = at.session_state.quiz_questions
+    assert len(questions) == 4
+    for i, slot in enumerate(questions):
+        at.radio(key=f"q{i}").set_value(bank.question(slot).answer)
+    at.run()
+    assert list(at.session_state.quiz_questions) == list(questions), "Reruns keep the drawn questions"
+
+    at.button[0].click().run()
+    assert not at.exception
+    assert at.session_state.quiz_completed and at.session_state.quiz_score == 4
+
+    print("✅ Quiz page scoring test passed")
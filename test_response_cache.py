@@ -0,0 +1,95 @@
+from archive.quiz import generate_quiz, stream_quiz
+from archive.response_cache import ResponseCache, request_key
+from archive.summary import summarize_text, stream_summary
+from benchmarks.fakes import FakeOpenAIClient
+
+
+class TestResponseCache:
+    """Test suite for the persistent LLM response cache"""
+
+    def test_repeated_text_hits_cache(self, tmp_path):
+        """Test that the same text is only sent to the API once"""
+        cache = ResponseCache(str(tmp_path / "cache.db"), cache_nondeterministic=True)
+        client = FakeOpenAIClient()
+
+        first = summarize_text("Photosynthesis basics", client, "gpt", cache=cache)
+        second = summarize_text("Photosynthesis basics", client, "gpt", cache=cache)
+        generate_quiz("Photosynthesis basics", client, "gpt", cache=cache)
+
+        assert first == second, "Cached summary should match the original"
+        assert client.calls == 2, "Summary should be cached, quiz is a different request"
+        assert (cache.hits, cache.misses) == (1, 2), "Expected one hit and two misses"
+
+        print("✅ Response cache hit test passed")
+
+    def test_temperature_opt_in(self, tmp_path):
+        """Test that temperature > 0 is only cached when asked for"""
+        cache = ResponseCache(str(tmp_path / "cache.db"))
+        client = FakeOpenAIClient()
+
+        summarize_text("Cells", client, "gpt", cache=cache)
+        summarize_text("Cells", client, "gpt", cache=cache)
+
+        assert client.calls == 2, "Non-deterministic requests should bypass the cache by default"
+        assert len(cache) == 0, "Nothing should be stored"
+
+    def test_cache_persists_across_instances(self, tmp_path):
+        """Test that entries survive reopening the database"""
+        path = str(tmp_path / "cache.db")
+        ResponseCache(path).set("k", "stored")
+        assert ResponseCache(path).get("k") == "stored", "Entry should be read back from disk"
+
+    def test_ttl_expiry(self, tmp_path):
+        """Test that expired entries are treated as misses"""
+        cache = ResponseCache(str(tmp_path / "cache.db"))
+        cache.set("old", "value", ttl=-1)
+        assert cache.get("old") is None, "Expired entry should not be returned"
+
+    def test_lru_size_limit(self, tmp_path):
+        """Test that the least recently used entries are evicted"""
+        cache = ResponseCache(str(tmp_path / "cache.db"), max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert len(cache) == 2, "Cache should hold max_entries"
+        assert cache.get("b") is None, "Least recently used entry should be evicted"
+        assert cache.get("a") == 1 and cache.get("c") == 3
+
+    def test_request_key_covers_parameters(self):
+        """Test that every request parameter changes the key"""
+        messages = [{"role": "user", "content": "hi"}]
+        base = request_key("gpt", messages, 150, 0.5)
+        assert base == request_key("gpt", list(messages), 150, 0.5), "Key should be stable"
+        assert base != request_key("gpt-4", messages, 150, 0.5)
+        assert base != request_key("gpt", messages, 300, 0.5)
+        assert base != request_key("gpt", messages, 150, 0.0)
+
+
+class TestStreaming:
+    """Test suite for token streaming of summaries and quizzes"""
+
+    def test_stream_yields_tokens(self):
+        """Test that streamed tokens join up to the full completion"""
+        client = FakeOpenAIClient()
+        tokens = list(stream_quiz("The water cycle", client, "gpt"))
+
+        assert len(tokens) > 1, "Completion should arrive in several tokens"
+        text = "".join(tokens)
+        assert text.strip() == generate_quiz("The water cycle", FakeOpenAIClient(), "gpt"), \
+            "Tokens should join, in order, to the full text"
+
+        print("✅ Streaming token test passed")
+
+    def test_streamed_completion_is_cached(self, tmp_path):
+        """Test that a finished stream is stored and replayed from cache"""
+        cache = ResponseCache(str(tmp_path / "cache.db"), cache_nondeterministic=True)
+        client = FakeOpenAIClient()
+
+        streamed = "".join(stream_summary("Mitosis", client, "gpt", cache=cache))
+        replayed = list(stream_summary("Mitosis", client, "gpt", cache=cache))
+
+        assert replayed == [streamed], "Cache hit should yield the stored text in one piece"
+        assert summarize_text("Mitosis", client, "gpt", cache=cache) == streamed
+        assert client.calls == 1, "Only the first request should reach the API"
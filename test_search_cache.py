@@ -0,0 +1,66 @@
+import time
+
+from archive.search_cache import SearchCache, cached_search, normalize_query, search_key
+from benchmarks.fakes import FakeTavilyClient
+
+
+def _search(client, kind, query, top_k, cache):
+    return cached_search(cache, kind, query, top_k, lambda: client.search(query, max_results=top_k))
+
+
+class TestSearchCache:
+    """Test suite for the Tavily search cache"""
+
+    def test_normalize_query(self):
+        """Test case, whitespace, punctuation and stop-word folding"""
+        assert normalize_query("Please explain  Photosynthesis!") == "photosynthesis"
+        assert normalize_query("  photosynthesis\n") == "photosynthesis"
+        assert normalize_query("Tell me about the French Revolution") == "french revolution"
+        assert normalize_query("is it") == "is it", "All-stop-word queries are kept"
+
+    def test_question_words_are_kept(self):
+        """Test that different questions about the same topic get different keys"""
+        assert normalize_query("What is photosynthesis?") == "what photosynthesis"
+        assert search_key("internet", "why do plants grow", 3) != \
+            search_key("internet", "how do plants grow", 3)
+
+    def test_equivalent_queries_hit(self, tmp_path):
+        """Test that rewordings only differing in filler words reuse results"""
+        client = FakeTavilyClient()
+        cache = SearchCache(str(tmp_path / "search.sqlite3"))
+
+        first = _search(client, "internet", "Photosynthesis", 3, cache)
+        second = _search(client, "internet", "tell me about the photosynthesis", 3, cache)
+        assert second == first and len(client.calls) == 1, "Second query should be a cache hit"
+
+        _search(client, "internet", "photosynthesis", 5, cache)
+        _search(client, "books", "photosynthesis", 3, cache)
+        assert len(client.calls) == 3, "top_k and search kind are part of the key"
+        assert client.calls[1][1] == 5, "top_k should be passed through to the client"
+        assert cache.hits == 1 and cache.misses == 3
+
+        print("✅ Search cache test passed")
+
+    def test_disk_store_and_ttls(self, tmp_path):
+        """Test that results survive a restart and expire per search kind"""
+        path = str(tmp_path / "search.sqlite3")
+        client = FakeTavilyClient()
+        _search(client, "books", "calculus", 2, SearchCache(path))
+
+        reopened = SearchCache(path, memory_entries=1)
+        assert reopened.get("books", "Calculus", 2) is not None, "Results should persist on disk"
+
+        short = SearchCache(str(tmp_path / "short.sqlite3"), ttls={"internet": 0.05})
+        short.set("internet", "calculus", 3, {"results": []})
+        assert short.get("internet", "calculus", 3) == {"results": []}
+        time.sleep(0.1)
+        assert short.get("internet", "calculus", 3) is None, "Entry should expire after its TTL"
+
+    def test_memory_lru_is_bounded(self, tmp_path):
+        """Test that the in-memory layer keeps only the newest entries"""
+        cache = SearchCache(str(tmp_path / "search.sqlite3"), memory_entries=2)
+        for topic in ["algebra", "biology", "chemistry"]:
+            cache.set("internet", topic, 3, {"results": [topic]})
+        assert len(cache._memory) == 2
+        assert cache.get("internet", "algebra", 3) == {"results": ["algebra"]}, \
+            "Evicted entries should still come from disk"
@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+import numpy as np
+from archive.semantic_cache import SemanticCache, semantic_call, semantic_stream
+from archive.vector_index import VectorIndex
+
+
+class FakeTopicEmbeddings:
+    """Embeds prompts by keyword, so rewordings of one topic land close together"""
+
+    TOPICS = ["photosynthesis", "mitosis", "gravity"]
+
+    def __init__(self, fail=False):
+        self.requests = 0
+        self.fail = fail
+        self.embeddings = SimpleNamespace(create=self._create)
+
+    def _create(self, input, model):
+        self.requests += 1
+        if self.fail:
+            raise ConnectionError("embeddings unavailable")
+        data = []
+        for i, text in enumerate(input):
+            vector = np.full(len(self.TOPICS) + 1, 0.05)
+            for t, topic in enumerate(self.TOPICS):
+                if topic in text.lower():
+                    vector[t] = 1.0
+            vector[-1] += 0.01 * len(text)  # wording still moves the vector a little
+            data.append(SimpleNamespace(index=i, embedding=vector.tolist()))
+        return SimpleNamespace(data=data)
+
+
+class TestSemanticCache:
+    """Test suite for the semantic answer cache"""
+
+    def test_reworded_prompt_hits(self, tmp_path):
+        """Test that a differently worded prompt on the same topic is served from cache"""
+        cache = SemanticCache(FakeTopicEmbeddings(), "embed", threshold=0.9, path=str(tmp_path))
+        calls = []
+
+        def answer(prompt):
+            calls.append(prompt)
+            return f"answer to {prompt}"
+
+        first = semantic_call(cache, "query", "photosynthesis basics", answer, "photosynthesis basics")
+        second = semantic_call(cache, "query", "Explain photosynthesis", answer, "Explain photosynthesis")
+        third = semantic_call(cache, "query", "explain gravity", answer, "explain gravity")
+
+        assert second == first, "Reworded prompt should get the cached answer"
+        assert third == "answer to explain gravity", "A different topic should miss"
+        assert len(calls) == 2, f"Backend should run twice, ran {len(calls)} times"
+
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 2
+        assert 0.9 <= stats["mean_hit_similarity"] <= 1.0
+
+        print("✅ Semantic cache hit test passed")
+
+    def test_namespaces_and_threshold(self, tmp_path):
+        """Test that stages don't share answers and the threshold is respected"""
+        cache = SemanticCache(FakeTopicEmbeddings(), "embed", threshold=0.9, path=str(tmp_path))
+        cache.store("query", "photosynthesis", "search results")
+
+        assert cache.lookup("summarize", "photosynthesis")[0] is None, "Namespaces must be separate"
+        assert cache.lookup("query", "photosynthesis")[0] == "search results"
+
+        cache.threshold = 1.01
+        assert cache.lookup("query", "photosynthesis")[0] is None, "Threshold above 1 should never hit"
+
+    def test_persists_and_expires(self, tmp_path):
+        """Test that answers survive a restart and expire after the TTL"""
+        cache = SemanticCache(FakeTopicEmbeddings(), "embed", path=str(tmp_path))
+        cache.store("query", "mitosis", {"results": [{"title": "Cells"}]})
+
+        reopened = SemanticCache(FakeTopicEmbeddings(), "embed", path=str(tmp_path))
+        assert reopened.lookup("query", "mitosis")[0] == {"results": [{"title": "Cells"}]}
+        index = VectorIndex(str(tmp_path / "query"))
+        entry = index.search(np.ones(index.dim), k=1)[0][2]
+        assert set(entry) == {"answer", "expires_at"}, "Prompts should not be stored"
+
+        expired = SemanticCache(FakeTopicEmbeddings(), "embed", path=str(tmp_path), ttl=-1)
+        expired.store("query", "gravity", "old")
+        assert expired.lookup("query", "gravity")[0] is None, "Expired answers should miss"
+
+    def test_stream_and_embedding_failure(self, tmp_path):
+        """Test streaming pass-through and that embedding errors never break a stage"""
+        cache = SemanticCache(FakeTopicEmbeddings(), "embed", path=str(tmp_path))
+        streamed = "".join(semantic_stream(cache, "summarize", "photosynthesis", iter(["a", "b"])))
+        replay = list(semantic_stream(cache, "summarize", "photosynthesis", iter(["x"])))
+        assert streamed == "ab" and replay == ["ab"], "Second stream should come from cache"
+
+        broken = SemanticCache(FakeTopicEmbeddings(fail=True), "embed", path=str(tmp_path / "b"))
+        assert semantic_call(broken, "query", "q", lambda: "live") == "live"
+        assert broken.errors == 1 and broken.misses == 1
+        assert semantic_call(None, "query", "q", lambda: "direct") == "direct"
+
+    def test_long_prompts_bypass_cache(self, tmp_path):
+        """Test that a document too long to embed skips the cache without an error"""
+        embeddings = FakeTopicEmbeddings()
+        cache = SemanticCache(embeddings, "embed", path=str(tmp_path))
+        document = "photosynthesis " * 20_000
+        calls = []
+
+        for _ in range(2):
+            assert semantic_call(cache, "summarize", document, lambda: calls.append(1) or "summary") == "summary"
+        assert len(calls) == 2, "Long documents should always be summarized live"
+        assert cache.errors == 0 and cache.misses == 0 and cache.skipped == 2
+        assert embeddings.requests == 0, "Long documents should never reach the embeddings API"
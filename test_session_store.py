@@ -0,0 +1,165 @@
+import time
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from core.chat_history import ChatHistory
+from core.session_store import SessionStore, StoredSession
+
+
+def _message(i):
+    return {"role": "user" if i % 2 else "assistant", "content": f"message {i}"}
+
+
+class TestSessionStore:
+    """Test suite for the SQLite session store"""
+
+    def test_values_survive_reopening(self, tmp_path):
+        """Test that values written in the background are there after a restart"""
+        path = str(tmp_path / "sessions.sqlite3")
+        store = SessionStore(path)
+        session = StoredSession(store)
+        session.save(user_data={"name": "Ada"}, visit_count=3)
+        store.close()
+
+        reopened = StoredSession(SessionStore(path), session.session_id)
+        assert reopened.load() == {"user_data": {"name": "Ada"}, "visit_count": 3}
+
+    def test_only_changed_values_are_written(self, tmp_path):
+        """Test that save() skips values that are already stored"""
+        store = SessionStore(str(tmp_path / "sessions.sqlite3"))
+        writes = []
+        store.set_values = lambda session_id, values: writes.append(values)
+        session = StoredSession(store)
+
+        session.save(quiz_score=1, user_data={"name": "Ada"})
+        session.save(quiz_score=1, user_data={"name": "Ada"})
+        session.save(quiz_score=2, user_data={"name": "Ada"})
+        assert writes == [{"quiz_score": 1, "user_data": {"name": "Ada"}}, {"quiz_score": 2}]
+
+    def test_session_ids_are_validated(self, tmp_path):
+        """Test that a malformed id from the URL starts a new session"""
+        store = SessionStore(str(tmp_path / "sessions.sqlite3"))
+        assert StoredSession(store, "a" * 32).session_id == "a" * 32
+        assert StoredSession(store, "'; DROP TABLE sessions").session_id != "'; DROP TABLE sessions"
+
+    def test_stale_sessions_are_pruned(self, tmp_path):
+        """Test that sessions past max_age are deleted when a store opens"""
+        path = str(tmp_path / "sessions.sqlite3")
+        store = SessionStore(path)
+        session = StoredSession(store)
+        session.save(visit_count=1)
+        store.append_message(session.session_id, 0, _message(0))
+        store.close()
+
+        store = SessionStore(path, max_age=-1)
+        assert store.values(session.session_id) == {}
+        assert store.message_count(session.session_id) == 0
+
+    def test_delete_session(self, tmp_path):
+        """Test that deleting a session drops its values and messages"""
+        store = SessionStore(str(tmp_path / "sessions.sqlite3"))
+        session = StoredSession(store)
+        session.save(visit_count=1)
+        session.history().append(_message(0))
+        session.delete()
+        assert session.load() == {}
+        assert store.message_count(session.session_id) == 0
+
+    def test_reads_wait_only_for_own_writes(self, tmp_path, monkeypatch):
+        """Test that a read neither waits on other sessions' writes nor the batch delay"""
+        monkeypatch.setattr("core.session_store.BATCH_DELAY", 5)
+        store = SessionStore(str(tmp_path / "sessions.sqlite3"))
+        busy, idle = StoredSession(store), StoredSession(store)
+        busy.save(visit_count=1)
+
+        start = time.monotonic()
+        assert idle.load() == {}
+        assert busy.load() == {"visit_count": 1}
+        assert time.monotonic() - start < 2
+        store.close()
+
+
+class TestStoredChatHistory:
+    """Test suite for chat histories backed by the session store"""
+
+    def test_resume_loads_recent_window(self, tmp_path):
+        """Test that a resumed history holds only the newest messages in memory"""
+        path = str(tmp_path / "sessions.sqlite3")
+        store = SessionStore(path)
+        history = ChatHistory(max_messages=5, store=store, session_id="a" * 32)
+        for i in range(12):
+            history.append(_message(i))
+        assert history.total_count == 12
+        assert not (tmp_path / "chat.jsonl").exists()
+        store.close()
+
+        resumed = ChatHistory.resume(SessionStore(path), "a" * 32, max_messages=5)
+        assert len(resumed) == 5 and resumed.archived_count == 7
+        assert resumed[-1] == _message(11)
+        assert resumed.window(8) == [_message(i) for i in range(4, 12)], \
+            "Older messages should be read from the store"
+
+        resumed.append(_message(12))
+        assert resumed.window(13) == [_message(i) for i in range(13)]
+
+    def test_clear_removes_stored_messages(self, tmp_path):
+        """Test that clearing the history clears the store"""
+        store = SessionStore(str(tmp_path / "sessions.sqlite3"))
+        history = ChatHistory(max_messages=2, store=store, session_id="b" * 32)
+        for i in range(4):
+            history.append(_message(i))
+        history.clear()
+        history.append(_message(9))
+
+        resumed = ChatHistory.resume(store, "b" * 32)
+        assert list(resumed) == [_message(9)]
+
+
+def test_app_session_resumes_after_restart():
+    """Test that reopening the app's URL after a restart restores the session"""
+    at = AppTest.from_file("app.py")
+    at.run()
+    at.sidebar.text_input[0].input("Test User").run()
+    at.sidebar.radio[0].set_value("Chat System").run()
+    at.chat_input[0].set_value("Hello").run()
+    session = at.session_state.session
+    visits = at.session_state.visit_count
+    assert at.query_params["session"] == session.session_id
+
+    # A restart: the store is reopened from disk and the session state is gone
+    at.run()
+    session.store.close()
+    st.cache_resource.clear()
+
+    resumed = AppTest.from_file("app.py")
+    resumed.query_params["session"] = session.session_id
+    resumed.run()
+    assert not resumed.exception, resumed.exception
+    assert resumed.session_state.user_data["name"] == "Test User"
+    assert resumed.session_state.visit_count == visits + 2
+    assert [m["content"] for m in resumed.session_state.messages][0] == "Hello"
+    assert resumed.session_state.messages.total_count == 2
+
+
+def test_resumed_quiz_score_survives_quiz_page():
+    """Test that opening the Quiz page after a resume keeps the restored score"""
+    at = AppTest.from_file("app.py")
+    at.run()
+    at.sidebar.text_input[0].input("Test User").run()
+    at.session_state.quiz_score = 3
+    at.run()
+    session = at.session_state.session
+    session.store.close()
+    st.cache_resource.clear()
+
+    resumed = AppTest.from_file("app.py")
+    resumed.query_params["session"] = session.session_id
+    resumed.run()
+    resumed.sidebar.text_input[0].input("Test User").run()
+    resumed.sidebar.radio[0].set_value("Quiz").run()
+    assert not resumed.exception, resumed.exception
+    assert resumed.session_state.quiz_score == 3
+
+    resumed.selectbox[1].set_value("Easy").run()
+    assert resumed.session_state.quiz_score == 0, "A new filter starts a new quiz"
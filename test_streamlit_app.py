@@ -250,6 +250,21 @@ class TestCSVExport:
         
         print("✅ CSV edge cases test passed")
     
+    def test_generate_csv_from_dataframe(self):
+        """Test CSV generation from a generated DataFrame"""
+        from core.datagen import generate_dataset
+        
+        frame = generate_dataset(3, "Sales", seed=1)
+        csv_output = generate_csv_from_data(frame, "Sales")
+        
+        # Labels are rebuilt from the index in the original "Day N" format
+        df = pd.read_csv(io.StringIO(csv_output))
+        assert list(df.columns) == ['Label', 'Sales'], "DataFrame export should keep Label column"
+        assert list(df['Label']) == ["Day 1", "Day 2", "Day 3"], "Labels should be 1-based"
+        assert list(df['Sales']) == list(frame['Sales']), "Values should match the frame"
+        
+        print("✅ CSV generation from DataFrame test passed")
+    
     def test_csv_download_button_present_in_app(self):
         """Test that CSV download button appears in the Data Generator page"""
         at = AppTest.from_file("app.py")
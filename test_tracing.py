@@ -0,0 +1,95 @@
+import json
+
+import pytest
+from archive import tracing
+from archive.search_cache import SearchCache, cached_search
+from archive.summary import summarize_long_text
+from benchmarks.fakes import FakeOpenAIClient, document
+
+
+class MemoryExporter:
+    """Keeps finished spans in a list"""
+
+    def __init__(self):
+        self.spans = []
+        self.flushes = 0
+
+    def export(self, span):
+        self.spans.append(span)
+
+    def flush(self):
+        self.flushes += 1
+
+
+@pytest.fixture
+def exporter():
+    memory = MemoryExporter()
+    tracing.configure(exporters=[memory])
+    yield memory
+    tracing.tracer.disable()
+
+
+class TestTracing:
+    """Test suite for span-based tracing"""
+
+    def test_disabled_tracing_is_a_no_op(self):
+        """Test that nothing is recorded or allocated while tracing is off"""
+        assert not tracing.tracer.enabled
+        assert tracing.span("stage.quiz", input_chars=10) is tracing.NOOP_SPAN
+
+        @tracing.traced()
+        def add(a, b):
+            return a + b
+
+        assert add(2, 3) == 5
+
+    def test_parent_child_across_threads(self, exporter):
+        """Test that chunk requests on worker threads are children of the summary span"""
+        with tracing.span("stage.summarize") as stage:
+            summarize_long_text(document(), FakeOpenAIClient(), "gpt", chunk_tokens=1000, overlap_tokens=0)
+
+        by_name = {}
+        for span in exporter.spans:
+            by_name.setdefault(span.name, []).append(span)
+        summary = by_name["archive.summary.summarize_long_text"][0]
+        requests = by_name["openai.chat"]
+
+        assert summary.parent_id == stage.span_id
+        assert all(r.parent_id == summary.span_id for r in requests), "Requests should nest under the helper"
+        assert all(r.trace_id == stage.span_id for r in requests), "One trace per stage"
+        assert len({r.thread_id for r in requests}) > 1, "Chunks should run on worker threads"
+        assert exporter.flushes == 1, "Exporters flush once the root span ends"
+
+        print(f"✅ Tracing test passed: {len(exporter.spans)} spans")
+
+    def test_attributes_and_errors(self, exporter, tmp_path):
+        """Test cache-hit attributes and error recording"""
+        cache = SearchCache(str(tmp_path / "search.sqlite3"))
+        for _ in range(2):
+            cached_search(cache, "books", "algebra", 2, lambda: {"results": []})
+        hits = [span.attributes["cache_hit"] for span in exporter.spans if span.name == "tavily.search"]
+        assert hits == [False, True]
+
+        with pytest.raises(KeyError):
+            with tracing.span("failing"):
+                raise KeyError("x")
+        assert exporter.spans[-1].error == "KeyError"
+
+    def test_file_exporters(self, tmp_path):
+        """Test that JSONL and Chrome trace files are written"""
+        tracing.configure(str(tmp_path))
+        try:
+            with tracing.span("rerun", stage="quiz"):
+                with tracing.span("stage.quiz", input_chars=12):
+                    pass
+        finally:
+            tracing.tracer.disable()
+
+        lines = [json.loads(line) for line in open(next(tmp_path.glob("*.jsonl")))]
+        assert [line["name"] for line in lines] == ["stage.quiz", "rerun"]
+        assert lines[0]["parent_id"] == lines[1]["span_id"]
+
+        trace = json.load(open(next(tmp_path.glob("trace-*.json"))))
+        events = trace["traceEvents"]
+        assert {event["ph"] for event in events} == {"X"}
+        assert events[0]["args"]["input_chars"] == 12
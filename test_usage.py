@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+from archive.quiz import quiz_request, stream_quiz
+from archive.response_cache import ResponseCache
+from archive.summary import summary_request, summarize_long_text, summarize_text
+from archive.usage import PromptTooLong, UsageMeter, count_prompt_tokens, plan_max_tokens
+from benchmarks.fakes import FakeOpenAIClient, document
+
+
+class UsageReportingClient(FakeOpenAIClient):
+    """FakeOpenAIClient whose responses carry provider usage numbers"""
+
+    def _create(self, *args, **kwargs):
+        response = super()._create(*args, **kwargs)
+        response.usage = SimpleNamespace(prompt_tokens=120, completion_tokens=30)
+        return response
+
+
+class TestTokenBudgets:
+    """Test suite for budget-aware max_tokens"""
+
+    def test_short_input_keeps_the_old_limits(self):
+        """Test that short text gets the previous 150/300 token replies"""
+        assert summary_request("Osmosis", "gpt")["max_tokens"] == 150
+        assert quiz_request("Osmosis", "gpt")["max_tokens"] == 300
+
+    def test_longer_input_gets_longer_replies(self):
+        """Test that max_tokens grows with the input and stays within the budget"""
+        sizes = [plan_max_tokens("summary", tokens) for tokens in (100, 1000, 2000, 7000)]
+        assert sizes == sorted(sizes) and sizes[0] < sizes[2], f"Not growing: {sizes}"
+        assert sizes[-1] <= 8000 - 7000, "Reply must fit what the budget leaves"
+
+    def test_oversized_prompt_is_refused(self):
+        """Test that a prompt over budget fails before anything is sent"""
+        client = FakeOpenAIClient()
+        with pytest.raises(PromptTooLong):
+            summarize_text("word " * 40000, client, "gpt")
+        assert client.calls == 0, "Nothing should be sent"
+
+    def test_prompt_token_count(self):
+        """Test the local prompt estimate includes per-message overhead"""
+        messages = [{"role": "user", "content": ""}] * 3
+        assert count_prompt_tokens(messages) == 3 * 4 + 3
+
+
+class TestUsageMeter:
+    """Test suite for per-feature token accounting"""
+
+    def test_records_provider_usage_and_cache_hits(self, tmp_path):
+        """Test that provider usage is preferred and cache hits cost nothing"""
+        meter = UsageMeter()
+        cache = ResponseCache(str(tmp_path / "cache.db"), cache_nondeterministic=True)
+        client = UsageReportingClient()
+        summarize_text("Cells", client, "gpt", cache=cache, meter=meter)
+        summarize_text("Cells", client, "gpt", cache=cache, meter=meter)
+
+        summary = meter.by_feature()["summary"]
+        assert (summary.calls, summary.cached) == (2, 1)
+        assert (summary.prompt_tokens, summary.completion_tokens) == (120, 30)
+        assert summary.seconds >= 0
+
+        print("✅ Usage accounting test passed")
+
+    def test_estimates_streamed_usage(self):
+        """Test that streams without usage are counted locally"""
+        meter = UsageMeter()
+        text = "".join(stream_quiz("Mitochondria", FakeOpenAIClient(usage=False), "gpt", meter=meter))
+        quiz = meter.by_feature()["quiz"]
+        assert quiz.calls == 1 and quiz.completion_tokens > 0
+        assert quiz.prompt_tokens == count_prompt_tokens(quiz_request("Mitochondria", "gpt")["messages"])
+        assert text
+
+    def test_long_summary_splits_features(self):
+        """Test that chunk requests and the final summary are accounted separately"""
+        meter = UsageMeter()
+        client = FakeOpenAIClient()
+        summarize_long_text(document(), client, "gpt", chunk_tokens=1000, overlap_tokens=0, meter=meter)
+        features = meter.by_feature()
+        assert features["summary"].calls == 1
+        assert features["summary_chunk"].calls == client.calls - 1
+        assert meter.totals().calls == client.calls
+
+        meter.clear()
+        assert meter.totals().calls == 0
+
+
+def test_assistant_shows_session_usage(assistant):
+    """Test that the assistant meters its requests and shows them in the sidebar"""
+    at, openai, _ = assistant
+    at.run()
+    at.text_input(key="menu_choice").input("2").run()
+    at.text_area(key="summary_input").input("Plants turn light into sugar").run()
+
+    usage = at.session_state["usage"]
+    assert usage.by_feature()["summary"].calls == 1
+    assert any("Tokens this session" in metric.label for metric in at.sidebar.metric)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from archive.vector_index import VectorIndex
+
+
+def _vectors(n, dim=16, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+class TestVectorIndex:
+    """Test suite for the local vector index"""
+
+    def test_search_finds_exact_match(self, tmp_path):
+        """Test that a stored vector is its own best match"""
+        index = VectorIndex(str(tmp_path), dim=16)
+        vectors = _vectors(50)
+        index.add([f"note-{i}" for i in range(50)], vectors, [{"chunk": i} for i in range(50)])
+
+        results = index.search(vectors[17], k=3)
+        assert results[0][0] == "note-17", "Exact vector should rank first"
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5), "Cosine of a vector with itself is 1"
+        assert results[0][2] == {"chunk": 17}, "Metadata should come back with the hit"
+        assert [r[1] for r in results] == sorted((r[1] for r in results), reverse=True)
+
+        print("✅ Vector search test passed")
+
+    def test_delete_and_replace(self, tmp_path):
+        """Test that deleted ids disappear and re-added ids are replaced"""
+        index = VectorIndex(str(tmp_path), dim=16)
+        vectors = _vectors(3)
+        index.add(["a", "b", "c"], vectors)
+
+        index.delete(["a"])
+        assert len(index) == 2 and "a" not in index
+        assert all(r[0] != "a" for r in index.search(vectors[0], k=3)), "Deleted id should not be returned"
+
+        index.add(["b"], vectors[:1])
+        assert len(index) == 2, "Replacing an id should not grow the index"
+        assert index.search(vectors[0], k=1)[0][0] == "b", "Replaced vector should be searchable"
+
+    def test_persists_and_grows(self, tmp_path):
+        """Test that vectors survive reopening, including after growth"""
+        vectors = _vectors(1500)
+        index = VectorIndex(str(tmp_path), dim=16)
+        index.add([str(i) for i in range(1500)], vectors)
+        index.delete(["3"])
+        del index
+
+        reopened = VectorIndex(str(tmp_path))
+        assert reopened.dim == 16 and len(reopened) == 1499
+        assert reopened.search(vectors[1234], k=1)[0][0] == "1234", "Vectors should persist"
+        assert "3" not in reopened, "Deletions should persist"
+
+        reopened.compact()
+        assert reopened.search(vectors[1499], k=1)[0][0] == "1499", "Compaction should keep live rows"
+        extra = _vectors(1, seed=1)
+        reopened.add(["extra"], extra, [{"note": "x"}])
+        del reopened
+
+        compacted = VectorIndex(str(tmp_path))
+        assert len(compacted) == 1500 and compacted.deleted_count == 0
+        assert compacted.search(extra[0], k=1)[0] == ("extra", pytest.approx(1.0, abs=1e-5), {"note": "x"})
+
+        print("✅ Vector index persistence test passed")
+
+    def test_empty_index_and_bad_arguments(self, tmp_path):
+        """Test edge cases"""
+        assert VectorIndex(str(tmp_path / "a"), dim=4).search(np.ones(4)) == []
+        with pytest.raises(ValueError):
+            VectorIndex(str(tmp_path / "b"))
+        with pytest.raises(ValueError):
+            VectorIndex(str(tmp_path / "c"), dim=4, backend="annoy")
+
+    @pytest.mark.parametrize("backend", ["faiss-hnsw", "faiss-ivf"])
+    def test_faiss_backends(self, tmp_path, backend):
+        """Test that the optional FAISS backends agree with brute force on exact matches"""
+        pytest.importorskip("faiss")
+        index = VectorIndex(str(tmp_path), dim=16, backend=backend)
+        vectors = _vectors(400)
+        index.add([str(i) for i in range(400)], vectors)
+        index.delete(["7"])
+
+        assert index.search(vectors[42], k=1)[0][0] == "42"
+        assert all(r[0] != "7" for r in index.search(vectors[7], k=5))
@@ -0,0 +1,51 @@
+# Chat System page
+import random
+
+import streamlit as st
+
+# Messages rendered per "load older" step
+PAGE_SIZE = 20
+
+
+def render(ctx):
+    """Render the Chat System page."""
+    st.subheader("💬 Simple Chat System")
+    
+    if 'chat_visible' not in st.session_state:
+        st.session_state.chat_visible = PAGE_SIZE
+    
+    # Display only the newest messages; older ones are paged in on request
+    history = st.session_state.messages
+    hidden = history.total_count - st.session_state.chat_visible
+    if hidden > 0:
+        if st.button(f"⬆️ Load older messages ({hidden} hidden)"):
+            st.session_state.chat_visible += PAGE_SIZE
+            st.rerun()
+    
+    for message in history.window(st.session_state.chat_visible):
+        with st.chat_message(message["role"]):
+            st.write(message["content"])
+    
+    # Chat input
+    if prompt := st.chat_input("Type your message here..."):
+        # Add user message
+        st.session_state.messages.append({"role": "user", "content": prompt})
+        
+        # Generate simple bot response
+        bot_responses = [
+            f"That's interesting, {ctx.name}! Tell me more.",
+            f"I see what you mean, {ctx.name}. What do you think about that?",
+            f"Thanks for sharing, {ctx.name}! How does that make you feel?",
+            f"Fascinating perspective, {ctx.name}! Can you elaborate?",
+            f"I appreciate you telling me that, {ctx.name}. What's next?"
+        ]
+        
+        bot_response = random.choice(bot_responses)
+        st.session_state.messages.append({"role": "assistant", "content": bot_response})
+        
+        st.rerun()
+    
+    if st.button("🗑️ Clear Chat"):
+        st.session_state.messages.clear()
+        st.session_state.chat_visible = PAGE_SIZE
+        st.rerun()
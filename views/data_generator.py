@@ -0,0 +1,84 @@
+# Data Generator page
+import time
+
+import streamlit as st
+
+from core.datagen import DATA_TYPES, MAX_DATA_POINTS, series_unit
+from core.dataset_cache import DatasetCache
+from core.downsample import DEFAULT_CHART_WIDTH
+from core.export import EXPORT_FORMATS
+
+
+@st.cache_resource
+def get_dataset_cache():
+    """Dataset cache shared by all sessions (entries are read-only)."""
+    return DatasetCache()
+
+
+def render(ctx):
+    """Render the Data Generator page."""
+    st.subheader("📊 Dynamic Data Generator")
+    
+    # Data generation controls
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        data_points = st.number_input("Number of data points", 10, MAX_DATA_POINTS, 100)
+        data_type = st.selectbox("Data type", list(DATA_TYPES))
+    
+    with col2:
+        chart_type = st.selectbox("Chart type", ["Line Chart", "Bar Chart", "Area Chart"])
+        if ctx.show_advanced:
+            chart_width = st.slider("Chart width (px)", 200, 2000, DEFAULT_CHART_WIDTH, step=100)
+        else:
+            chart_width = DEFAULT_CHART_WIDTH
+        if st.button("🔄 Generate New Data"):
+            st.session_state.data_seed += 1
+            st.rerun()
+    
+    # Generate and display data
+    if ctx.auto_refresh:
+        time.sleep(0.1)  # Small delay for auto-refresh effect
+    
+    # Create sample data, reused until the inputs or the seed change
+    dataset_cache = get_dataset_cache()
+    seed = st.session_state.data_seed
+    dataset = dataset_cache.get(data_points, data_type, seed)
+    data = dataset.frame
+    
+    # Display chart based on selection, downsampled to about one point per pixel
+    chart_data = dataset_cache.get_chart(data_points, data_type, seed, chart_type, chart_width)
+    unit = series_unit(data)
+    if chart_type == "Line Chart":
+        st.line_chart(chart_data, x_label=unit, y_label=data_type)
+    elif chart_type == "Bar Chart":
+        st.bar_chart(chart_data, x_label=unit, y_label=data_type)
+    else:  # Area Chart
+        st.area_chart(chart_data, x_label=unit, y_label=data_type)
+    if len(chart_data) < len(data):
+        method = "min-max buckets" if chart_type == "Bar Chart" else "LTTB"
+        st.caption(f"📉 Showing {len(chart_data):,} of {len(data):,} points ({method})")
+    else:
+        st.caption(f"📈 Showing all {len(data):,} points")
+    
+    # Data statistics and export
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Average", f"{dataset.mean:.1f}")
+    with col2:
+        st.metric("Maximum", dataset.maximum)
+    with col3:
+        st.metric("Minimum", dataset.minimum)
+    with col4:
+        export_format = st.selectbox("Export format", list(EXPORT_FORMATS))
+        include_labels = st.checkbox(f"Text labels ('{unit} 1')", value=False)
+        extension, mime = EXPORT_FORMATS[export_format]
+        # Encoded lazily in chunks on first click, then cached with the data
+        st.download_button(
+            label=f"📥 Download {export_format}",
+            data=lambda: dataset_cache.get_export(
+                data_points, data_type, seed, export_format, include_labels),
+            file_name=f"{data_type.lower().replace(' ', '_')}_data{extension}",
+            mime=mime,
+            help="Download the generated data"
+        )
@@ -0,0 +1,50 @@
+# Home dashboard page
+import random
+from datetime import datetime
+
+import streamlit as st
+
+
+def render(ctx):
+    """Render the Home page."""
+    # Dashboard with metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Current Time", datetime.now().strftime("%H:%M:%S"))
+    with col2:
+        st.metric("Days this year", datetime.now().timetuple().tm_yday)
+    with col3:
+        st.metric("Your visits", st.session_state.visit_count, delta=1)
+    with col4:
+        random_number = random.randint(1, 100)
+        st.metric("Lucky number", random_number)
+    
+    # Interactive elements
+    st.subheader("🎯 Quick Actions")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("🎲 Generate Random Fact"):
+            facts = [
+                "Honey never spoils! 🍯",
+                "Octopuses have three hearts! 🐙",
+                "Bananas are berries, but strawberries aren't! 🍌",
+                "A group of flamingos is called a 'flamboyance'! 🦩",
+                "Wombat poop is cube-shaped! 📦"
+            ]
+            st.info(f"💡 **Fun Fact:** {random.choice(facts)}")
+    
+    with col2:
+        mood = st.selectbox("How are you feeling?", 
+            ["😊 Happy", "😔 Sad", "😴 Tired", "🤔 Thoughtful", "🚀 Energetic"])
+        if mood:
+            responses = {
+                "😊 Happy": "That's wonderful! Keep spreading the joy! ✨",
+                "😔 Sad": "Hope your day gets better! Remember, this too shall pass 💙",
+                "😴 Tired": "Maybe time for a coffee break? ☕",
+                "🤔 Thoughtful": "Deep thinking leads to great insights! 🧠",
+                "🚀 Energetic": "Channel that energy into something amazing! ⚡"
+            }
+            st.success(responses[mood])
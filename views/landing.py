@@ -0,0 +1,38 @@
+# Landing page shown until the user enters a name
+import random
+
+import streamlit as st
+
+
+def render(ctx):
+    """Render the landing page."""
+    st.markdown("""
+    <div class="info-box">
+        <h2>🌟 Welcome to the Advanced Streamlit Experience!</h2>
+        <p>Please enter your name in the sidebar to unlock all features and start your journey!</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown("""
+    ## 🚀 What awaits you:
+    
+    - **🏠 Home Dashboard** - Personal metrics and quick actions
+    - **📊 Data Generator** - Create and visualize dynamic data
+    - **🎮 Mini Games** - Number guessing and calculator
+    - **💬 Chat System** - Interactive messaging experience  
+    - **🧠 Quiz** - Test your knowledge
+    - **⚙️ Settings** - Customize your experience
+    
+    ### ✨ Features:
+    - Session state management
+    - Interactive widgets and games
+    - Dynamic data visualization
+    - Personalized user experience
+    - Multi-page navigation
+    - Real-time updates
+    """)
+    
+    # Demo chart for visitors
+    st.subheader("📈 Sample Visualization")
+    demo_data = {f"Item {i}": random.randint(10, 100) for i in range(1, 11)}
+    st.bar_chart(demo_data)
@@ -0,0 +1,68 @@
+# Mini Games page: number guessing and calculator
+import random
+
+import streamlit as st
+
+
+def render(ctx):
+    """Render the Mini Games page."""
+    st.subheader("🎮 Mini Games")
+    
+    # Number guessing game
+    st.markdown("### 🎯 Number Guessing Game")
+    
+    if 'target_number' not in st.session_state:
+        st.session_state.target_number = random.randint(1, 100)
+        st.session_state.guesses = 0
+        st.session_state.game_won = False
+    
+    if not st.session_state.game_won:
+        guess = st.number_input("Guess a number between 1 and 100:", 1, 100, 50)
+        
+        if st.button("Submit Guess"):
+            st.session_state.guesses += 1
+            
+            if guess == st.session_state.target_number:
+                st.success(f"🎉 Congratulations! You got it in {st.session_state.guesses} guesses!")
+                st.session_state.game_won = True
+                st.balloons()
+            elif guess < st.session_state.target_number:
+                st.warning("📈 Too low! Try higher.")
+            else:
+                st.warning("📉 Too high! Try lower.")
+            
+            st.info(f"Guesses made: {st.session_state.guesses}")
+    
+    if st.button("🔄 New Game"):
+        del st.session_state.target_number
+        del st.session_state.guesses
+        del st.session_state.game_won
+        st.rerun()
+    
+    st.divider()
+    
+    # Simple calculator
+    st.markdown("### 🧮 Simple Calculator")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        num1 = st.number_input("First number", value=0.0)
+    with col2:
+        operation = st.selectbox("Operation", ["+", "-", "×", "÷"])
+    with col3:
+        num2 = st.number_input("Second number", value=0.0)
+    
+    if st.button("Calculate"):
+        try:
+            if operation == "+":
+                result = num1 + num2
+            elif operation == "-":
+                result = num1 - num2
+            elif operation == "×":
+                result = num1 * num2
+            elif operation == "÷":
+                result = num1 / num2 if num2 != 0 else "Cannot divide by zero!"
+            
+            st.success(f"Result: {result}")
+        except Exception as e:
+            st.error(f"Error: {e}")
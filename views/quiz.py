@@ -0,0 +1,95 @@
+# Quiz page
+import streamlit as st
+from core.question_bank import DIFFICULTIES, Deck, default_bank
+
+QUIZ_LENGTH = 4
+
+ANY = "Any"
+
+
+def _new_quiz(reset_score=True):
+    """Draw the next questions from the deck, reshuffling when it runs out.
+
+    The first draw of a session keeps quiz_score, which may be restored.
+    """
+    deck = st.session_state.quiz_deck
+    if deck.remaining < QUIZ_LENGTH:
+        deck.reset()
+    st.session_state.quiz_questions = deck.draw(QUIZ_LENGTH)
+    st.session_state.quiz_completed = False
+    if reset_score:
+        st.session_state.quiz_score = 0
+    for i in range(QUIZ_LENGTH):
+        st.session_state.pop(f"q{i}", None)
+
+
+def render(ctx):
+    """Render the Quiz page."""
+    st.subheader("🧠 Quick Quiz")
+
+    if "question_bank" not in st.session_state:
+        st.session_state.question_bank = default_bank()
+    bank = st.session_state.question_bank
+
+    col1, col2 = st.columns(2)
+    with col1:
+        topic = st.selectbox("Topic:", [ANY] + bank.topics, key="quiz_topic")
+    with col2:
+        difficulty = st.selectbox("Difficulty:", (ANY,) + DIFFICULTIES, key="quiz_difficulty")
+
+    # The deck (and the questions drawn from it) only change with the filter
+    selection = (topic, difficulty, len(bank))
+    if st.session_state.get("quiz_selection") != selection:
+        first_draw = "quiz_selection" not in st.session_state
+        st.session_state.quiz_selection = selection
+        st.session_state.quiz_deck = Deck(bank.slots(
+            None if topic == ANY else topic,
+            None if difficulty == ANY else difficulty,
+        ))
+        _new_quiz(reset_score=not first_draw)
+
+    questions = st.session_state.quiz_questions
+    if len(questions) == 0:
+        st.info("No questions match this topic and difficulty yet.")
+
+    elif not st.session_state.quiz_completed:
+        for i, slot in enumerate(questions):
+            question = bank.question(slot)
+            st.markdown(f"**Question {i+1}:** {question.text}")
+            st.radio(f"Select answer for Q{i+1}:",
+                     range(len(question.options)),
+                     format_func=question.options.__getitem__, key=f"q{i}")
+
+        if st.button("Submit Quiz"):
+            chosen = [st.session_state.get(f"q{i}") for i in range(len(questions))]
+            st.session_state.quiz_score = bank.grade(questions, chosen)
+            st.session_state.quiz_completed = True
+            st.rerun()
+    else:
+        st.success(f"🎉 Quiz completed! Your score: {st.session_state.quiz_score}/{len(questions)}")
+
+        if st.session_state.quiz_score == len(questions):
+            st.balloons()
+            st.markdown("### 🏆 Perfect score! You're amazing!")
+        elif st.session_state.quiz_score >= len(questions) // 2:
+            st.markdown("### 👏 Good job! Well done!")
+        else:
+            st.markdown("### 📚 Keep learning! You'll do better next time!")
+
+        if st.button("🔄 Retake Quiz"):
+            _new_quiz()
+            st.rerun()
+
+    with st.expander("📥 Import questions"):
+        st.caption("Paste output from the study assistant's quiz generator. "
+                   "Mark the correct option with a trailing * or an 'Answer: b' line.")
+        quiz_text = st.text_area("Quiz text:", key="quiz_import_text")
+        import_topic = st.text_input("Topic for these questions:", key="quiz_import_topic")
+        import_difficulty = st.selectbox("Difficulty for these questions:", DIFFICULTIES,
+                                         index=1, key="quiz_import_difficulty")
+        if st.button("Import") and quiz_text and import_topic:
+            added = bank.import_quiz(quiz_text, import_topic, import_difficulty)
+            if added:
+                st.success(f"Added {added} questions to {import_topic}")
+            else:
+                st.warning("No questions with a marked answer were found.")
@@ -0,0 +1,93 @@
+# Settings page
+import streamlit as st
+
+
+def _performance(profiler):
+    """Profiling toggle and p50/p95 of each rerun section."""
+    if st.toggle("Profile each rerun", value=profiler.enabled,
+                 help="Times session setup, CSS, sidebar, page and footer on every rerun: "
+                      "wall time, CPU time and memory allocated (tracemalloc)"):
+        profiler.enable()
+    else:
+        profiler.disable()
+    
+    summary = profiler.summary()
+    if not summary:
+        if profiler.enabled:
+            st.caption("Use the app for a while; timings appear from the next rerun.")
+        return
+    
+    st.caption(f"Last {len(profiler.history)} reruns, this session")
+    st.dataframe(
+        [
+            {
+                "Section": row["section"],
+                "Wall p50 (ms)": row["wall_ms_p50"],
+                "Wall p95 (ms)": row["wall_ms_p95"],
+                "CPU p50 (ms)": row["cpu_ms_p50"],
+                "CPU p95 (ms)": row["cpu_ms_p95"],
+                "Allocated p95 (KiB)": row["alloc_kib_p95"],
+                "Peak p95 (KiB)": row["peak_kib_p95"],
+                "Wall time trend": (profiler.totals() if row["section"] == "total"
+                                    else profiler.series(row["section"])),
+            }
+            for row in summary
+        ],
+        column_config={"Wall time trend": st.column_config.LineChartColumn(y_min=0)},
+        hide_index=True,
+    )
+    if st.button("Reset timings"):
+        profiler.clear()
+        st.rerun()
+
+
+def render(ctx):
+    """Render the Settings page."""
+    st.subheader("⚙️ Advanced Settings")
+    
+    # User preferences
+    st.markdown("### 👤 User Preferences")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        notifications = st.checkbox("Enable notifications", value=True)
+        dark_mode = st.checkbox("Dark mode", value=False)
+        sound_effects = st.checkbox("Sound effects", value=True)
+    
+    with col2:
+        language = st.selectbox("Language", ["English", "Spanish", "French", "German"])
+        timezone = st.selectbox("Timezone", ["UTC", "EST", "PST", "GMT"])
+        date_format = st.selectbox("Date format", ["MM/DD/YYYY", "DD/MM/YYYY", "YYYY-MM-DD"])
+    
+    st.divider()
+    
+    # Rerun profiling
+    st.markdown("### ⏱️ Performance")
+    _performance(st.session_state.profiler)
+    
+    st.divider()
+    
+    # Data management
+    st.markdown("### 📊 Data Management")
+    
+    if st.button("📥 Export User Data"):
+        user_data_export = {
+            "session": st.session_state.session.session_id,
+            "name": st.session_state.user_data.get('name', ''),
+            "visit_count": st.session_state.visit_count,
+            "quiz_score": st.session_state.quiz_score,
+            "messages_count": st.session_state.messages.total_count
+        }
+        if st.session_state.profiler.history:
+            user_data_export["performance"] = st.session_state.profiler.to_dict()
+        st.json(user_data_export)
+    
+    if st.button("🗑️ Clear All Data", type="secondary"):
+        if st.button("⚠️ Confirm Clear All Data"):
+            st.session_state.profiler.disable()
+            st.session_state.session.delete()
+            for key in list(st.session_state.keys()):
+                del st.session_state[key]
+            st.success("All data cleared!")
+            st.rerun()